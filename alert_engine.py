@@ -0,0 +1,299 @@
+"""Indexed price alerts: rules become trigger prices in per-symbol sorted indexes"""
+import bisect
+import itertools
+import queue
+import time
+
+ABOVE, BELOW = "above", "below"
+
+
+class AlertRule:
+    """A price level that fires when the price reaches it from one side.
+    
+    trigger(base_price) returns the absolute trigger price, or None while it
+    cannot be known yet (e.g. before the base price is set).
+    """
+    
+    direction = ABOVE
+    trailing = False
+    
+    def __init__(self, action="ALERT"):
+        self.action = action  # Label of the alert, e.g. "BUY" or "SELL"
+    
+    def trigger(self, base_price):
+        raise NotImplementedError
+    
+    def describe(self):
+        return type(self).__name__
+
+
+class DollarRule(AlertRule):
+    """Dollar change from the base price: negative amounts fire on the way down"""
+    
+    def __init__(self, amount, action=None):
+        super().__init__(action or ("BUY" if amount < 0 else "SELL"))
+        self.amount = amount
+        self.direction = BELOW if amount < 0 else ABOVE
+    
+    def trigger(self, base_price):
+        return None if base_price is None else base_price + self.amount
+    
+    def describe(self):
+        return f"${self.amount:+.2f}"
+
+
+class PercentRule(AlertRule):
+    """Percent change from the base price: negative percentages fire on the way down"""
+    
+    def __init__(self, percent, action=None):
+        super().__init__(action or ("BUY" if percent < 0 else "SELL"))
+        self.percent = percent
+        self.direction = BELOW if percent < 0 else ABOVE
+    
+    def trigger(self, base_price):
+        return None if base_price is None else base_price * (1 + self.percent / 100)
+    
+    def describe(self):
+        return f"{self.percent:+.2f}%"
+
+
+class CrossingRule(AlertRule):
+    """An absolute price crossed in the given direction"""
+    
+    def __init__(self, price, direction=ABOVE, action="CROSS"):
+        super().__init__(action)
+        self.price = price
+        self.direction = direction
+    
+    def trigger(self, base_price):
+        return self.price
+    
+    def describe(self):
+        return f"{self.direction} ${self.price:.2f}"
+
+
+class TrailingRule(AlertRule):
+    """Trailing stop: fires when the price falls `amount` dollars (or `percent`) below its peak"""
+    
+    direction = BELOW
+    trailing = True
+    
+    def __init__(self, amount=None, percent=None, action="SELL"):
+        if (amount is None) == (percent is None):
+            raise ValueError("Give either amount or percent")
+        super().__init__(action)
+        self.amount = amount
+        self.percent = percent
+        self.peak = None
+    
+    def trigger(self, base_price):
+        if self.peak is None:
+            return None
+        if self.amount is not None:
+            return self.peak - self.amount
+        return self.peak * (1 - self.percent / 100)
+    
+    def describe(self):
+        offset = f"${self.amount:.2f}" if self.amount is not None else f"{self.percent:.2f}%"
+        return f"trailing {offset}"
+
+
+class SymbolAlerts:
+    """Sorted trigger levels of one symbol's rules.
+    
+    Armed rules sit in `above` / `below` as (price, order, rule) entries. A
+    rule that fires moves to the re-arm index on the opposite side, `hysteresis`
+    dollars back from its trigger, and returns once the price gets there.
+    """
+    
+    def __init__(self):
+        self.rules = []
+        self.trailing = []  # Rules whose level follows the price
+        self.base_price = None
+        self.last_price = None
+        self.above = []  # Armed rules firing at price >= level
+        self.below = []  # Armed rules firing at price <= level
+        self.rearm_above = []  # Fired rules re-armed at price >= level
+        self.rearm_below = []  # Fired rules re-armed at price <= level
+        self.entries = {}  # rule -> (index list, entry, armed) where the rule currently sits
+        self.thresholds = None  # (buy, sell) amounts of the rules added by AlertEngine.track()
+        self.threshold_rules = ()
+
+
+class AlertEngine:
+    """Evaluates alert rules per tick against sorted trigger indexes.
+    
+    on_tick() only looks at the rules of the symbol that ticked, and within
+    them bisects straight to the levels the new price has reached, so its cost
+    grows with the number of rules that fire (or re-arm), not with the number
+    of symbols or rules watched. Fired alerts go onto `queue`; a rule fires
+    again only after the price moves `hysteresis` dollars back and `cooldown`
+    seconds have passed.
+    """
+    
+    def __init__(self, hysteresis=0.25, cooldown=300.0, clock=time.time, alerts=None):
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.clock = clock
+        self.queue = alerts if alerts is not None else queue.SimpleQueue()
+        self.symbols = {}
+        self.fired = 0
+        self.last_fired = {}  # rule -> time it last fired
+        self._order = itertools.count()
+    
+    def add_rule(self, symbol, rule):
+        alerts = self.symbols.setdefault(symbol, SymbolAlerts())
+        alerts.rules.append(rule)
+        if rule.trailing:
+            alerts.trailing.append(rule)
+        self._place(alerts, rule, armed=True)
+        return rule
+    
+    def remove_rule(self, symbol, rule):
+        alerts = self.symbols.get(symbol)
+        if alerts is None or rule not in alerts.rules:
+            return
+        alerts.rules.remove(rule)
+        if rule.trailing:
+            alerts.trailing.remove(rule)
+        self._unplace(alerts, rule)
+        self.last_fired.pop(rule, None)
+    
+    def track(self, symbol, buy_threshold, sell_threshold):
+        """Add the tracker's dollar-threshold rules for a symbol, replacing any it had before"""
+        alerts = self.symbols.get(symbol)
+        if alerts is not None:
+            for rule in alerts.threshold_rules:
+                self.remove_rule(symbol, rule)
+        rules = (self.add_rule(symbol, DollarRule(buy_threshold, "BUY")),
+                 self.add_rule(symbol, DollarRule(sell_threshold, "SELL")))
+        alerts = self.symbols[symbol]
+        alerts.thresholds = (buy_threshold, sell_threshold)
+        alerts.threshold_rules = rules
+    
+    def remove_symbol(self, symbol):
+        alerts = self.symbols.pop(symbol, None)
+        if alerts:
+            for rule in alerts.rules:
+                self.last_fired.pop(rule, None)
+    
+    def _place(self, alerts, rule, armed):
+        """Put a rule in its trigger (armed) or re-arm index at its current level"""
+        self._unplace(alerts, rule)
+        level = rule.trigger(alerts.base_price)
+        if level is None:
+            return
+        
+        if armed:
+            index = alerts.above if rule.direction == ABOVE else alerts.below
+        elif rule.direction == ABOVE:
+            index, level = alerts.rearm_below, level - self.hysteresis
+        else:
+            index, level = alerts.rearm_above, level + self.hysteresis
+        entry = (level, next(self._order), rule)
+        bisect.insort(index, entry)
+        alerts.entries[rule] = (index, entry, armed)
+    
+    def _unplace(self, alerts, rule):
+        placed = alerts.entries.pop(rule, None)
+        if placed:
+            index, entry, _ = placed
+            del index[bisect.bisect_left(index, entry)]
+    
+    def set_base(self, symbol, base_price):
+        """Re-level rules that are relative to the base price"""
+        alerts = self.symbols.get(symbol)
+        if alerts is None or base_price == alerts.base_price:
+            return
+        alerts.base_price = base_price
+        for rule in alerts.rules:
+            if not rule.trailing and not isinstance(rule, CrossingRule):
+                placed = alerts.entries.get(rule)
+                self._place(alerts, rule, armed=placed[2] if placed else True)
+    
+    def on_tick(self, symbol, price, base_price=None):
+        """Apply a new price; returns the alerts it fired (also put on the queue)"""
+        alerts = self.symbols.get(symbol)
+        if alerts is None or price is None:
+            return []
+        if base_price is not None:
+            self.set_base(symbol, base_price)
+        alerts.last_price = price
+        
+        for rule in alerts.trailing:
+            if rule.peak is None or price > rule.peak:
+                rule.peak = price
+                placed = alerts.entries.get(rule)
+                self._place(alerts, rule, armed=placed[2] if placed else True)
+        
+        # Fired rules whose re-arm level has been reached go back to the trigger indexes
+        if alerts.rearm_above or alerts.rearm_below:
+            for rule in self._reached(alerts.rearm_above, alerts.rearm_below, price):
+                self._place(alerts, rule, armed=True)
+        
+        fired = []
+        reached = self._reached(alerts.above, alerts.below, price)
+        if not reached:
+            return fired
+        
+        now = self.clock()
+        for rule in reached:
+            self._place(alerts, rule, armed=False)
+            last = self.last_fired.get(rule)
+            if last is not None and now - last < self.cooldown:
+                continue
+            self.last_fired[rule] = now
+            alert = self.make_alert(symbol, rule, price, alerts.base_price, now)
+            fired.append(alert)
+            self.queue.put(alert)
+        
+        self.fired += len(fired)
+        return fired
+    
+    @staticmethod
+    def _reached(above, below, price):
+        """Rules at levels the price has reached: a prefix of `above`, a suffix of `below`"""
+        rules = [entry[2] for entry in above[:bisect.bisect_right(above, (price, float('inf')))]]
+        start = bisect.bisect_left(below, (price,))
+        rules.extend(entry[2] for entry in below[start:])
+        return rules
+    
+    @staticmethod
+    def make_alert(symbol, rule, price, base_price, now):
+        price = float(price)
+        change_amount = price - base_price if base_price is not None else 0.0
+        change_pct = change_amount / base_price * 100 if base_price else 0.0
+        return {
+            'symbol': symbol,
+            'action': rule.action,
+            'rule': rule.describe(),
+            'price': price,
+            'change_amount': change_amount,
+            'change_pct': change_pct,
+            'time': now,
+            'message': f"{symbol}: {rule.action} at ${price:.2f} (Change: ${change_amount:+.2f})"
+        }
+    
+    def update_from(self, tracked_stocks, symbols):
+        """Feed the latest prices of the given tracked symbols.
+        
+        Threshold rules are added for new symbols and replaced when a symbol's
+        thresholds no longer match the ones they were made from.
+        """
+        fired = []
+        for symbol in symbols:
+            state = tracked_stocks.get(symbol)
+            if state is None:
+                self.remove_symbol(symbol)
+                continue
+            alerts = self.symbols.get(symbol)
+            thresholds = (state.buy_threshold, state.sell_threshold)
+            if alerts is None or alerts.thresholds != thresholds:
+                self.track(symbol, *thresholds)
+            fired.extend(self.on_tick(symbol, state.current_price, state.base_price))
+        return fired
+    
+    def prune(self, tracked_stocks):
+        """Drop the rules of symbols that are no longer tracked"""
+        for symbol in [symbol for symbol in list(self.symbols) if symbol not in tracked_stocks]:
+            self.remove_symbol(symbol)
@@ -0,0 +1,138 @@
+"""Vectorized backtests of the dollar-threshold strategy over recorded minute bars.
+
+    python backtest.py recordings/2024-01 --buy -1 -2 -3 --sell 1 2 5 --workers 8
+"""
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from providers import load_bars, recording_files
+from snapshot import BUY, HOLD, SELL
+
+RESULT_FIELDS = ['pnl', 'realized', 'unrealized', 'trades', 'wins', 'open']
+
+
+def signals(prices, base_price, buy_threshold, sell_threshold):
+    """analyze_stock's recommendation codes (snapshot.BUY/SELL/HOLD) for each price"""
+    change = np.asarray(prices, dtype=np.float64) - base_price
+    return np.where(change <= buy_threshold, BUY, np.where(change >= sell_threshold, SELL, HOLD))
+
+
+def run_strategy(prices, buy_threshold, sell_threshold, base_price=None):
+    """Trade one share on the recommendations: buy on BUY while flat, sell on SELL while long.
+    
+    Fills are at the close of the signalling bar. The base price defaults to
+    the first price, as the tracker sets it on a stock's first update. A
+    position still open at the end is marked at the last price and counts as
+    a trade (won if it is in profit). Returns a dict of RESULT_FIELDS.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    if base_price is None:
+        base_price = prices[0]
+    codes = signals(prices, base_price, buy_threshold, sell_threshold)
+    
+    # BUY = +1, SELL = -1; keeping only changes (starting from flat) leaves the
+    # alternating buy, sell, buy, ... sequence of fills
+    side = np.where(codes == BUY, 1, np.where(codes == SELL, -1, 0))
+    bars = np.flatnonzero(side)
+    sides = side[bars]
+    fills = bars[np.diff(sides, prepend=-1) != 0]
+    
+    entries = prices[fills[0::2]]
+    exits = prices[fills[1::2]]
+    closed = exits - entries[:len(exits)]
+    realized = float(closed.sum())
+    is_open = len(entries) > len(exits)
+    unrealized = float(prices[-1] - entries[-1]) if is_open else 0.0
+    return {
+        'pnl': realized + unrealized,
+        'realized': realized,
+        'unrealized': unrealized,
+        'trades': len(entries),
+        'wins': int((closed > 0).sum()) + int(unrealized > 0),
+        'open': int(is_open),
+    }
+
+
+def sweep(prices, grid):
+    """Run every (buy_threshold, sell_threshold) in grid; returns an array of RESULT_FIELDS rows"""
+    prices = np.asarray(prices, dtype=np.float64)
+    results = np.empty((len(grid), len(RESULT_FIELDS)))
+    if len(prices) == 0:
+        results[:] = 0
+        return results
+    for i, (buy_threshold, sell_threshold) in enumerate(grid):
+        outcome = run_strategy(prices, buy_threshold, sell_threshold)
+        results[i] = [outcome[field] for field in RESULT_FIELDS]
+    return results
+
+
+def _sweep_file(path, grid):
+    bars = load_bars(path)
+    return sweep(bars['Close'].dropna().to_numpy(), grid)
+
+
+def make_grid(buy_thresholds, sell_thresholds):
+    return list(itertools.product(buy_thresholds, sell_thresholds))
+
+
+def backtest(series, grid, workers=None):
+    """Sweep the grid over {symbol: prices or bar file path} on a process pool.
+    
+    Returns a DataFrame with one row per (symbol, buy_threshold, sell_threshold).
+    """
+    symbols = list(series)
+    tasks = [series[symbol] for symbol in symbols]
+    
+    if workers == 1:
+        outcomes = [_sweep_file(task, grid) if isinstance(task, str) else sweep(task, grid) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_sweep_file if isinstance(task, str) else sweep, task, grid)
+                       for task in tasks]
+            outcomes = [future.result() for future in futures]
+    
+    frames = []
+    thresholds = np.array(grid, dtype=np.float64).reshape(-1, 2)
+    for symbol, outcome in zip(symbols, outcomes):
+        frame = pd.DataFrame(outcome, columns=RESULT_FIELDS)
+        frame.insert(0, 'sell_threshold', thresholds[:, 1])
+        frame.insert(0, 'buy_threshold', thresholds[:, 0])
+        frame.insert(0, 'symbol', symbol)
+        frames.append(frame)
+    results = pd.concat(frames, ignore_index=True)
+    results[['trades', 'wins', 'open']] = results[['trades', 'wins', 'open']].astype(int)
+    return results
+
+
+def summarize(results):
+    """Totals per threshold pair across symbols, best total P&L first"""
+    summary = results.groupby(['buy_threshold', 'sell_threshold']).agg(
+        pnl=('pnl', 'sum'), trades=('trades', 'sum'), wins=('wins', 'sum'), symbols=('symbol', 'count'))
+    summary['hit_rate'] = summary['wins'] / summary['trades'].where(summary['trades'] > 0)
+    return summary.sort_values('pnl', ascending=False).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest dollar thresholds over recorded minute bars.")
+    parser.add_argument("directory", help="recording directory of SYMBOL.csv / SYMBOL.parquet files")
+    parser.add_argument("--buy", type=float, nargs="+", default=list(np.linspace(-5, -0.5, 10)),
+                        help="buy thresholds ($ change, negative)")
+    parser.add_argument("--sell", type=float, nargs="+", default=list(np.linspace(0.5, 5, 10)),
+                        help="sell thresholds ($ change, positive)")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=10, help="threshold pairs to show")
+    parser.add_argument("--output", help="write per-symbol results to this CSV file")
+    args = parser.parse_args(argv)
+    
+    results = backtest(recording_files(args.directory), make_grid(args.buy, args.sell), args.workers)
+    if args.output:
+        results.to_csv(args.output, index=False)
+    print(summarize(results).head(args.top).to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Alert evaluation cost: indexed AlertEngine vs re-checking every symbol.
+
+Each round moves a fraction of the watchlist by a small random amount, and a
+handful of those moves cross a rule. The engine is only fed the symbols that
+ticked; the old path rebuilds the snapshot and collects alerts for all symbols.
+
+    python -m benchmarks.bench_alerts --symbols 1000 10000 --ticked 0.1
+"""
+import argparse
+import time
+
+import numpy as np
+
+from alert_engine import AlertEngine, PercentRule, TrailingRule
+from stock_tracker import StockState, StockTracker
+from benchmarks.fake_market import FakeMarket
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--ticked", type=float, default=0.1, help="fraction of symbols ticking per round")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    print(f"{'symbols':>8} {'rules':>7} {'snapshot (ms)':>14} {'engine (ms)':>12} {'alerts':>7}")
+    for size in args.symbols:
+        tracker = StockTracker(FakeMarket())
+        engine = AlertEngine(cooldown=0)
+        symbols = [f"S{i:05d}" for i in range(size)]
+        for symbol in symbols:
+            tracker.tracked_stocks[symbol] = StockState(-2.0, 5.0, current_price=100.0, base_price=100.0)
+            engine.track(symbol, -2.0, 5.0)
+            engine.add_rule(symbol, PercentRule(3.0))
+            engine.add_rule(symbol, TrailingRule(percent=2.5))
+            engine.on_tick(symbol, 100.0, 100.0)
+        rules = sum(len(alerts.rules) for alerts in engine.symbols.values())
+        
+        snapshot_time = engine_time = 0.0
+        for _ in range(args.rounds):
+            ticked = rng.choice(size, int(size * args.ticked), replace=False)
+            for i in ticked:
+                state = tracker.tracked_stocks[symbols[i]]
+                state.current_price = state.current_price + rng.normal(0, 0.3)
+            
+            start = time.perf_counter()
+            tracker.snapshot().all_alerts()
+            snapshot_time += time.perf_counter() - start
+            
+            start = time.perf_counter()
+            engine.update_from(tracker.tracked_stocks, [symbols[i] for i in ticked])
+            engine_time += time.perf_counter() - start
+        
+        print(f"{size:8d} {rules:7d} {snapshot_time / args.rounds * 1000:14.2f} "
+              f"{engine_time / args.rounds * 1000:12.2f} {engine.fired:7d}")
+
+
+if __name__ == "__main__":
+    main()
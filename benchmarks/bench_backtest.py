@@ -0,0 +1,44 @@
+"""Threshold sweep throughput: a month of minute bars per symbol over a grid of threshold pairs.
+
+    python -m benchmarks.bench_backtest --symbols 500 --grid 10 --workers 1 0
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from backtest import backtest, make_grid, summarize
+from benchmarks.fake_market import make_bars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=21, help="trading days of 390 minute bars")
+    parser.add_argument("--grid", type=int, default=10, help="buy and sell thresholds each (grid x grid pairs)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 0], help="process counts (0: all cores)")
+    args = parser.parse_args()
+    
+    rows = args.days * 390
+    series = {f"S{i:04d}": make_bars(f"S{i:04d}", rows=rows, seed=i)['Close'].to_numpy()
+              for i in range(args.symbols)}
+    grid = make_grid(np.linspace(-5, -0.5, args.grid), np.linspace(0.5, 5, args.grid))
+    runs = args.symbols * len(grid)
+    
+    print(f"{args.symbols} symbols x {rows} bars x {len(grid)} threshold pairs")
+    print(f"{'workers':>8} {'seconds':>8} {'runs/s':>9} {'bars/s':>12}")
+    for workers in args.workers:
+        workers = workers or os.cpu_count()
+        start = time.perf_counter()
+        results = backtest(series, grid, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"{workers:8d} {elapsed:8.2f} {runs / elapsed:9.0f} {runs * rows / elapsed:12.3g}")
+    
+    best = summarize(results).iloc[0]
+    print(f"best pair: buy {best['buy_threshold']:+.2f} / sell {best['sell_threshold']:+.2f}, "
+          f"P&L ${best['pnl']:.2f} over {int(best['trades'])} trades, hit rate {best['hit_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
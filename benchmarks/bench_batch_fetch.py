@@ -0,0 +1,54 @@
+"""Cycle time of StockTracker.update_all_stocks against watchlist size.
+
+Compares the per-symbol fetch loop with the batched bulk-download mode using
+an in-process fake market, so no network access is needed.
+
+    python -m benchmarks.bench_batch_fetch --sizes 10 50 200 1000
+"""
+import argparse
+import time
+
+from stock_tracker import StockState, StockTracker
+from benchmarks.fake_market import FakeMarket
+
+
+def make_tracker(provider, size, **kwargs):
+    tracker = StockTracker(provider, **kwargs)
+    for i in range(size):
+        tracker.tracked_stocks[f"S{i:05d}"] = StockState(-2.0, 5.0, history_depth=tracker.history_depth)
+    return tracker
+
+
+def time_cycle(market, size, **kwargs):
+    tracker = make_tracker(market, size, **kwargs)
+    market.requests = 0
+    start = time.perf_counter()
+    results = tracker.update_all_stocks()
+    elapsed = time.perf_counter() - start
+    assert all(results.values()), "fake market returned no data"
+    return elapsed, market.requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200, 1000])
+    parser.add_argument("--latency", type=float, default=0.05, help="fake round-trip latency (s)")
+    parser.add_argument("--batch-size", type=int, default=None, help="symbols per bulk request")
+    parser.add_argument("--max-single", type=int, default=50,
+                        help="largest watchlist to time in per-symbol mode (rate limited to 2 requests/s)")
+    args = parser.parse_args()
+    
+    market = FakeMarket(latency=args.latency)
+    print(f"{'symbols':>8} {'single (s)':>12} {'requests':>9} {'batch (s)':>11} {'requests':>9}")
+    for size in args.sizes:
+        if size <= args.max_single:
+            single, single_requests = time_cycle(market, size)
+            single_col = f"{single:12.3f} {single_requests:9d}"
+        else:
+            single_col = f"{'-':>12} {'-':>9}"
+        batch, batch_requests = time_cycle(market, size, fetch_mode="batch", batch_size=args.batch_size)
+        print(f"{size:8d} {single_col} {batch:11.3f} {batch_requests:9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Throughput of the concurrent fetch engine against its rate budget.
+
+Each row runs one per-symbol update cycle through FetchEngine with the given
+worker count and token-bucket rate; throughput should track the rate budget
+rather than the watchlist size.
+
+    python -m benchmarks.bench_fetch_engine --symbols 200 --rates 5 20 100
+"""
+import argparse
+import time
+
+from fetch_engine import FetchEngine
+from benchmarks.bench_batch_fetch import make_tracker
+from benchmarks.fake_market import FakeMarket
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--rates", type=float, nargs="+", default=[5, 20, 100])
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--latency", type=float, default=0.05, help="fake round-trip latency (s)")
+    args = parser.parse_args()
+    
+    market = FakeMarket(latency=args.latency)
+    print(f"{'workers':>8} {'rate/s':>8} {'cycle (s)':>10} {'symbols/s':>10}")
+    for workers in args.workers:
+        for rate in args.rates:
+            # Burst of one token so the measured rate is the sustained budget
+            engine = FetchEngine(max_workers=workers, rate_limit=rate, burst=1)
+            tracker = make_tracker(market, args.symbols, fetch_engine=engine)
+            start = time.perf_counter()
+            tracker.update_all_stocks()
+            elapsed = time.perf_counter() - start
+            print(f"{workers:8d} {rate:8.0f} {elapsed:10.2f} {args.symbols / elapsed:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
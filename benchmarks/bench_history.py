@@ -0,0 +1,106 @@
+"""Memory and append cost of per-symbol price history at large watchlist sizes.
+
+Compares the old list-of-dicts history (re-sliced past 50 points) with the
+StockState / PriceHistory ring buffer at several depths.
+
+    python -m benchmarks.bench_history --symbols 10000 --ticks 200
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from stock_tracker import StockState
+
+
+def legacy_state():
+    return {
+        'buy_threshold': -2.0,
+        'sell_threshold': 5.0,
+        'current_price': None,
+        'base_price': None,
+        'history': [],
+        'last_update': None
+    }
+
+
+def legacy_append(state, current_time, current_price):
+    state['current_price'] = current_price
+    state['last_update'] = current_time
+    state['history'].append({'time': current_time, 'price': current_price})
+    if len(state['history']) > 50:
+        state['history'] = state['history'][-50:]
+
+
+def ring_append(state, current_time, current_price):
+    state.current_price = current_price
+    state.last_update = current_time
+    state.history.append(current_time, current_price)
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes held by an object graph (numpy arrays count their buffers)"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in obj)
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, '__slots__', ()):
+            if hasattr(obj, name):
+                size += deep_size(getattr(obj, name), seen)
+    return size
+
+
+def measure(make_state, append, symbols, ticks):
+    """Return (ns per append, bytes per symbol once the history is full)"""
+    times = list(pd.date_range("2024-01-02 09:30", periods=ticks, freq="1min", tz="America/New_York"))
+    prices = 100 + np.random.default_rng(0).normal(0, 0.05, ticks).cumsum()
+    
+    states = [make_state() for _ in range(symbols)]
+    start = time.perf_counter()
+    for tick in range(ticks):
+        current_time, current_price = times[tick], prices[tick]
+        for state in states:
+            append(state, current_time, current_price)
+    per_append = (time.perf_counter() - start) / (symbols * ticks) * 1e9
+    
+    # Size one symbol fed fresh scalar objects, as each symbol's bars come from
+    # its own frame (interned small objects such as dict keys are shared)
+    state = make_state()
+    for tick in range(ticks):
+        append(state, times[tick] + pd.Timedelta(0), prices[tick])
+    return per_append, deep_size(state)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--depths", type=int, nargs="+", default=[50, 390, 2000])
+    args = parser.parse_args()
+    
+    cases = [("list of dicts (50)", legacy_state, legacy_append)]
+    for depth in args.depths:
+        cases.append((f"ring buffer ({depth})", lambda depth=depth: StockState(-2.0, 5.0, history_depth=depth),
+                      ring_append))
+    
+    print(f"{args.symbols} symbols x {args.ticks} ticks")
+    print(f"{'history':<22} {'ns/append':>10} {'bytes/symbol':>13} {'MB total':>9}")
+    for name, make_state, append in cases:
+        per_append, per_symbol = measure(make_state, append, args.symbols, args.ticks)
+        total = per_symbol * args.symbols / 2 ** 20
+        print(f"{name:<22} {per_append:10.0f} {per_symbol:13.0f} {total:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Time to load a watchlist: one synchronous add per symbol vs StockTracker.import_stocks.
+
+The old GUI path validated and fetched each symbol in turn on the Tk thread.
+import_stocks validates and fetches in bulk chunks through the fetch engine,
+under the same default rate limit of 2 requests/s.
+
+    python -m benchmarks.bench_import --sizes 50 300 1000
+"""
+import argparse
+import time
+
+from stock_tracker import StockTracker
+from benchmarks.fake_market import FakeMarket
+
+
+def one_by_one(market, symbols):
+    tracker = StockTracker(market)
+    for symbol in symbols:
+        tracker.add_stock(symbol, -2.0, 5.0)
+        tracker.update_stock_data(symbol)
+    return tracker
+
+
+def bulk(market, symbols, chunk_size):
+    tracker = StockTracker(market)
+    added, errors = tracker.import_stocks([(symbol, -2.0, 5.0) for symbol in symbols], chunk_size=chunk_size)
+    assert not errors, errors
+    return tracker
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 300, 1000])
+    parser.add_argument("--latency", type=float, default=0.05, help="fake round-trip latency (s)")
+    parser.add_argument("--chunk-size", type=int, default=50, help="symbols per bulk request")
+    parser.add_argument("--max-single", type=int, default=300, help="largest watchlist to add one by one")
+    args = parser.parse_args()
+    
+    print(f"{'symbols':>8} {'one by one (s)':>15} {'requests':>9} {'import (s)':>11} {'requests':>9}")
+    for size in args.sizes:
+        symbols = [f"S{i:05d}" for i in range(size)]
+        single_col = f"{'-':>15} {'-':>9}"
+        if size <= args.max_single:
+            market = FakeMarket(latency=args.latency)
+            start = time.perf_counter()
+            one_by_one(market, symbols)
+            single_col = f"{time.perf_counter() - start:15.2f} {market.requests:9d}"
+        market = FakeMarket(latency=args.latency)
+        start = time.perf_counter()
+        bulk(market, symbols, args.chunk_size)
+        print(f"{size:8d} {single_col} {time.perf_counter() - start:11.2f} {market.requests:9d}")
+
+
+if __name__ == "__main__":
+    main()
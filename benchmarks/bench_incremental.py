@@ -0,0 +1,51 @@
+"""Rows and bytes transferred per update cycle, full refresh vs incremental.
+
+Replays a session on the fake market: the watchlist is first loaded with a
+full refresh at --minute, then polled once per simulated minute. Bytes are
+the in-memory size of the decoded price frames.
+
+    python -m benchmarks.bench_incremental --symbols 50 --minute 300
+"""
+import argparse
+
+from fetch_engine import FetchEngine
+from benchmarks.bench_batch_fetch import make_tracker
+from benchmarks.fake_market import FakeMarket
+
+
+def run_session(market, args, **kwargs):
+    engine = FetchEngine(max_workers=8, rate_limit=None)
+    market.minute = args.minute
+    tracker = make_tracker(market, args.symbols, fetch_engine=engine, **kwargs)
+    
+    tracker.update_all_stocks()
+    warm_up = tracker.last_cycle_stats
+    
+    cycles = []
+    for _ in range(args.polls):
+        market.minute += 1
+        tracker.update_all_stocks()
+        cycles.append(tracker.last_cycle_stats)
+    return warm_up, cycles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--minute", type=int, default=300, help="bars already printed when tracking starts")
+    parser.add_argument("--polls", type=int, default=5)
+    args = parser.parse_args()
+    
+    market = FakeMarket(latency=0.0)
+    print(f"{'mode':<12} {'fetch':<6} {'rows/cycle':>11} {'bytes/cycle':>12}")
+    for fetch_mode in ("single", "batch"):
+        for incremental in (False, True):
+            _, cycles = run_session(market, args, fetch_mode=fetch_mode, incremental=incremental)
+            rows = sum(c['rows'] for c in cycles) / len(cycles)
+            size = sum(c['bytes'] for c in cycles) / len(cycles)
+            label = "incremental" if incremental else "full"
+            print(f"{label:<12} {fetch_mode:<6} {rows:11.0f} {size:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
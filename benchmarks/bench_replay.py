@@ -0,0 +1,59 @@
+"""Offline load test: update cycles over a recorded session via ReplayProvider.
+
+Writes a synthetic recording for --symbols symbols (or replays --recording,
+a directory of SYMBOL.csv / SYMBOL.parquet files) and runs --cycles update
+cycles while the replay clock plays at --speed times real time.
+
+    python -m benchmarks.bench_replay --symbols 1000 --speed 60 --fetch-mode batch
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from fetch_engine import FetchEngine
+from providers import ReplayProvider, save_recording
+from stock_tracker import StockTracker
+from benchmarks.fake_market import make_bars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--recording", help="directory of recorded bars (default: synthetic)")
+    parser.add_argument("--speed", type=float, default=60.0, help="replay speed relative to real time")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--fetch-mode", choices=("single", "batch"), default="batch")
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    
+    directory = args.recording
+    if directory is None:
+        directory = tempfile.mkdtemp(prefix="replay-")
+        save_recording({f"S{i:05d}": make_bars(f"S{i:05d}", seed=i) for i in range(args.symbols)}, directory)
+    
+    try:
+        start = time.perf_counter()
+        provider = ReplayProvider(directory, speed=args.speed)
+        print(f"loaded {len(provider.symbols)} symbols in {time.perf_counter() - start:.2f} s")
+        
+        tracker = StockTracker(provider, fetch_mode=args.fetch_mode, incremental=args.incremental,
+                               fetch_engine=FetchEngine(max_workers=args.workers, rate_limit=None))
+        for symbol in provider.symbols:
+            tracker.add_stock(symbol, -2.0, 5.0)
+        
+        for cycle in range(args.cycles):
+            start = time.perf_counter()
+            results = tracker.update_all_stocks()
+            elapsed = time.perf_counter() - start
+            stats = tracker.last_cycle_stats
+            print(f"cycle {cycle + 1}: {elapsed:6.3f} s  {sum(results.values())}/{len(results)} updated  "
+                  f"{stats['rows']} rows  replay clock {provider.now():%H:%M:%S}")
+    finally:
+        if args.recording is None:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Upstream requests and threshold detection delay: fixed-interval vs adaptive polling.
+
+Simulates one regular session on a virtual clock. Each symbol follows the
+fake market's minute bars. A poll sees the bar that is forming at the poll
+time. The fixed strategy polls every symbol every `update_interval`;
+the adaptive one polls whatever PollScheduler says is due.
+
+    python -m benchmarks.bench_scheduler --symbols 200 --threshold 0.75
+"""
+import argparse
+
+import numpy as np
+
+from poll_scheduler import PollScheduler
+from stock_tracker import StockState, StockTracker
+from benchmarks.fake_market import FakeMarket
+
+SESSION_START = 1704205800.0  # 2024-01-02 09:30 New York
+SESSION_SECONDS = 390 * 60
+
+
+class Clock:
+    def __init__(self):
+        self.now = SESSION_START
+    
+    def __call__(self):
+        return self.now
+
+
+def first_crossings(market, symbols, threshold):
+    """Seconds into the session at which each symbol first crosses +/-threshold (None if never)"""
+    crossings = {}
+    for symbol in symbols:
+        closes = market.bars(symbol)['Close'].to_numpy()
+        hits = np.flatnonzero(np.abs(closes - closes[0]) >= threshold)
+        crossings[symbol] = float(hits[0] * 60) if len(hits) else None
+    return crossings
+
+
+def simulate(market, symbols, threshold, scheduler_factory=None, interval=10.0):
+    tracker = StockTracker(market)
+    for symbol in symbols:
+        tracker.tracked_stocks[symbol] = StockState(-threshold, threshold)
+    clock = Clock()
+    scheduler = scheduler_factory(tracker, clock) if scheduler_factory else None
+    
+    requests = 0
+    detected = {}
+    next_fixed = SESSION_START + interval / 2  # Polls don't line up with bar starts
+    while clock.now < SESSION_START + SESSION_SECONDS:
+        if scheduler is not None:
+            due = scheduler.due()
+        elif clock.now >= next_fixed:
+            due = symbols
+            next_fixed += interval
+        else:
+            due = []
+        
+        minute = int((clock.now - SESSION_START) // 60)
+        for symbol in due:
+            tracker.apply_history(symbol, market.bars(symbol).iloc[:minute + 1])
+        requests += len(due)
+        if scheduler is not None and due:
+            scheduler.record(dict.fromkeys(due, True))
+        
+        if due:
+            snapshot = tracker.snapshot()
+            for symbol in due:
+                if symbol not in detected and snapshot.alerting[snapshot.index[symbol]]:
+                    detected[symbol] = clock.now - SESSION_START
+        clock.now += 1.0
+    return requests, detected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--threshold", type=float, default=0.75, help="+/- dollar threshold")
+    parser.add_argument("--interval", type=float, default=10.0, help="fixed polling interval (s)")
+    parser.add_argument("--budget", type=float, default=20.0, help="adaptive polls per second")
+    parser.add_argument("--safety", type=float, default=0.02,
+                        help="poll at this fraction of the expected time to reach a threshold")
+    args = parser.parse_args()
+    
+    market = FakeMarket(latency=0)
+    symbols = [f"S{i:05d}" for i in range(args.symbols)]
+    crossings = first_crossings(market, symbols, args.threshold)
+    crossed = [symbol for symbol, at in crossings.items() if at is not None]
+    
+    def adaptive(tracker, clock):
+        return PollScheduler(tracker, min_interval=args.interval, budget=args.budget,
+                             safety=args.safety, clock=clock)
+    
+    print(f"{len(crossed)} of {len(symbols)} symbols cross +/-${args.threshold:.2f} during the session")
+    print(f"{'strategy':>10} {'requests':>10} {'mean delay (s)':>15} {'max delay (s)':>14} {'missed':>7}")
+    for name, factory in (("fixed", None), ("adaptive", adaptive)):
+        requests, detected = simulate(market, symbols, args.threshold, factory, args.interval)
+        delays = [detected[symbol] - crossings[symbol] for symbol in crossed if symbol in detected]
+        missed = len(crossed) - len(delays)
+        mean = np.mean(delays) if delays else float('nan')
+        worst = np.max(delays) if delays else float('nan')
+        print(f"{name:>10} {requests:10d} {mean:15.1f} {worst:14.1f} {missed:7d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Throughput of the headless tracker service against watchlist size.
+
+Runs update cycles of TrackerService over an in-process fake market with a
+fixed per-request latency and no rate limit, so the numbers show what the
+asyncio scheduler and the tracker's bookkeeping sustain.
+
+    python -m benchmarks.bench_service --sizes 1000 10000 --concurrency 256
+"""
+import argparse
+import asyncio
+import time
+
+from fetch_engine import FetchEngine
+from tracker_service import TrackerService
+from benchmarks.bench_batch_fetch import make_tracker
+from benchmarks.fake_market import FakeMarket
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--concurrency", type=int, default=256, help="requests in flight")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake round-trip latency (s)")
+    parser.add_argument("--batch-size", type=int, default=None, help="also time bulk downloads of this size")
+    parser.add_argument("--cycles", type=int, default=3)
+    args = parser.parse_args()
+    
+    market = FakeMarket(latency=args.latency)
+    modes = [("single", {})]
+    if args.batch_size:
+        modes.append(("batch", {'fetch_mode': "batch", 'batch_size': args.batch_size}))
+    
+    print(f"{'symbols':>8} {'mode':>7} {'fetch (s)':>10} {'eval (ms)':>10} {'symbols/s':>10}")
+    for size in args.sizes:
+        for mode, kwargs in modes:
+            engine = FetchEngine(max_workers=args.concurrency, rate_limit=None)
+            tracker = make_tracker(market, size, fetch_engine=engine, **kwargs)
+            service = TrackerService(tracker, interval=0, concurrency=args.concurrency)
+            
+            start = time.perf_counter()
+            asyncio.run(service.run(cycles=args.cycles))
+            elapsed = (time.perf_counter() - start) / args.cycles
+            last = service.last_cycle
+            assert last['updated'] == size, "fake market returned no data"
+            print(f"{size:8d} {mode:>7} {last['fetch_seconds']:10.2f} "
+                  f"{last['evaluate_seconds'] * 1000:10.1f} {size / elapsed:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Cost of one GUI refresh's analysis work against watchlist size.
+
+"per-symbol" repeats what update_stock_list did before the columnar
+snapshot: get_stock_data -> analyze_stock for every symbol, then
+check_for_alerts -> get_stock_data -> analyze_stock again. "snapshot" is
+get_all_stocks_data plus check_all_alerts after a price update.
+
+    python -m benchmarks.bench_snapshot --sizes 100 1000 10000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from stock_tracker import StockState, StockTracker
+
+
+class LegacyTracker:
+    """The pre-snapshot analysis methods, over the old dict-per-symbol state"""
+    
+    def __init__(self, tracker):
+        self.tracked_stocks = {
+            symbol: {
+                'buy_threshold': state.buy_threshold,
+                'sell_threshold': state.sell_threshold,
+                'current_price': state.current_price,
+                'base_price': state.base_price,
+                'history': [],
+                'last_update': None
+            }
+            for symbol, state in tracker.tracked_stocks.items()
+        }
+    
+    def analyze_stock(self, symbol):
+        if symbol not in self.tracked_stocks:
+            return "N/A"
+        data = self.tracked_stocks[symbol]
+        if data['current_price'] is None or data['base_price'] is None:
+            return "Hold"
+        price_change = data['current_price'] - data['base_price']
+        if price_change <= data['buy_threshold']:
+            return "BUY"
+        elif price_change >= data['sell_threshold']:
+            return "SELL"
+        else:
+            return "HOLD"
+    
+    def get_stock_data(self, symbol):
+        if symbol not in self.tracked_stocks:
+            return None
+        data = self.tracked_stocks[symbol]
+        if data['current_price'] is not None and data['base_price'] is not None:
+            current_price = data['current_price']
+            base_price = data['base_price']
+            return {
+                'symbol': symbol,
+                'current_price': current_price,
+                'base_price': base_price,
+                'change_amount': current_price - base_price,
+                'change_pct': ((current_price - base_price) / base_price) * 100,
+                'recommendation': self.analyze_stock(symbol),
+                'buy_threshold': data['buy_threshold'],
+                'sell_threshold': data['sell_threshold'],
+                'history': data['history']
+            }
+        return None
+    
+    def check_for_alerts(self, symbol):
+        data = self.get_stock_data(symbol)
+        if data and data['recommendation'] in ["BUY", "SELL"]:
+            return {
+                'symbol': symbol,
+                'action': data['recommendation'],
+                'price': data['current_price'],
+                'change_amount': data['change_amount'],
+                'change_pct': data['change_pct'],
+                'message': f"{symbol}: {data['recommendation']} at ${data['current_price']:.2f} (Change: ${data['change_amount']:+.2f})"
+            }
+        return None
+
+
+def legacy_refresh(tracker):
+    rows = [tracker.get_stock_data(symbol) for symbol in tracker.tracked_stocks]
+    alerts = [tracker.check_for_alerts(row['symbol']) for row in rows if row]
+    return rows, alerts
+
+
+def snapshot_refresh(tracker):
+    return tracker.get_all_stocks_data(), tracker.check_all_alerts()
+
+
+def make_tracker(size):
+    rng = np.random.default_rng(0)
+    tracker = StockTracker(history_depth=16)
+    for i, (base, move) in enumerate(zip(rng.uniform(10, 500, size), rng.normal(0, 3, size))):
+        tracker.tracked_stocks[f"S{i:05d}"] = StockState(-2.0, 5.0, float(base + move), float(base),
+                                                         history_depth=16)
+    return tracker
+
+
+def time_refresh(tracker, refresh, repeats):
+    first = next(iter(tracker.tracked_stocks.values()))
+    best = float('inf')
+    for _ in range(repeats):
+        if isinstance(first, StockState):
+            first.current_price += 0.01  # A new tick invalidates the snapshot, as each cycle does
+        start = time.perf_counter()
+        refresh(tracker)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'symbols':>8} {'per-symbol (ms)':>16} {'snapshot (ms)':>14}")
+    for size in args.sizes:
+        tracker = make_tracker(size)
+        legacy = time_refresh(LegacyTracker(tracker), legacy_refresh, args.repeats)
+        vectorized = time_refresh(tracker, snapshot_refresh, args.repeats)
+        print(f"{size:8d} {legacy * 1000:16.2f} {vectorized * 1000:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Import time of the tracker and GUI modules, from `python -X importtime` in fresh interpreters.
+
+Each module is imported in a new process several times and the best total is
+reported, with the slowest imports it pulled in. With --max-ms the run exits
+non-zero when a module's best import time exceeds its budget, so it can guard
+the fast-start path in CI.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --max-ms stock_tracker=300 stock_gui=400 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY = ("pandas", "yfinance", "matplotlib")
+
+
+def import_profile(module):
+    """{imported module: cumulative µs} for importing `module` in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Later entries for a name are nested imports of a package that has since finished
+        profile.setdefault(name.strip(), int(cumulative))
+    return profile
+
+
+def measure(module, repeats):
+    """Best of `repeats` fresh imports: (total ms, profile of that run)"""
+    best = None
+    for _ in range(repeats):
+        profile = import_profile(module)
+        total = profile[module] / 1000
+        if best is None or total < best[0]:
+            best = (total, profile)
+    return best
+
+
+def parse_budgets(items):
+    budgets = {}
+    for item in items or ():
+        module, _, ms = item.partition("=")
+        budgets[module] = float(ms)
+    return budgets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=["stock_tracker", "stock_gui"])
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=8, help="slowest imports listed per module")
+    parser.add_argument("--max-ms", nargs="+", metavar="MODULE=MS", help="import time budgets")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+    budgets = parse_budgets(args.max_ms)
+    
+    results = []
+    failures = 0
+    for module in args.modules:
+        total, profile = measure(module, args.repeats)
+        heavy = [name for name in HEAVY if name in profile]
+        print(f"{module}: {total:.1f} ms  (heavy imports: {', '.join(heavy) or 'none'})")
+        slowest = sorted(((us, name) for name, us in profile.items() if name != module), reverse=True)
+        for us, name in slowest[:args.top]:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+        budget = budgets.get(module)
+        if budget is not None and total > budget:
+            print(f"    over budget: {total:.1f} ms > {budget:.1f} ms")
+            failures += 1
+        results.append({'module': module, 'ms': total, 'heavy': heavy, 'budget_ms': budget})
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""Warm-restart time from the tick store against watchlist size.
+
+Writes --ticks ticks for each of --symbols symbols into a temporary
+TickStore, then times StockTracker.restore() in a fresh tracker.
+
+    python -m benchmarks.bench_store --symbols 100 1000 --ticks 5000
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from stock_tracker import StockTracker
+from tick_store import TickStore
+
+
+def fill_store(directory, symbols, ticks):
+    store = TickStore(directory)
+    times = np.arange(ticks, dtype=np.int64) * 60 * 10 ** 9 + 1_704_205_800 * 10 ** 9
+    prices = 100 + np.random.default_rng(0).normal(0, 0.05, ticks).cumsum()
+    for i in range(symbols):
+        symbol = f"S{i:05d}"
+        store.set_stock(symbol, buy_threshold=-2.0, sell_threshold=5.0, base_price=100.0)
+        for time_ns, price in zip(times.tolist(), prices.tolist()):
+            store.append(symbol, time_ns, price)
+        store.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--ticks", type=int, default=5000, help="stored ticks per symbol")
+    args = parser.parse_args()
+    
+    print(f"{'symbols':>8} {'stored ticks':>13} {'restore (ms)':>13}")
+    for symbols in args.symbols:
+        with tempfile.TemporaryDirectory() as directory:
+            fill_store(directory, symbols, args.ticks)
+            start = time.perf_counter()
+            tracker = StockTracker(store=TickStore(directory))
+            restored = tracker.restore()
+            elapsed = time.perf_counter() - start
+            assert len(restored) == symbols
+            print(f"{symbols:8d} {symbols * args.ticks:13d} {elapsed * 1000:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
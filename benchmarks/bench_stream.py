@@ -0,0 +1,64 @@
+"""Tick-to-recommendation latency of push ingestion through a local replay quote server.
+
+The server runs in its own process and stamps each tick with its send time;
+the client applies it to the tracker, re-evaluates the symbol and its alert
+rules, and records the elapsed time. Polling every `interval` seconds would
+instead see a move after half an interval on average, plus the fetch.
+
+    python -m benchmarks.bench_stream --symbols 100 --minutes 60 --speed 600
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from alert_engine import AlertEngine
+from providers import save_recording
+from quote_stream import QuoteStream
+from stock_tracker import StockState, StockTracker
+from benchmarks.fake_market import FakeMarket, make_bars
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=100)
+    parser.add_argument("--minutes", type=int, default=60, help="recorded minute bars per symbol")
+    parser.add_argument("--speed", type=float, default=600, help="replay speed (0 = as fast as possible)")
+    parser.add_argument("--interval", type=float, default=10.0, help="polling interval to compare with")
+    args = parser.parse_args()
+    
+    symbols = [f"S{i:04d}" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as directory:
+        save_recording({symbol: make_bars(symbol, rows=args.minutes, seed=i) for i, symbol in enumerate(symbols)},
+                       directory)
+        server = subprocess.Popen([sys.executable, "-m", "quote_stream", directory, "--port", "0",
+                                   "--speed", str(args.speed)], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+        try:
+            port = int(server.stdout.readline().rsplit(":", 1)[1])
+            tracker = StockTracker(FakeMarket())
+            for symbol in symbols:
+                tracker.tracked_stocks[symbol] = StockState(-0.5, 0.5)
+            engine = AlertEngine(cooldown=0)
+            stream = QuoteStream(tracker, port=port, alert_engine=engine, reconnect_delay=None)
+            
+            started = time.perf_counter()
+            asyncio.run(stream.run())  # Returns when the server has sent the whole recording
+            elapsed = time.perf_counter() - started
+        finally:
+            server.wait(timeout=10)
+    
+    latency = stream.latency_summary()
+    print(f"{stream.ticks} ticks from {args.symbols} symbols in {elapsed:.1f} s "
+          f"({stream.ticks / elapsed:.0f} ticks/s), {engine.fired} alerts")
+    print(f"push:    mean {latency['mean'] * 1000:.2f} ms  p50 {latency['p50'] * 1000:.2f} ms  "
+          f"p99 {latency['p99'] * 1000:.2f} ms  max {latency['max'] * 1000:.2f} ms")
+    print(f"polling: mean {args.interval / 2 * 1000:.0f} ms + fetch, max {args.interval * 1000:.0f} ms + fetch")
+
+
+if __name__ == "__main__":
+    main()
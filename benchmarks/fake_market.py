@@ -0,0 +1,76 @@
+"""In-process market data provider used by the benchmarks"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from providers import MarketDataProvider
+
+
+def make_bars(symbol, rows=390, start="2024-01-02 09:30", seed=None):
+    """Build a day of deterministic 1-minute OHLCV bars for a symbol"""
+    rng = np.random.default_rng(seed if seed is not None else abs(hash(symbol)) % (2 ** 32))
+    index = pd.date_range(start, periods=rows, freq="1min", tz="America/New_York")
+    close = 100 + np.cumsum(rng.normal(0, 0.05, rows))
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + 0.02,
+        'Low': close - 0.02,
+        'Close': close,
+        'Volume': rng.integers(100, 10000, rows),
+    }, index=index)
+
+
+class FakeMarket(MarketDataProvider):
+    """Synthetic provider with a fixed round-trip latency per request.
+    
+    Bulk downloads also pay a small per-symbol cost so batching is not
+    modelled as free. Setting `minute` replays the session: only that many
+    bars have printed so far.
+    """
+    
+    def __init__(self, latency=0.05, per_symbol_cost=0.0005, rows=390):
+        self.latency = latency
+        self.per_symbol_cost = per_symbol_cost
+        self.rows = rows
+        self.requests = 0
+        self.minute = None
+        self._bars = {}
+    
+    def bars(self, symbol):
+        if symbol not in self._bars:
+            self._bars[symbol] = make_bars(symbol, rows=self.rows)
+        return self._bars[symbol]
+    
+    def visible_bars(self, symbol, start=None):
+        bars = self.bars(symbol)
+        if self.minute is not None:
+            bars = bars.iloc[:self.minute]
+        if start is not None:
+            bars = bars[bars.index >= start]
+        return bars
+    
+    def now(self):
+        bars = self.visible_bars("S00000")
+        return bars.index[-1]
+    
+    def validate_symbol(self, symbol):
+        self.requests += 1
+        time.sleep(self.latency)
+        return True
+    
+    def validate_symbols(self, symbols, timeout=10):
+        # One bulk request, like YFinanceProvider
+        self.requests += 1
+        time.sleep(self.latency + self.per_symbol_cost * len(symbols))
+        return {symbol: True for symbol in symbols}
+    
+    def history(self, symbol, start=None, timeout=10):
+        self.requests += 1
+        time.sleep(self.latency)
+        return self.visible_bars(symbol, start)
+    
+    def download(self, symbols, start=None, timeout=10):
+        self.requests += 1
+        time.sleep(self.latency + self.per_symbol_cost * len(symbols))
+        return {symbol: self.visible_bars(symbol, start) for symbol in symbols}
@@ -0,0 +1,295 @@
+"""Benchmark suite for the tracker and GUI hot paths, with JSON results and regression checks.
+
+Every case runs against the in-process fake market at each watchlist size and
+history depth. GUI cases build the real window (Tk with the Agg canvas) and
+are skipped when no display is available.
+
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --sizes 10 100 --compare results.json
+    python -m benchmarks.run_benchmarks --current new.json --compare results.json
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from fetch_engine import FetchEngine
+from stock_tracker import StockState, StockTracker
+from benchmarks.fake_market import FakeMarket
+
+CASES = {}
+
+
+def case(name, gui=False):
+    """Register a benchmark: setup(size, depth) returns (step, teardown)"""
+    def register(setup):
+        CASES[name] = {'setup': setup, 'gui': gui}
+        return setup
+    return register
+
+
+def make_tracker(size, depth):
+    """A tracker of `size` symbols whose histories are already `depth` points deep"""
+    tracker = StockTracker(FakeMarket(latency=0, per_symbol_cost=0, rows=30),
+                           fetch_engine=FetchEngine(max_workers=8, rate_limit=None), history_depth=depth)
+    rng = np.random.default_rng(0)
+    end = pd.Timestamp("2024-01-02 16:00", tz="America/New_York").value
+    times = end - np.arange(depth, 0, -1, dtype=np.int64) * 60 * 10 ** 9
+    for i in range(size):
+        prices = 100 + np.cumsum(rng.normal(0, 0.05, depth))
+        state = StockState(-2.0, 5.0, float(prices[-1]), float(prices[0]), history_depth=depth,
+                           last_update=pd.Timestamp(int(times[-1]), tz="UTC"))
+        state.history.extend(times, prices)
+        tracker.tracked_stocks[f"S{i:05d}"] = state
+    return tracker
+
+
+def touch(tracker):
+    """A new tick on one stock, invalidating the tracker's snapshot as every cycle does"""
+    state = next(iter(tracker.tracked_stocks.values()))
+    state.current_price = state.current_price + 0.01
+
+
+@case("update_all_stocks")
+def setup_update_all_stocks(size, depth):
+    tracker = make_tracker(size, depth)
+    return tracker.update_all_stocks, None
+
+
+@case("get_all_stocks_data")
+def setup_get_all_stocks_data(size, depth):
+    tracker = make_tracker(size, depth)
+    
+    def step():
+        touch(tracker)
+        tracker.get_all_stocks_data()
+    return step, None
+
+
+@case("check_for_alerts")
+def setup_check_for_alerts(size, depth):
+    tracker = make_tracker(size, depth)
+    symbols = list(tracker.tracked_stocks)
+    
+    def step():
+        touch(tracker)
+        for symbol in symbols:
+            tracker.check_for_alerts(symbol)
+    return step, None
+
+
+def make_gui(size, depth):
+    """The real window over a prepared tracker, without update cycles or on-disk state"""
+    import tkinter as tk
+    import stock_gui
+    
+    tracker = make_tracker(size, depth)
+    root = tk.Tk()
+    with mock.patch.object(stock_gui, "StockTracker", lambda **kwargs: tracker), \
+            mock.patch.object(stock_gui, "ValidationCache", lambda: None), \
+            mock.patch.object(stock_gui, "TickStore", lambda: None), \
+            mock.patch.object(stock_gui.StockTrackingGUI, "start_periodic_updates", lambda self: None):
+        gui = stock_gui.StockTrackingGUI(root)
+    gui.coordinator.publish()
+    gui.update_stock_list()
+    root.update()
+    return gui
+
+
+@case("update_stock_list", gui=True)
+def setup_update_stock_list(size, depth):
+    gui = make_gui(size, depth)
+    
+    def step():
+        touch(gui.tracker)
+        gui.coordinator.publish()
+        gui.update_stock_list()
+        gui.root.update_idletasks()
+    return step, gui.root.destroy
+
+
+@case("update_chart", gui=True)
+def setup_update_chart(size, depth):
+    """Full redraws: every call switches between two stocks"""
+    gui = make_gui(size, depth)
+    symbols = list(gui.tracker.tracked_stocks)[:2]
+    calls = itertools.count()
+    
+    def step():
+        gui.update_chart(symbols[next(calls) % len(symbols)])
+        gui.root.update_idletasks()
+    return step, gui.root.destroy
+
+
+@case("update_chart_tick", gui=True)
+def setup_update_chart_tick(size, depth):
+    """A new tick on the charted stock that fits the current view"""
+    gui = make_gui(size, depth)
+    symbol = next(iter(gui.tracker.tracked_stocks))
+    state = gui.tracker.tracked_stocks[symbol]
+    gui.update_chart(symbol)
+    
+    def step():
+        price = state.history.last_price()
+        state.history.set_last_price(price)
+        state.current_price = price
+        gui.coordinator.publish()
+        gui.update_chart(symbol)
+        gui.root.update_idletasks()
+    return step, gui.root.destroy
+
+
+def display_available():
+    try:
+        import tkinter as tk
+        tk.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+def measure(step, repeats, budget):
+    """Time step() up to `repeats` times, stopping early once `budget` seconds are spent"""
+    timings = []
+    started = time.perf_counter()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        step()
+        timings.append(time.perf_counter() - start)
+        if time.perf_counter() - started > budget:
+            break
+    return {'best': min(timings), 'median': statistics.median(timings), 'runs': len(timings)}
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'time': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def run_suite(cases, sizes, depths, repeats=5, budget=2.0, log=None):
+    """Run the named cases over every size and depth; returns the JSON-ready report"""
+    has_display = display_available() if any(CASES[name]['gui'] for name in cases) else False
+    results, skipped = [], []
+    for name in cases:
+        if CASES[name]['gui'] and not has_display:
+            skipped.append({'case': name, 'reason': "no display"})
+            continue
+        for size in sizes:
+            for depth in depths:
+                step, teardown = CASES[name]['setup'](size, depth)
+                try:
+                    step()  # Warm-up: first snapshot, imports, caches
+                    timing = measure(step, repeats, budget)
+                finally:
+                    if teardown:
+                        teardown()
+                result = dict(case=name, symbols=size, depth=depth, **timing)
+                results.append(result)
+                if log:
+                    log(f"{name:>20} {size:7d} symbols depth {depth:5d}: "
+                        f"{timing['best'] * 1000:10.3f} ms best, {timing['median'] * 1000:10.3f} ms median")
+    return {'environment': environment(), 'results': results, 'skipped': skipped}
+
+
+def compare(baseline, current, threshold=0.25, min_delta=1e-4):
+    """Match results by (case, symbols, depth) and flag best times that got `threshold` slower.
+    
+    Changes smaller than `min_delta` seconds are never flagged, so microsecond
+    cases don't trip on timer noise. Returns (key, baseline, current, ratio,
+    status) rows, status being "regression", "improvement", "ok", "new" or
+    "missing".
+    """
+    def keyed(report):
+        return {(r['case'], r['symbols'], r['depth']): r['best'] for r in report['results']}
+    
+    before, after = keyed(baseline), keyed(current)
+    rows = []
+    for key in sorted(before.keys() | after.keys()):
+        old, new = before.get(key), after.get(key)
+        if old is None or new is None:
+            rows.append((key, old, new, None, "new" if old is None else "missing"))
+            continue
+        ratio = new / old if old else float('inf')
+        if new - old > min_delta and ratio > 1 + threshold:
+            status = "regression"
+        elif old - new > min_delta and ratio < 1 / (1 + threshold):
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((key, old, new, ratio, status))
+    return rows
+
+
+def print_comparison(rows):
+    print(f"{'case':>20} {'symbols':>7} {'depth':>5} {'baseline (ms)':>14} {'current (ms)':>13} "
+          f"{'ratio':>6}  status")
+    for (name, size, depth), old, new, ratio, status in rows:
+        old_text = f"{old * 1000:14.3f}" if old is not None else f"{'-':>14}"
+        new_text = f"{new * 1000:13.3f}" if new is not None else f"{'-':>13}"
+        ratio_text = f"{ratio:6.2f}" if ratio is not None else f"{'-':>6}"
+        print(f"{name:>20} {size:7d} {depth:5d} {old_text} {new_text} {ratio_text}  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--depths", type=int, nargs="+", default=[50, 390, 1000], help="history points per symbol")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per measurement")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds after which a measurement stops early")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--current", help="compare this results file instead of running the suite")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against a baseline results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown ratio flagged as a regression")
+    args = parser.parse_args(argv)
+    
+    if args.current:
+        with open(args.current, encoding="utf-8") as f:
+            report = json.load(f)
+    else:
+        report = run_suite(args.cases, args.sizes, args.depths, args.repeats, args.budget, log=print)
+        for entry in report['skipped']:
+            print(f"{entry['case']:>20} skipped: {entry['reason']}")
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        print()
+        print_comparison(rows)
+        regressions = [row for row in rows if row[4] == "regression"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
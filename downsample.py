@@ -0,0 +1,60 @@
+"""Downsampling of long price series for charting"""
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: pick `threshold` points that keep the visual shape.
+    
+    The first and last points are always kept; from every bucket in between
+    the point forming the largest triangle with the previously kept point and
+    the next bucket's average is chosen.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return x.copy(), y.copy()
+    
+    every = (count - 2) / (threshold - 2)
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0] = 0
+    keep[-1] = count - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, count)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        area = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous]) -
+                      (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        keep[i + 1] = previous
+    
+    return x[keep], y[keep]
+
+
+def min_max(x, y, buckets):
+    """Keep the lowest and highest point of each of `buckets` equal-count buckets, in order"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(x)
+    if 2 * buckets >= count or buckets < 1:
+        return x.copy(), y.copy()
+    
+    edges = np.linspace(0, count, buckets + 1).astype(np.intp)
+    keep = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        lowest = start + int(np.argmin(y[start:end]))
+        highest = start + int(np.argmax(y[start:end]))
+        keep.extend(sorted({lowest, highest}))
+    keep = np.array(keep, dtype=np.intp)
+    return x[keep], y[keep]
+
+
+def downsample(x, y, max_points, method="lttb"):
+    """Reduce a series to at most max_points points; short series are returned as copies"""
+    if method == "minmax":
+        return min_max(x, y, max_points // 2)
+    return lttb(x, y, max_points)
@@ -0,0 +1,142 @@
+"""Concurrent fetch engine with a shared token-bucket rate limiter"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class Cancelled(Exception):
+    """Raised by FetchEngine.fetch when it is cancelled while waiting to retry"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at `rate` tokens per second.
+    
+    Up to `capacity` tokens can accumulate while idle, so short bursts go out
+    immediately and sustained load is held to `rate` requests per second.
+    """
+    
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.last_refill = clock()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    def try_acquire(self, tokens=1):
+        """Take tokens if they are available right now"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+    
+    def acquire(self, tokens=1, timeout=None):
+        """Block until tokens are available; returns False if timeout runs out first"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return True
+                wait = (tokens - self.tokens) / self.rate
+            
+            if deadline is not None and self.clock() + wait > deadline:
+                return False
+            self.sleep(wait)
+
+
+class FetchEngine:
+    """Runs fetches on a worker pool behind a shared rate limiter.
+    
+    fetch_fn(key, timeout) is called for each key. Exceptions are retried with
+    exponential backoff; a key that still fails after `retries` extra attempts
+    is reported as False.
+    """
+    
+    def __init__(self, max_workers=4, rate_limit=2.0, burst=None, timeout=10, retries=2,
+                 backoff=0.5, sleep=time.sleep):
+        self.max_workers = max_workers
+        self.limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.timeout = timeout  # Per-request timeout passed to fetch_fn (seconds)
+        self.retries = retries
+        self.backoff = backoff  # First retry delay in seconds, doubled on each retry
+        self.sleep = sleep
+        self.metrics = None  # Optional metrics.TrackerMetrics counting retries and failures
+    
+    def fetch(self, key, fetch_fn, cancel=None):
+        """Fetch one key, waiting for the rate limiter and retrying on errors.
+        
+        Setting the `cancel` event ends a backoff wait early and raises Cancelled.
+        """
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+            try:
+                return fetch_fn(key, self.timeout)
+            except Exception:
+                if attempt == self.retries:
+                    if self.metrics is not None:
+                        self.metrics.fetch_failures.inc()
+                    raise
+                if self.metrics is not None:
+                    self.metrics.fetch_retries.inc()
+                if cancel is None:
+                    self.sleep(delay)
+                elif cancel.wait(delay):
+                    raise Cancelled(key)
+                delay *= 2
+    
+    def run(self, keys, fetch_fn, progress_callback=None, weight=None, label=str, cancel=None):
+        """Fetch all keys concurrently and return {key: result}.
+        
+        progress_callback(done, total) is called from the calling thread as
+        results arrive. weight(key) gives the number of progress units a key
+        counts for (default 1), e.g. the number of symbols in a batch, and
+        label(key) names the key in error messages. Once the `cancel` event is
+        set, requests not yet started and retries not yet made are dropped and
+        their keys are left out of the result; requests already in flight finish.
+        """
+        keys = list(keys)
+        weight = weight or (lambda key: 1)
+        total = sum(weight(key) for key in keys)
+        results = {}
+        done = 0
+        
+        if not keys:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(keys))) as pool:
+            futures = {pool.submit(self.fetch, key, fetch_fn, cancel): key for key in keys}
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                key = futures[future]
+                try:
+                    results[key] = future.result()
+                except Cancelled:
+                    continue
+                except Exception as e:
+                    print(f"Error updating {label(key)}: {e}")
+                    results[key] = False
+                
+                done += weight(key)
+                if progress_callback:
+                    progress_callback(done, total)
+                if cancel is not None and cancel.is_set():
+                    for pending in futures:
+                        pending.cancel()
+        
+        return results
@@ -0,0 +1,298 @@
+"""Counters, gauges and histograms for the tracker, rendered in the Prometheus text format.
+
+Instrumented code holds an optional metrics object and checks it against None,
+so with metrics disabled the cost is one comparison per instrumented call.
+"""
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    escaped = [(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+               for name, value in pairs]
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named metric with one value per combination of label values"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}  # label values tuple -> value
+    
+    def samples(self):
+        """(suffix, label values, extra labels, value) tuples to render"""
+        with self.lock:
+            return [("", labels, (), value) for labels, value in sorted(self.values.items())]
+    
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, extra, value in self.samples():
+            pairs = list(zip(self.labelnames, labels)) + list(extra)
+            lines.append(f"{self.name}{suffix}{_format_labels(pairs)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+    
+    def inc(self, amount=1, labels=()):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+    
+    def total(self):
+        with self.lock:
+            return sum(self.values.values())
+
+
+class Gauge(Metric):
+    kind = "gauge"
+    
+    def set(self, value, labels=()):
+        with self.lock:
+            self.values[labels] = value
+    
+    def get(self, labels=()):
+        with self.lock:
+            return self.values.get(labels)
+
+
+class Histogram(Metric):
+    """Observations counted into cumulative `le` buckets, plus their sum and count"""
+    
+    kind = "histogram"
+    
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def observe(self, value, labels=()):
+        with self.lock:
+            series = self.values.get(labels)
+            if series is None:
+                series = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+    
+    def time(self, labels=()):
+        """Context manager observing the seconds spent in its block"""
+        return _Timer(self, labels)
+    
+    def samples(self):
+        samples = []
+        with self.lock:
+            for labels, (counts, total, count) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, bucket in zip(self.buckets + (float('inf'),), counts):
+                    cumulative += bucket
+                    samples.append(("_bucket", labels, (("le", _format_value(float(bound))),), cumulative))
+                samples.append(("_sum", labels, (), total))
+                samples.append(("_count", labels, (), count))
+        return samples
+    
+    def totals(self):
+        """(bucket counts, sum, count) over all label values"""
+        counts = [0] * (len(self.buckets) + 1)
+        total = count = 0
+        with self.lock:
+            for series_counts, series_total, series_count in self.values.values():
+                counts = [a + b for a, b in zip(counts, series_counts)]
+                total += series_total
+                count += series_count
+        return counts, total, count
+    
+    def quantile(self, q):
+        """Estimate of the q-quantile over all label values, interpolated within its bucket"""
+        counts, _, count = self.totals()
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        lower = 0.0
+        for bound, bucket in zip(self.buckets, counts):
+            if bucket and cumulative + bucket >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / bucket
+            cumulative += bucket
+            lower = bound
+        return self.buckets[-1]  # Beyond the largest bucket
+    
+    def mean(self):
+        _, total, count = self.totals()
+        return total / count if count else None
+
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, self.labels)
+
+
+class MetricsRegistry:
+    """A set of metrics rendered together"""
+    
+    def __init__(self):
+        self.metrics = []
+    
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+    
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+    
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+    
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+    
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+class TrackerMetrics(MetricsRegistry):
+    """The tracker's metrics: fetches, cycles, pushed ticks and GUI refreshes.
+    
+    With per_symbol=True fetch latency and errors are labelled by symbol; for
+    very large watchlists per_symbol=False keeps the output small.
+    """
+    
+    def __init__(self, per_symbol=True):
+        super().__init__()
+        self.per_symbol = per_symbol
+        symbol = ("symbol",) if per_symbol else ()
+        self.fetch_seconds = self.histogram(
+            "stock_tracker_fetch_seconds", "Latency of single-symbol price requests", symbol)
+        self.batch_fetch_seconds = self.histogram(
+            "stock_tracker_batch_fetch_seconds", "Latency of bulk price requests")
+        self.fetch_errors = self.counter(
+            "stock_tracker_fetch_errors_total", "Failed price requests, counted for each symbol they covered", symbol)
+        self.fetch_retries = self.counter(
+            "stock_tracker_fetch_retries_total", "Requests retried after an error")
+        self.fetch_failures = self.counter(
+            "stock_tracker_fetch_failures_total", "Requests that still failed after all retries")
+        self.requests = self.counter(
+            "stock_tracker_requests_total", "Price requests by kind (full or incremental)", ("kind",))
+        self.rows_fetched = self.counter(
+            "stock_tracker_rows_fetched_total", "Price bars received")
+        self.bytes_fetched = self.counter(
+            "stock_tracker_bytes_fetched_total", "In-memory size of the price bars received")
+        self.cycle_seconds = self.histogram(
+            "stock_tracker_cycle_seconds", "Duration of update cycles",
+            buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0))
+        self.cycle_symbols = self.counter(
+            "stock_tracker_cycle_symbols_total", "Symbols updated by cycles, by outcome", ("outcome",))
+        self.tracked_symbols = self.gauge(
+            "stock_tracker_tracked_symbols", "Symbols on the watchlist at the last cycle")
+        self.tick_latency_seconds = self.histogram(
+            "stock_tracker_tick_latency_seconds", "Pushed ticks from server send to recommendation",
+            buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+        self.refresh_seconds = self.histogram(
+            "stock_tracker_gui_refresh_seconds", "GUI stock list refreshes",
+            buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+        self.chart_seconds = self.histogram(
+            "stock_tracker_chart_render_seconds", "Chart updates by mode (draw or blit)", ("mode",),
+            buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+    
+    def symbol_labels(self, symbol):
+        return (symbol,) if self.per_symbol else ()
+    
+    def record_cycle(self, seconds, results, tracked):
+        """One update cycle's duration and {symbol: success} results"""
+        self.cycle_seconds.observe(seconds)
+        updated = sum(1 for ok in results.values() if ok)
+        self.cycle_symbols.inc(updated, ("updated",))
+        self.cycle_symbols.inc(len(results) - updated, ("failed",))
+        self.tracked_symbols.set(tracked)
+    
+    def summary(self):
+        """Short human-readable lines for a stats panel"""
+        def ms(value):
+            return "-" if value is None else f"{value * 1000:.1f} ms"
+        
+        _, _, fetches = self.fetch_seconds.totals()
+        _, _, cycles = self.cycle_seconds.totals()
+        return [
+            f"Fetches: {fetches}  p50 {ms(self.fetch_seconds.quantile(0.5))}  "
+            f"p95 {ms(self.fetch_seconds.quantile(0.95))}",
+            f"Errors: {self.fetch_errors.total()}  retries {self.fetch_retries.total()}  "
+            f"failed {self.fetch_failures.total()}",
+            f"Cycles: {cycles}  mean {ms(self.cycle_seconds.mean())}  "
+            f"p95 {ms(self.cycle_seconds.quantile(0.95))}",
+            f"Rows fetched: {self.rows_fetched.total():,}  ({self.bytes_fetched.total() / 1e6:.1f} MB)",
+            f"List refresh: mean {ms(self.refresh_seconds.mean())}  "
+            f"p95 {ms(self.refresh_seconds.quantile(0.95))}",
+            f"Chart: mean {ms(self.chart_seconds.mean())}  p95 {ms(self.chart_seconds.quantile(0.95))}",
+        ]
+
+
+class MetricsServer:
+    """Serves a registry's render() at http://host:port/metrics from a daemon thread.
+    
+    Binds to localhost by default; port 0 picks a free port, stored in `port`
+    once started.
+    """
+    
+    def __init__(self, registry, host="127.0.0.1", port=9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+    
+    def start(self):
+        registry = self.registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
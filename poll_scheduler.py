@@ -0,0 +1,197 @@
+"""Adaptive per-symbol polling driven by threshold proximity, volatility and market hours"""
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime, time as clock_time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+class MarketHours:
+    """Regular NYSE session: weekdays 9:30-16:00 New York time, minus listed holidays"""
+    
+    def __init__(self, open_time=clock_time(9, 30), close_time=clock_time(16, 0), holidays=(), tz=NEW_YORK):
+        self.open_time = open_time
+        self.close_time = close_time
+        self.holidays = set(holidays)  # datetime.date values the exchange is closed
+        self.tz = tz
+    
+    def _local(self, timestamp):
+        return datetime.fromtimestamp(timestamp, self.tz)
+    
+    def _trading_day(self, day):
+        return day.weekday() < 5 and day not in self.holidays
+    
+    def is_open(self, timestamp):
+        """Whether the session is open at a POSIX timestamp"""
+        local = self._local(timestamp)
+        return (self._trading_day(local.date()) and
+                self.open_time <= local.time().replace(tzinfo=None) < self.close_time)
+    
+    def next_open(self, timestamp):
+        """POSIX timestamp of the next session open at or after timestamp"""
+        local = self._local(timestamp)
+        day = local.date()
+        if local.time().replace(tzinfo=None) >= self.open_time:
+            day += timedelta(days=1)
+        while not self._trading_day(day):
+            day += timedelta(days=1)
+        return datetime.combine(day, self.open_time, self.tz).timestamp()
+
+
+class PollScheduler:
+    """Decides which symbols are due for a poll, and when each is polled next.
+    
+    A symbol's next poll comes sooner the closer its dollar change is to the
+    buy or sell threshold relative to its recent volatility. For a random walk
+    with per-second volatility s, a move of d dollars takes about (d / s)^2
+    seconds, and the poll interval is `safety` times that, clamped to
+    [min_interval, max_interval]. Stocks already past a threshold are timed by
+    their distance back to it, and symbols without enough history are polled
+    every min_interval.
+    
+    due() hands out at most `budget` polls per second on average, oldest due
+    first, and nothing while the market is closed.
+    """
+    
+    def __init__(self, tracker, min_interval=None, max_interval=300.0, budget=2.0, safety=0.02,
+                 volatility_window=30, market_hours=None, clock=time.time):
+        self.tracker = tracker
+        # Never slower than the fixed interval for symbols near a trigger
+        self.min_interval = min_interval if min_interval is not None else tracker.update_interval / 1000
+        self.max_interval = max_interval
+        self.budget = budget  # Polls per second across all symbols
+        self.safety = safety  # Fraction of the expected time to reach a threshold
+        self.volatility_window = volatility_window  # History samples used for volatility
+        self.market_hours = market_hours or MarketHours()
+        self.clock = clock
+        self.polls = 0
+        self.intervals = {}  # symbol -> seconds until its next poll, as last scheduled
+        self._due = {}  # symbol -> due time; heap entries that disagree are stale
+        self._heap = []
+        self._order = itertools.count()
+        self._allowance = 0.0
+        self._last_refill = None
+        self._was_open = None
+    
+    def _schedule(self, symbol, due):
+        self._due[symbol] = due
+        heapq.heappush(self._heap, (due, next(self._order), symbol))
+    
+    def _refill(self, now):
+        if self._last_refill is not None:
+            # Unused budget carries over for at most a few seconds
+            self._allowance = min(self._allowance + (now - self._last_refill) * self.budget,
+                                  max(1.0, self.budget * 5))
+        else:
+            self._allowance = max(1.0, self.budget)
+        self._last_refill = now
+    
+    def due(self):
+        """Symbols to poll now, most overdue first, within the request budget"""
+        now = self.clock()
+        is_open = self.market_hours.is_open(now)
+        if not is_open:
+            self._was_open = False
+            self._last_refill = None
+            return []
+        
+        tracked = self.tracker.tracked_stocks
+        if self._was_open is False:
+            # Prices moved while the market was closed: everything is stale again
+            self._due.clear()
+            self._heap = []
+        self._was_open = True
+        for symbol in list(tracked):
+            if symbol not in self._due:
+                self._schedule(symbol, now)
+        
+        self._refill(now)
+        symbols = []
+        while self._heap and self._heap[0][0] <= now and self._allowance >= 1:
+            due, _, symbol = heapq.heappop(self._heap)
+            if self._due.get(symbol) != due:
+                continue
+            if symbol not in tracked:
+                del self._due[symbol]
+                continue
+            symbols.append(symbol)
+            self._allowance -= 1
+        
+        # Polls in flight are rescheduled by record(); until then they are not handed out again
+        for symbol in symbols:
+            self._due[symbol] = math.inf
+        self.polls += len(symbols)
+        return symbols
+    
+    def next_due(self):
+        """Seconds until the next poll could be due, or until the market opens"""
+        now = self.clock()
+        if not self.market_hours.is_open(now):
+            return self.market_hours.next_open(now) - now
+        while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        if len(self._due) < len(self.tracker.tracked_stocks):
+            wait = 0.0  # Newly tracked symbols are due right away
+        elif not self._heap:
+            # Empty watchlist, or every symbol in flight until record()
+            wait = self.max_interval
+        else:
+            wait = max(0.0, self._heap[0][0] - now)
+        if self._last_refill is not None and self._allowance < 1:
+            # Out of budget: nothing can go out before the next request's worth accrues
+            wait = max(wait, (1 - self._allowance) / self.budget - (now - self._last_refill))
+        return wait
+    
+    def record(self, results):
+        """Schedule the next poll of each polled symbol from {symbol: success}"""
+        now = self.clock()
+        snapshot = self.tracker.snapshot()
+        for symbol, ok in results.items():
+            if symbol not in self.tracker.tracked_stocks:
+                self._due.pop(symbol, None)
+                continue
+            row = snapshot.index.get(symbol)
+            interval = self.interval_for(snapshot, row) if ok and row is not None else self.min_interval
+            self.intervals[symbol] = interval
+            self._schedule(symbol, now + interval)
+    
+    def interval_for(self, snapshot, row):
+        """Seconds until a symbol's next poll"""
+        if not snapshot.has_data[row]:
+            return self.min_interval
+        
+        # Distance to the nearest threshold from either side: a stock past one is
+        # watched for moving back as closely as one approaching it
+        change = snapshot.change_amount[row]
+        distance = abs(min(change - snapshot.buy_threshold[row], snapshot.sell_threshold[row] - change,
+                           key=abs))
+        if distance == 0:
+            return self.min_interval
+        
+        volatility = self.volatility(snapshot.states[row].history)
+        if volatility is None:
+            return self.min_interval
+        if volatility == 0:
+            return self.max_interval  # No movement at all in the recent history
+        
+        expected = (distance / volatility) ** 2
+        return float(np.clip(self.safety * expected, self.min_interval, self.max_interval))
+    
+    def volatility(self, history):
+        """Realized price volatility per square-root second over the recent history, or None"""
+        count = self.volatility_window + 1
+        times = history.times()[-count:]
+        prices = history.prices()[-count:]
+        if len(prices) < 3:
+            return None
+        
+        # Squared moves over elapsed time, so repeated polls of the same bar don't dilute it
+        elapsed = (times[-1] - times[0]) / 1e9
+        if elapsed <= 0:
+            return None
+        return math.sqrt(float(np.sum(np.diff(prices) ** 2)) / elapsed)
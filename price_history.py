@@ -0,0 +1,120 @@
+"""Fixed-capacity, array-backed price history"""
+import numpy as np
+
+DEFAULT_HISTORY_DEPTH = 390  # One regular trading session of 1-minute bars
+
+
+class PriceHistory:
+    """Ring buffer of (time, price) samples stored as int64 ns and float64 arrays.
+    
+    Keeps the newest `capacity` samples. The backing arrays have some slack
+    past the capacity; when it runs out the newest samples are slid back to
+    the front, so appends are amortized O(1) and the samples always sit in one
+    contiguous slice. times() and prices() return read-only views of that
+    slice without copying; a view is only valid until the next append.
+    """
+    
+    __slots__ = ('capacity', '_times', '_prices', '_start', '_end')
+    
+    def __init__(self, capacity=DEFAULT_HISTORY_DEPTH):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        
+        size = capacity + max(16, capacity // 4)
+        self.capacity = capacity
+        self._times = np.zeros(size, dtype=np.int64)
+        self._prices = np.zeros(size, dtype=np.float64)
+        self._start = 0
+        self._end = 0
+    
+    def __len__(self):
+        return self._end - self._start
+    
+    def append(self, time, price):
+        """Add a sample; time may be a Timestamp, datetime or ns since the epoch"""
+        if self._end == len(self._times):
+            keep = self.capacity - 1
+            self._times[:keep] = self._times[self._end - keep:self._end]
+            self._prices[:keep] = self._prices[self._end - keep:self._end]
+            self._start = 0
+            self._end = keep
+        
+        self._times[self._end] = to_ns(time)
+        self._prices[self._end] = price
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+    
+    def extend(self, times, prices):
+        """Append many samples at once; times are ns since the epoch"""
+        times = np.asarray(times, dtype=np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        count = len(times)
+        if count >= self.capacity:
+            self._times[:self.capacity] = times[-self.capacity:]
+            self._prices[:self.capacity] = prices[-self.capacity:]
+            self._start = 0
+            self._end = self.capacity
+            return
+        
+        if self._end + count > len(self._times):
+            keep = min(len(self), self.capacity - count)
+            self._times[:keep] = self._times[self._end - keep:self._end]
+            self._prices[:keep] = self._prices[self._end - keep:self._end]
+            self._start = 0
+            self._end = keep
+        
+        self._times[self._end:self._end + count] = times
+        self._prices[self._end:self._end + count] = prices
+        self._end += count
+        self._start = max(self._start, self._end - self.capacity)
+    
+    def set_last_price(self, price):
+        """Revise the newest sample's price in place (e.g. a still-forming bar)"""
+        if self._end == self._start:
+            raise IndexError("history is empty")
+        self._prices[self._end - 1] = price
+    
+    def last_time(self):
+        """Time of the newest sample in ns since the epoch, or None if empty"""
+        return int(self._times[self._end - 1]) if self._end > self._start else None
+    
+    def last_price(self):
+        return float(self._prices[self._end - 1]) if self._end > self._start else None
+    
+    def times(self):
+        """Read-only int64 view of sample times (ns since the epoch, UTC)"""
+        return _read_only(self._times[self._start:self._end])
+    
+    def prices(self):
+        """Read-only float64 view of sample prices"""
+        return _read_only(self._prices[self._start:self._end])
+    
+    def frozen(self):
+        """Compact copy of the current samples with read-only arrays; appending to it raises ValueError"""
+        copy = PriceHistory.__new__(PriceHistory)
+        copy.capacity = self.capacity
+        copy._times = _read_only(self._times[self._start:self._end].copy())
+        copy._prices = _read_only(self._prices[self._start:self._end].copy())
+        copy._start = 0
+        copy._end = len(copy._times)
+        return copy
+    
+    def clear(self):
+        self._start = 0
+        self._end = 0
+
+
+def to_ns(time):
+    """Convert a timestamp-like value to int64 ns since the epoch (UTC)"""
+    if isinstance(time, (int, np.integer)):
+        return int(time)
+    import pandas as pd
+    if isinstance(time, pd.Timestamp):
+        return time.value
+    return pd.Timestamp(time).value
+
+
+def _read_only(view):
+    view.flags.writeable = False
+    return view
@@ -0,0 +1,241 @@
+"""Market data providers for StockTracker.
+
+A provider returns 1-minute bars as pandas frames indexed by bar time with at
+least a 'Close' column, the same shape as yfinance's Ticker.history().
+
+pandas and yfinance are imported on first use, so importing the tracker (or
+opening the GUI) does not pay for them up front.
+"""
+import os
+import time
+
+
+def _yfinance():
+    import yfinance
+    return yfinance
+
+
+def split_batch_frame(data, symbols):
+    """Split a multi-ticker download into a dict of per-symbol frames"""
+    import pandas as pd
+    
+    frames = {}
+    if data is None or data.empty:
+        return frames
+    
+    if isinstance(data.columns, pd.MultiIndex):
+        available = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol in available:
+                # Bars are aligned across tickers, so drop rows this symbol did not trade
+                frames[symbol] = data[symbol].dropna(subset=['Close'])
+    elif len(symbols) == 1:
+        frames[symbols[0]] = data.dropna(subset=['Close'])
+    
+    return frames
+
+
+class MarketDataProvider:
+    """Interface the tracker uses to validate symbols and fetch price bars"""
+    
+    def validate_symbol(self, symbol):
+        """Return True if the provider knows the symbol"""
+        raise NotImplementedError
+    
+    def validate_symbols(self, symbols, timeout=10):
+        """Return {symbol: valid} for several symbols.
+        
+        The default checks one symbol at a time; providers that can check
+        many in one request should override it.
+        """
+        return {symbol: self.validate_symbol(symbol) for symbol in symbols}
+    
+    def history(self, symbol, start=None, timeout=10):
+        """Return 1-minute bars from start onwards, or for the current day if start is None"""
+        raise NotImplementedError
+    
+    def download(self, symbols, start=None, timeout=10):
+        """Return {symbol: bars} for several symbols; symbols without data are left out.
+        
+        The default makes one history() call per symbol; providers with a bulk
+        endpoint should override it.
+        """
+        frames = {}
+        for symbol in symbols:
+            hist = self.history(symbol, start=start, timeout=timeout)
+            if hist is not None and not hist.empty:
+                frames[symbol] = hist
+        return frames
+    
+    def now(self):
+        """Current time as seen by the provider"""
+        import pandas as pd
+        return pd.Timestamp.now(tz="UTC")
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live data from Yahoo Finance through yfinance"""
+    
+    def validate_symbol(self, symbol):
+        return self.validate_symbols([symbol])[symbol]
+    
+    def validate_symbols(self, symbols, timeout=10):
+        # A few daily bars for all symbols in one request is far lighter than
+        # each Ticker.info payload; a symbol is valid if it has any prices
+        symbols = list(symbols)
+        data = _yfinance().download(symbols, period="5d", interval="1d", group_by="ticker",
+                                   progress=False, threads=True, timeout=timeout)
+        frames = split_batch_frame(data, symbols)
+        return {symbol: symbol in frames and not frames[symbol].empty for symbol in symbols}
+    
+    def history(self, symbol, start=None, timeout=10):
+        stock = _yfinance().Ticker(symbol)
+        if start is None:
+            # Get data for the current day with 1-minute intervals
+            return stock.history(period="1d", interval="1m", timeout=timeout)
+        return stock.history(start=start, interval="1m", timeout=timeout)
+    
+    def download(self, symbols, start=None, timeout=10):
+        yf = _yfinance()
+        if start is None:
+            data = yf.download(list(symbols), period="1d", interval="1m", group_by="ticker",
+                               progress=False, threads=True, timeout=timeout)
+        else:
+            data = yf.download(list(symbols), start=start, interval="1m", group_by="ticker",
+                               progress=False, threads=True, timeout=timeout)
+        return split_batch_frame(data, symbols)
+
+
+def _to_datetime_index(values, tz):
+    import pandas as pd
+    
+    try:
+        index = pd.DatetimeIndex(pd.to_datetime(values))
+    except (ValueError, TypeError):
+        # Mixed UTC offsets, e.g. a recording that spans a DST change
+        index = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    
+    index = index.tz_localize(tz) if index.tz is None else index.tz_convert(tz)
+    # Parsed files may come back at second resolution; the replay clock works in ns
+    return index.as_unit("ns")
+
+
+def load_bars(path, tz="America/New_York"):
+    """Read recorded bars from a CSV or Parquet file.
+    
+    The first column (or the Parquet index) holds the bar time; naive times are
+    taken to be in tz. Column names are matched case-insensitively, so both
+    yfinance exports ('Close') and plain recordings ('close') load.
+    """
+    import pandas as pd
+    
+    if path.endswith(".parquet"):
+        frame = pd.read_parquet(path)
+        if not isinstance(frame.index, pd.DatetimeIndex):
+            frame = frame.set_index(frame.columns[0])
+    else:
+        frame = pd.read_csv(path, index_col=0)
+    
+    frame.index = _to_datetime_index(frame.index, tz)
+    frame.index.name = "Datetime"
+    frame = frame.rename(columns={column: column.capitalize() for column in frame.columns})
+    return frame.sort_index()
+
+
+def recording_files(directory):
+    """{symbol: path} of the SYMBOL.csv / SYMBOL.parquet files in a recording directory"""
+    files = {}
+    for name in sorted(os.listdir(directory)):
+        symbol, ext = os.path.splitext(name)
+        if ext in (".csv", ".parquet"):
+            files[symbol.upper()] = os.path.join(directory, name)
+    return files
+
+
+def save_recording(frames, directory, fmt="csv"):
+    """Write {symbol: bars} to directory as one SYMBOL.csv / SYMBOL.parquet file per symbol"""
+    os.makedirs(directory, exist_ok=True)
+    for symbol, frame in frames.items():
+        path = os.path.join(directory, f"{symbol}.{fmt}")
+        if fmt == "parquet":
+            frame.to_parquet(path)
+        else:
+            frame.to_csv(path)
+
+
+class ReplayProvider(MarketDataProvider):
+    """Replays recorded 1-minute bars from a directory of SYMBOL.csv / SYMBOL.parquet files.
+    
+    The replay clock starts at `start` (default: the earliest recorded bar)
+    and advances `speed` times faster than the wall clock, so speed=60 plays
+    one recorded minute per second. Only bars up to the replay clock are
+    returned. Pass a fake `clock` to step the replay deterministically, and
+    `latency` to add a simulated round-trip delay per request.
+    """
+    
+    def __init__(self, directory, speed=1.0, start=None, tz="America/New_York",
+                 clock=time.monotonic, latency=0.0):
+        import pandas as pd
+        
+        self.directory = directory
+        self.speed = speed
+        self.tz = tz
+        self.clock = clock
+        self.latency = latency
+        self._files = recording_files(directory)
+        self._bars = {}
+        
+        if start is None:
+            firsts = [self._load(symbol).index[0] for symbol in self._files if not self._load(symbol).empty]
+            start = min(firsts) if firsts else pd.Timestamp.now(tz=tz)
+        self.start = pd.Timestamp(start)
+        self._started_at = clock()
+    
+    @property
+    def symbols(self):
+        return list(self._files)
+    
+    def _load(self, symbol):
+        if symbol not in self._bars:
+            self._bars[symbol] = load_bars(self._files[symbol], self.tz)
+        return self._bars[symbol]
+    
+    def now(self):
+        import pandas as pd
+        elapsed = self.clock() - self._started_at
+        return self.start + pd.Timedelta(seconds=elapsed * self.speed)
+    
+    def validate_symbol(self, symbol):
+        return symbol in self._files
+    
+    def history(self, symbol, start=None, timeout=10):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._visible_bars(symbol, start)
+    
+    def download(self, symbols, start=None, timeout=10):
+        # One simulated round trip for the whole request, like a bulk endpoint
+        if self.latency:
+            time.sleep(self.latency)
+        frames = {}
+        for symbol in symbols:
+            bars = self._visible_bars(symbol, start)
+            if not bars.empty:
+                frames[symbol] = bars
+        return frames
+    
+    def _visible_bars(self, symbol, start):
+        if symbol not in self._files:
+            import pandas as pd
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+        
+        bars = self._load(symbol)
+        end = bars.index.searchsorted(self.now(), side="right")
+        if start is not None:
+            return bars.iloc[bars.index.searchsorted(start):end]
+        
+        # Like period="1d": the most recent session that has printed so far
+        if end == 0:
+            return bars.iloc[:0]
+        session_start = bars.index[end - 1].normalize()
+        return bars.iloc[bars.index.searchsorted(session_start):end]
@@ -0,0 +1,338 @@
+"""Push ingestion: a quote stream client and a local stand-in server replaying recorded ticks.
+
+Line protocol over TCP, one message per line:
+
+    client -> server   SUBSCRIBE AAPL MSFT      UNSUBSCRIBE MSFT
+    server -> client   AAPL 1704205800000000000 185.64 1704205800001234567
+
+A tick is the symbol, the quote time and the price, optionally followed by
+the server's send time; times are ns since the epoch. Serve a recording with
+
+    python quote_stream.py recordings/2024-01-02 --port 9001 --speed 60
+"""
+import argparse
+import asyncio
+import collections
+import inspect
+import sys
+import threading
+import time
+
+import numpy as np
+
+from providers import load_bars, recording_files
+from snapshot import RECOMMENDATIONS, state_code
+
+DEFAULT_PORT = 9001
+
+
+def format_tick(symbol, time_ns, price, sent_ns=None):
+    line = f"{symbol} {int(time_ns)} {float(price)!r}"
+    if sent_ns is not None:
+        line += f" {int(sent_ns)}"
+    return line + "\n"
+
+
+def parse_tick(line):
+    """(symbol, time_ns, price, sent_ns or None) from a tick line"""
+    parts = line.split()
+    if len(parts) not in (3, 4):
+        raise ValueError(f"Malformed tick: {line!r}")
+    sent_ns = int(parts[3]) if len(parts) == 4 else None
+    return parts[0], int(parts[1]), float(parts[2]), sent_ns
+
+
+class QuoteStream:
+    """Applies ticks from a quote server to a tracker as they arrive.
+    
+    Each tick goes through StockTracker.apply_tick, the same bookkeeping an
+    update_stock_data poll does, and only the ticking symbol is re-evaluated:
+    its recommendation, and its rules in `alert_engine` if one is given.
+    `on_tick(symbol, recommendation, alerts)` is called after every applied
+    tick; if it returns an awaitable, the stream awaits it. Subscriptions
+    follow the tracker's watchlist. After a dropped connection the stream
+    reconnects every `reconnect_delay` seconds, or stops if that is None.
+    """
+    
+    def __init__(self, tracker, host="127.0.0.1", port=DEFAULT_PORT, alert_engine=None, on_tick=None,
+                 reconnect_delay=1.0, sync_interval=1.0, latency_samples=100000):
+        self.tracker = tracker
+        self.host = host
+        self.port = port
+        self.alert_engine = alert_engine
+        self.on_tick = on_tick
+        self.reconnect_delay = reconnect_delay
+        self.sync_interval = sync_interval  # Seconds between watchlist/subscription comparisons
+        self.ticks = 0  # Ticks applied
+        self.ignored = 0  # Ticks for symbols no longer tracked
+        self.connects = 0
+        # Seconds from the server sending a tick to its recommendation being known
+        self.latencies = collections.deque(maxlen=latency_samples)
+        self.subscribed = set()
+        self._writer = None
+        self._stopping = None
+        self._loop = None
+        self._thread = None
+    
+    def apply(self, symbol, time_ns, price, sent_ns=None):
+        """Apply one tick and re-evaluate its symbol; returns on_tick's result"""
+        tracker = self.tracker
+        if not tracker.apply_tick(symbol, time_ns, price):
+            self.ignored += 1
+            return None
+        
+        state = tracker.tracked_stocks.get(symbol)
+        if state is None:
+            self.ignored += 1
+            return None
+        recommendation = str(RECOMMENDATIONS[state_code(state)])
+        alerts = self.alert_engine.update_from(tracker.tracked_stocks, [symbol]) if self.alert_engine else []
+        if sent_ns is not None:
+            latency = (time.time_ns() - sent_ns) / 1e9
+            self.latencies.append(latency)
+            if tracker.metrics is not None:
+                tracker.metrics.tick_latency_seconds.observe(latency)
+        self.ticks += 1
+        
+        if self.on_tick is not None:
+            return self.on_tick(symbol, recommendation, alerts)
+        return None
+    
+    async def sync_subscriptions(self):
+        """Subscribe to newly tracked symbols and unsubscribe from removed ones"""
+        if self._writer is None:
+            return
+        with self.tracker.lock:
+            tracked = set(self.tracker.tracked_stocks)
+        added = sorted(tracked - self.subscribed)
+        removed = sorted(self.subscribed - tracked)
+        if added:
+            self._writer.write(("SUBSCRIBE " + " ".join(added) + "\n").encode())
+        if removed:
+            self._writer.write(("UNSUBSCRIBE " + " ".join(removed) + "\n").encode())
+        self.subscribed = tracked
+        await self._writer.drain()
+    
+    async def _keep_subscribed(self):
+        try:
+            while True:
+                await asyncio.sleep(self.sync_interval)
+                await self.sync_subscriptions()
+        except ConnectionError:
+            pass  # The consumer sees the connection drop too
+    
+    async def _consume(self, reader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return  # Server closed the connection
+            try:
+                symbol, time_ns, price, sent_ns = parse_tick(line.decode())
+            except ValueError as e:
+                print(f"Quote stream: {e}", file=sys.stderr)
+                continue
+            result = self.apply(symbol, time_ns, price, sent_ns)
+            if inspect.isawaitable(result):
+                await result
+    
+    async def run(self):
+        """Connect, subscribe and apply ticks until stop() (or the stream ends without reconnects)"""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            try:
+                reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            except OSError as e:
+                print(f"Quote stream: cannot connect to {self.host}:{self.port}: {e}", file=sys.stderr)
+            else:
+                self.connects += 1
+                self.subscribed = set()
+                keeper = None
+                try:
+                    await self.sync_subscriptions()
+                    keeper = asyncio.ensure_future(self._keep_subscribed())
+                    consumer = asyncio.ensure_future(self._consume(reader))
+                    stopping = asyncio.ensure_future(self._stopping.wait())
+                    await asyncio.wait({consumer, stopping}, return_when=asyncio.FIRST_COMPLETED)
+                    for task in (consumer, stopping):
+                        task.cancel()
+                    if consumer.done() and not consumer.cancelled() and consumer.exception():
+                        raise consumer.exception()
+                except ConnectionError as e:
+                    print(f"Quote stream: connection lost: {e}", file=sys.stderr)
+                finally:
+                    if keeper:
+                        keeper.cancel()
+                    self._writer.close()
+                    self._writer = None
+            
+            if self.reconnect_delay is None:
+                break
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.reconnect_delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    def start(self):
+        """Run the stream on its own event loop in a background thread"""
+        self._thread = threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def stop(self, timeout=None):
+        if self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+    
+    def latency_summary(self):
+        """Mean, median, 99th percentile and max tick-to-recommendation latency in seconds"""
+        if not self.latencies:
+            return None
+        latencies = np.fromiter(self.latencies, dtype=np.float64)
+        return {
+            'count': len(latencies),
+            'mean': float(latencies.mean()),
+            'p50': float(np.percentile(latencies, 50)),
+            'p99': float(np.percentile(latencies, 99)),
+            'max': float(latencies.max()),
+        }
+
+
+class QuoteServer:
+    """Stand-in quote server replaying recorded ticks to subscribed clients.
+    
+    `ticks` is a sequence of (time_ns, symbol, price) in time order. replay()
+    sends them `speed` times faster than they were recorded (as fast as
+    possible when speed is None), each to the clients subscribed to its
+    symbol, stamped with the send time. `subscribed` is set once a client has
+    subscribed to anything. Port 0 picks a free port; `port` holds it after
+    start().
+    """
+    
+    def __init__(self, ticks=(), host="127.0.0.1", port=DEFAULT_PORT, speed=None):
+        self.ticks = ticks
+        self.host = host
+        self.port = port
+        self.speed = speed
+        self.sent = 0
+        self.clients = {}  # writer -> set of subscribed symbols
+        self.subscribed = None
+        self._handlers = set()
+        self.server = None
+    
+    @classmethod
+    def from_recording(cls, directory, tz="America/New_York", **kwargs):
+        """Serve the closes of a recording directory (see providers.save_recording) as ticks"""
+        times, symbols, prices = [], [], []
+        for symbol, path in recording_files(directory).items():
+            closes = load_bars(path, tz)['Close'].dropna()
+            times.append(closes.index.as_unit("ns").asi8)
+            prices.append(closes.to_numpy(dtype=np.float64))
+            symbols.extend([symbol] * len(closes))
+        if not times:
+            return cls([], **kwargs)
+        times = np.concatenate(times)
+        prices = np.concatenate(prices)
+        order = np.argsort(times, kind="stable")
+        return cls([(int(times[i]), symbols[i], float(prices[i])) for i in order], **kwargs)
+    
+    async def start(self):
+        self.subscribed = asyncio.Event()
+        self.server = await asyncio.start_server(self._connected, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+    
+    async def _connected(self, reader, writer):
+        symbols = self.clients[writer] = set()
+        self._handlers.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, *args = line.decode().split()
+                if command == "SUBSCRIBE":
+                    symbols.update(args)
+                    self.subscribed.set()
+                elif command == "UNSUBSCRIBE":
+                    symbols.difference_update(args)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.clients.pop(writer, None)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+    
+    async def send(self, symbol, time_ns, price):
+        """Send one tick to its subscribers now"""
+        line = None
+        for writer, symbols in list(self.clients.items()):
+            if symbol not in symbols or writer.is_closing():
+                continue
+            if line is None:
+                line = format_tick(symbol, time_ns, price, time.time_ns()).encode()
+            writer.write(line)
+            self.sent += 1
+    
+    async def drain(self):
+        for writer in list(self.clients):
+            try:
+                await writer.drain()
+            except ConnectionError:
+                self.clients.pop(writer, None)
+    
+    async def replay(self):
+        """Send every tick, paced by speed; ticks sharing a time go out together"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first = None
+        previous = None
+        for time_ns, symbol, price in self.ticks:
+            if time_ns != previous:
+                await self.drain()
+                previous = time_ns
+                if self.speed:
+                    first = time_ns if first is None else first
+                    delay = started + (time_ns - first) / 1e9 / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+            await self.send(symbol, time_ns, price)
+        await self.drain()
+    
+    async def close(self):
+        for writer in list(self.clients):
+            writer.close()
+        self.clients.clear()
+        # Closed connections end their handlers at EOF
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+async def serve(server, wait=True):
+    await server.start()
+    print(f"Serving {len(server.ticks)} ticks on {server.host}:{server.port}", flush=True)
+    if wait:
+        await server.subscribed.wait()
+    await server.replay()
+    await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded bars as a local quote stream.")
+    parser.add_argument("directory", help="recording directory of SYMBOL.csv / SYMBOL.parquet files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (0 = any free port)")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 = no pacing)")
+    args = parser.parse_args(argv)
+    
+    server = QuoteServer.from_recording(args.directory, host=args.host, port=args.port, speed=args.speed or None)
+    try:
+        asyncio.run(serve(server))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Columnar snapshot of tracker state for vectorized evaluation"""
+from collections import namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+# Recommendation codes; NO_DATA keeps analyze_stock's "Hold" for stocks without prices
+HOLD, BUY, SELL, NO_DATA = 0, 1, 2, 3
+RECOMMENDATIONS = np.array(["HOLD", "BUY", "SELL", "Hold"])
+
+# Immutable copy of a StockState as held by a frozen snapshot; history is a read-only PriceHistory
+FrozenState = namedtuple('FrozenState', ['buy_threshold', 'sell_threshold', 'current_price', 'base_price',
+                                         'history', 'last_update', 'changed_at'])
+
+
+def freeze_state(state):
+    return FrozenState(state.buy_threshold, state.sell_threshold, state.current_price, state.base_price,
+                       state.history.frozen(), state.last_update, state.changed_at)
+
+
+def state_code(state):
+    """Recommendation code of a single state, by the same rule as a snapshot's vectorized pass"""
+    if state.current_price is None or state.base_price is None:
+        return NO_DATA
+    change_amount = state.current_price - state.base_price
+    if change_amount <= state.buy_threshold:
+        return BUY
+    if change_amount >= state.sell_threshold:
+        return SELL
+    return HOLD
+
+
+class TrackerSnapshot:
+    """Prices and thresholds of every tracked stock as NumPy arrays.
+    
+    Changes, recommendations and alerts for all symbols are computed in one
+    vectorized pass when the snapshot is built; per-symbol lookups then only
+    index into the arrays. `taken_at` records the tracker's change counter
+    when the snapshot was built.
+    """
+    
+    def __init__(self, tracked_stocks, taken_at=0):
+        self.taken_at = taken_at
+        self.symbols = list(tracked_stocks.keys())
+        self.states = [tracked_stocks[symbol] for symbol in self.symbols]
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+        
+        # One pass over the states; None (no price yet) becomes NaN
+        columns = np.array([(state.current_price, state.base_price, state.buy_threshold, state.sell_threshold)
+                            for state in self.states], dtype=np.float64).reshape(-1, 4)
+        self.current_price, self.base_price, self.buy_threshold, self.sell_threshold = columns.T
+        
+        self.has_data = ~(np.isnan(self.current_price) | np.isnan(self.base_price))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.change_amount = self.current_price - self.base_price  # Dollar change
+            self.change_pct = self.change_amount / self.base_price * 100  # Still useful for display
+            codes = np.where(self.change_amount <= self.buy_threshold, BUY,
+                             np.where(self.change_amount >= self.sell_threshold, SELL, HOLD))
+        self.codes = np.where(self.has_data, codes, NO_DATA)
+        self.alerting = (self.codes == BUY) | (self.codes == SELL)
+    
+    @classmethod
+    def frozen(cls, tracked_stocks, taken_at=0, previous=None):
+        """Snapshot over immutable copies of the states, with read-only arrays.
+        
+        States whose `changed_at` still matches their copy in `previous` (an
+        earlier frozen snapshot) reuse that copy, so only stocks that changed
+        since the last publish are copied.
+        """
+        reusable = previous.index if previous is not None else {}
+        states = {}
+        for symbol, state in tracked_stocks.items():
+            row = reusable.get(symbol)
+            if row is not None and previous.states[row].changed_at == state.changed_at:
+                states[symbol] = previous.states[row]
+            else:
+                states[symbol] = freeze_state(state)
+        
+        snapshot = cls(states, taken_at)
+        snapshot.symbols = tuple(snapshot.symbols)
+        snapshot.states = tuple(snapshot.states)
+        snapshot.index = MappingProxyType(snapshot.index)
+        for column in (snapshot.current_price, snapshot.base_price, snapshot.buy_threshold,
+                       snapshot.sell_threshold, snapshot.has_data, snapshot.change_amount,
+                       snapshot.change_pct, snapshot.codes, snapshot.alerting):
+            column.flags.writeable = False
+        return snapshot
+    
+    def __len__(self):
+        return len(self.symbols)
+    
+    def recommendation(self, row):
+        return str(RECOMMENDATIONS[self.codes[row]])
+    
+    def row_data(self, row):
+        """The get_stock_data() dict for one row, or None if it has no prices yet"""
+        if not self.has_data[row]:
+            return None
+        
+        state = self.states[row]
+        return {
+            'symbol': self.symbols[row],
+            'current_price': state.current_price,
+            'base_price': state.base_price,
+            'change_amount': float(self.change_amount[row]),  # Dollar amount change
+            'change_pct': float(self.change_pct[row]),  # Percentage change (for reference)
+            'recommendation': self.recommendation(row),
+            'buy_threshold': state.buy_threshold,
+            'sell_threshold': state.sell_threshold,
+            'history': state.history
+        }
+    
+    def all_rows(self):
+        """get_stock_data() dicts for every stock with prices, in tracking order"""
+        rows = np.flatnonzero(self.has_data)
+        # Convert whole columns at once rather than indexing NumPy scalars per row
+        change_amount = self.change_amount[rows].tolist()
+        change_pct = self.change_pct[rows].tolist()
+        recommendations = RECOMMENDATIONS[self.codes[rows]].tolist()
+        
+        result = []
+        for i, row in enumerate(rows.tolist()):
+            state = self.states[row]
+            result.append({
+                'symbol': self.symbols[row],
+                'current_price': state.current_price,
+                'base_price': state.base_price,
+                'change_amount': change_amount[i],
+                'change_pct': change_pct[i],
+                'recommendation': recommendations[i],
+                'buy_threshold': state.buy_threshold,
+                'sell_threshold': state.sell_threshold,
+                'history': state.history
+            })
+        return result
+    
+    def alert(self, row):
+        """The check_for_alerts() dict for one row, or None"""
+        if not self.alerting[row]:
+            return None
+        
+        symbol = self.symbols[row]
+        recommendation = self.recommendation(row)
+        price = self.states[row].current_price
+        change_amount = float(self.change_amount[row])
+        return {
+            'symbol': symbol,
+            'action': recommendation,
+            'price': price,
+            'change_amount': change_amount,
+            'change_pct': float(self.change_pct[row]),
+            'message': f"{symbol}: {recommendation} at ${price:.2f} (Change: ${change_amount:+.2f})"
+        }
+    
+    def all_alerts(self):
+        """check_for_alerts() dicts for every stock that triggered one"""
+        return [self.alert(row) for row in np.flatnonzero(self.alerting)]
+
@@ -1,22 +1,197 @@
+import argparse
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from tkinter import ttk, messagebox, filedialog
+import numpy as np
 from datetime import datetime
+import queue
 import threading
+import time
 
+from alert_engine import AlertEngine
+from downsample import downsample
+from poll_scheduler import PollScheduler
 from stock_tracker import StockTracker
+from tick_store import TickStore
+from update_coordinator import UpdateCoordinator
+from validation_cache import ValidationCache
+from watchlist_io import read_watchlist, tracker_entries, write_watchlist
+
+
+class TreeviewRows:
+    """Keeps a Treeview in sync with a list of (key, values) rows.
+    
+    Each refresh writes only the cells whose text changed and inserts or
+    deletes only added or removed rows, so scroll position and selection
+    survive. Above `virtualize_above` rows the tree switches to a virtual
+    mode: it holds just enough slot rows to fill its height, and `offset`
+    picks the part of the list they show.
+    """
+    
+    def __init__(self, tree, virtualize_above=1000, scroll_callback=None):
+        self.tree = tree
+        self.virtualize_above = virtualize_above
+        self.scroll_callback = scroll_callback  # Called with (first, last) fractions in virtual mode
+        self.rows = []
+        self.virtual = False
+        self.offset = 0
+        self.items = {}  # key -> item id (normal mode)
+        self.keys = {}  # item id -> key
+        self.shown = {}  # item id -> values currently in the tree
+        self.slots = []  # slot item ids, top to bottom (virtual mode)
+        self.cells_written = 0  # Cell updates in the last refresh
+    
+    def update(self, rows):
+        self.rows = rows
+        self.cells_written = 0
+        virtual = len(rows) > self.virtualize_above
+        if virtual != self.virtual:
+            self.reset()
+            self.virtual = virtual
+        
+        if self.virtual:
+            self.render_window()
+        else:
+            self.sync()
+    
+    def sync(self):
+        seen = set()
+        for key, values in self.rows:
+            seen.add(key)
+            item = self.items.get(key)
+            if item is None:
+                item = self.tree.insert("", tk.END, values=values)
+                self.items[key] = item
+                self.keys[item] = key
+                self.shown[item] = values
+                self.cells_written += len(values)
+            else:
+                self.write(item, values)
+        
+        for key in [key for key in self.items if key not in seen]:
+            item = self.items.pop(key)
+            del self.keys[item]
+            del self.shown[item]
+            self.tree.delete(item)
+    
+    def render_window(self):
+        visible = self.visible_count()
+        self.offset = max(0, min(self.offset, len(self.rows) - visible))
+        window = self.rows[self.offset:self.offset + visible]
+        selected = [self.keys.get(item) for item in self.tree.selection()]
+        
+        while len(self.slots) < len(window):
+            item = self.tree.insert("", tk.END, values=())
+            self.slots.append(item)
+            self.shown[item] = ()
+        while len(self.slots) > len(window):
+            item = self.slots.pop()
+            self.keys.pop(item, None)
+            del self.shown[item]
+            self.tree.delete(item)
+        
+        for item, (key, values) in zip(self.slots, window):
+            self.keys[item] = key
+            self.write(item, values)
+        
+        # Keep the selection on the same key (not the same slot) while scrolling
+        keep = [item for item in self.slots if self.keys[item] in selected]
+        if tuple(keep) != tuple(self.tree.selection()):
+            self.tree.selection_set(keep)
+        
+        if self.scroll_callback and self.rows:
+            total = len(self.rows)
+            self.scroll_callback(self.offset / total, (self.offset + len(window)) / total)
+    
+    def write(self, item, values):
+        shown = self.shown[item]
+        if len(shown) != len(values):
+            self.tree.item(item, values=values)
+            self.cells_written += len(values)
+        else:
+            for column, (new, old) in enumerate(zip(values, shown)):
+                if new != old:
+                    self.tree.set(item, column, new)
+                    self.cells_written += 1
+        self.shown[item] = values
+    
+    def visible_count(self):
+        return int(self.tree.cget("height"))
+    
+    def key_for(self, item):
+        return self.keys.get(item)
+    
+    def scroll_to(self, fraction):
+        self.offset = int(float(fraction) * len(self.rows))
+        self.render_window()
+    
+    def scroll_by(self, rows):
+        self.offset += rows
+        self.render_window()
+    
+    def reset(self):
+        """Remove every row from the tree"""
+        for item in list(self.shown):
+            self.tree.delete(item)
+        self.items.clear()
+        self.keys.clear()
+        self.shown.clear()
+        self.slots = []
+        self.offset = 0
+
 
 class StockTrackingGUI:
-    def __init__(self, root):
+    def __init__(self, root, metrics=None):
         self.root = root
         self.root.title("Stock Tracking Agent - Dollar Thresholds")
         self.root.geometry("1200x800")
         
-        # Initialize the stock tracker
-        self.tracker = StockTracker()
-        
+        # Initialize the stock tracker; known symbols are validated from the on-disk cache
+        # and the watchlist, base prices and history persist in the tick store
+        self.tracker = StockTracker(validation_cache=ValidationCache(), store=TickStore(), metrics=metrics)
+        self.metrics = metrics  # Optional metrics.TrackerMetrics shown in the stats panel
+        self.import_cancel = None  # threading.Event of the running add/import, if any
+        self.stats_visible = False
+        
+        # Refresh cost: optional callback(seconds, rows) after each stock list refresh
+        self.refresh_timing_hook = None
+        self.last_refresh_time = None
+        
+        # Update cycles run one at a time on a worker thread; the GUI only reads the
+        # immutable snapshot it publishes after each cycle. The scheduler polls each symbol
+        # as often as its distance from a threshold needs, and not at all while the market
+        # is closed; "Update Now" still refreshes everything
+        # Alerts come from the engine's queue and are shown without blocking the main loop
+        self.alert_engine = AlertEngine()
+        self.alert_toast = None
+        self.alert_toast_timer = None
+        self.coordinator = UpdateCoordinator(
+            self.tracker, interval=1.0, scheduler=PollScheduler(self.tracker), alert_engine=self.alert_engine,
+            on_cycle=lambda snapshot: self.root.after(0, self.update_gui),
+            progress_callback=lambda current, total: self.status_var.set(
+                f"Updating... {current}/{total} stocks"))
+        
+        # The window shows right away; the saved watchlist loads in the background and
+        # update cycles start once it is in
         self.setup_gui()
+        self.status_var.set("Loading watchlist...")
+        threading.Thread(target=self.load_watchlist, daemon=True).start()
+        self.poll_alerts()
+    
+    def load_watchlist(self):
+        """Restore the saved watchlist off the main thread"""
+        try:
+            restored = self.tracker.restore()
+        except Exception as e:
+            print(f"Error loading watchlist: {e}")
+            restored = []
+        self.root.after(0, self.on_watchlist_loaded, restored)
+    
+    def on_watchlist_loaded(self, restored):
+        if restored:
+            self.coordinator.publish()
+            self.update_stock_list()
+        else:
+            self.status_var.set("Ready - Add stocks to begin tracking")
         self.start_periodic_updates()
     
     def setup_gui(self):
@@ -71,10 +246,21 @@ class StockTrackingGUI:
         
         self.stock_tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # Scrollbar for treeview
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.stock_tree.yview)
-        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
-        self.stock_tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar for treeview; in virtual mode it scrolls the row window instead of the tree
+        self.tree_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.on_tree_scroll)
+        self.tree_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.stock_tree.configure(yscrollcommand=self.on_tree_yview)
+        self.stock_rows = TreeviewRows(self.stock_tree, scroll_callback=self.tree_scrollbar.set)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.stock_tree.bind(sequence, self.on_tree_wheel)
+        
+        # Alerts section: newest first, never modal
+        alerts_frame = ttk.LabelFrame(main_frame, text="Alerts", padding="10")
+        alerts_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(10, 0), pady=(0, 10))
+        alerts_frame.columnconfigure(0, weight=1)
+        alerts_frame.rowconfigure(0, weight=1)
+        self.alert_list = tk.Listbox(alerts_frame, height=8)
+        self.alert_list.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # Chart section
         chart_frame = ttk.LabelFrame(main_frame, text="Price Chart - Select a stock to view", padding="10")
@@ -82,10 +268,13 @@ class StockTrackingGUI:
         chart_frame.columnconfigure(0, weight=1)
         chart_frame.rowconfigure(0, weight=1)
         
-        # Create matplotlib figure
-        self.fig, self.ax = plt.subplots(figsize=(10, 4))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=chart_frame)
-        self.canvas.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        # matplotlib is only imported when the first chart is drawn (see create_chart)
+        self.chart_frame = chart_frame
+        self.chart_placeholder = ttk.Label(chart_frame, text='Select a stock to view chart', anchor=tk.CENTER)
+        self.chart_placeholder.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.fig = self.ax = self.canvas = None
+        self.chart_symbol = None
+        self.chart_background = None
         
         # Bind treeview selection to chart update
         self.stock_tree.bind('<<TreeviewSelect>>', self.on_stock_select)
@@ -96,12 +285,26 @@ class StockTrackingGUI:
         
         ttk.Button(controls_frame, text="Update Now", command=self.update_all_stocks).pack(side=tk.LEFT, padx=(0, 10))
         ttk.Button(controls_frame, text="Clear All", command=self.clear_all).pack(side=tk.LEFT)
+        ttk.Button(controls_frame, text="Import...", command=self.import_watchlist).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Button(controls_frame, text="Export...", command=self.export_watchlist).pack(side=tk.LEFT, padx=(10, 0))
+        if self.metrics is not None:
+            ttk.Button(controls_frame, text="Stats", command=self.toggle_stats).pack(side=tk.LEFT, padx=(10, 0))
+        
+        # Progress of adds and imports, shown only while one runs
+        self.cancel_import_button = ttk.Button(controls_frame, text="Cancel", command=self.cancel_import)
+        self.import_progress = ttk.Progressbar(controls_frame, length=200, mode='determinate')
         
         # Status bar
         self.status_var = tk.StringVar(value="Ready - Add stocks to begin tracking")
         status_bar = ttk.Label(main_frame, textvariable=self.status_var, relief=tk.SUNKEN)
         status_bar.grid(row=4, column=0, columnspan=2, sticky=(tk.W, tk.E))
         
+        # Stats panel, only with metrics enabled and hidden until toggled
+        self.stats_frame = ttk.LabelFrame(main_frame, text="Statistics", padding="10")
+        self.stats_var = tk.StringVar()
+        ttk.Label(self.stats_frame, textvariable=self.stats_var, font="TkFixedFont",
+                  justify=tk.LEFT).grid(row=0, column=0, sticky=tk.W)
+        
         # Configure grid weights for resizing
         main_frame.rowconfigure(1, weight=0)
         main_frame.rowconfigure(2, weight=1)
@@ -137,23 +340,112 @@ class StockTrackingGUI:
                 return
         
         self.status_var.set(f"Adding {symbol}...")
+        self.start_import([(symbol, buy_threshold, sell_threshold)])
+    
+    def import_watchlist(self):
+        path = filedialog.askopenfilename(title="Import Watchlist",
+                                          filetypes=[("Watchlists", "*.csv *.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            # Rows without thresholds take the ones in the input row
+            default_buy = float(self.buy_threshold_entry.get())
+            default_sell = float(self.sell_threshold_entry.get())
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid numeric thresholds")
+            return
+        try:
+            entries, errors = read_watchlist(path, default_buy=default_buy, default_sell=default_sell)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Cannot read {path}: {e}")
+            return
+        if not entries:
+            messagebox.showerror("Error", f"No stocks found in {path}")
+            return
+        self.status_var.set(f"Importing {len(entries)} stocks...")
+        self.start_import(entries, errors)
+    
+    def export_watchlist(self):
+        entries = tracker_entries(self.tracker)
+        if not entries:
+            messagebox.showwarning("Warning", "No stocks to export")
+            return
+        path = filedialog.asksaveasfilename(title="Export Watchlist", defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            count = write_watchlist(path, entries)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Cannot write {path}: {e}")
+            return
+        self.status_var.set(f"Exported {count} stocks to {path}")
+    
+    def start_import(self, entries, errors=None):
+        """Validate and fetch new stocks on a worker thread; the window stays responsive"""
+        if self.import_cancel is not None:
+            messagebox.showinfo("Busy", "Stocks are still being added; wait or cancel first")
+            return
+        self.import_cancel = threading.Event()
+        self.import_progress.configure(value=0, maximum=max(len(entries), 1))
+        self.import_progress.pack(side=tk.RIGHT)
+        self.cancel_import_button.pack(side=tk.RIGHT, padx=(0, 10))
+        threading.Thread(target=self.run_import, args=(entries, dict(errors or {}), self.import_cancel),
+                         daemon=True).start()
+    
+    def run_import(self, entries, errors, cancel):
+        def progress(stage, done, total):
+            self.root.after(0, self.show_import_progress, stage, done, total)
         
         try:
-            # Add stock to tracker
-            self.tracker.add_stock(symbol, buy_threshold, sell_threshold)
-            
-            # Update the stock data
-            if self.tracker.update_stock_data(symbol):
+            added, failed = self.tracker.import_stocks(entries, progress, cancel)
+        except Exception as e:
+            added, failed = [], {"Import": str(e)}
+        errors.update(failed)
+        self.root.after(0, self.on_import_done, entries, added, errors, cancel.is_set())
+    
+    def show_import_progress(self, stage, done, total):
+        self.import_progress.configure(value=done, maximum=max(total, 1))
+        verb = "Validating" if stage == "validate" else "Fetching"
+        self.status_var.set(f"{verb}... {done}/{total} stocks")
+    
+    def cancel_import(self):
+        if self.import_cancel is not None:
+            self.import_cancel.set()
+            self.status_var.set("Cancelling...")
+    
+    def on_import_done(self, entries, added, errors, cancelled):
+        self.import_cancel = None
+        self.import_progress.pack_forget()
+        self.cancel_import_button.pack_forget()
+        if added:
+            self.coordinator.publish()
+            self.update_stock_list()
+        
+        if len(entries) == 1:
+            # A single add from the input row reports like it always has
+            symbol = entries[0][0].strip().upper()
+            if added:
                 self.status_var.set(f"Added {symbol} successfully")
                 self.stock_entry.delete(0, tk.END)
-                self.update_stock_list()
+            elif cancelled:
+                self.status_var.set(f"Cancelled adding {symbol}")
             else:
-                self.tracker.remove_stock(symbol)
+                message = errors.get(symbol) or next(iter(errors.values()), f"Failed to add {symbol}")
                 self.status_var.set(f"Failed to add {symbol}")
-                
-        except ValueError as e:
-            messagebox.showerror("Error", str(e))
-            self.status_var.set("Error adding stock")
+                messagebox.showerror("Error", message)
+            return
+        
+        status = f"Imported {len(added)} of {len(entries)} stocks"
+        if cancelled:
+            status += " (cancelled)"
+        self.status_var.set(status + (f", {len(errors)} failed" if errors else ""))
+        failures = {key: message for key, message in errors.items() if message != "Cancelled"}
+        if failures:
+            lines = [f"{key}: {message}" for key, message in list(failures.items())[:15]]
+            if len(failures) > 15:
+                lines.append(f"...and {len(failures) - 15} more")
+            messagebox.showwarning("Import", f"{len(failures)} stocks were not added:\n\n" + "\n".join(lines))
     
     def remove_stock(self):
         selected = self.stock_tree.selection()
@@ -161,21 +453,22 @@ class StockTrackingGUI:
             messagebox.showwarning("Warning", "Please select a stock to remove")
             return
         
-        for item in selected:
-            symbol = self.stock_tree.item(item)['values'][0]
-            if self.tracker.remove_stock(symbol):
-                self.stock_tree.delete(item)
+        for symbol in [self.stock_rows.key_for(item) for item in selected]:
+            self.tracker.remove_stock(symbol)
+            self.alert_engine.remove_symbol(symbol)
         
+        self.coordinator.publish()
+        self.update_stock_list()
         self.update_chart()
         self.status_var.set("Stock removed successfully")
     
     def update_stock_list(self):
-        # Clear current items
-        for item in self.stock_tree.get_children():
-            self.stock_tree.delete(item)
+        started = time.perf_counter()
         
-        # Add updated data
-        stocks_data = self.tracker.get_all_stocks_data()
+        # Both come from the last published snapshot, computed in one vectorized pass
+        snapshot = self.coordinator.snapshot
+        stocks_data = snapshot.all_rows()
+        rows = []
         for stock_data in stocks_data:
             symbol = stock_data['symbol']
             current_price = stock_data['current_price']
@@ -185,12 +478,7 @@ class StockTrackingGUI:
             buy_threshold = stock_data['buy_threshold']
             sell_threshold = stock_data['sell_threshold']
             
-            # Check for alerts
-            alert = self.tracker.check_for_alerts(symbol)
-            if alert and abs(alert['change_amount']) > 3:  # Alert for moves > $3
-                self.show_alert(alert)
-            
-            item_id = self.stock_tree.insert("", tk.END, values=(
+            rows.append((symbol, (
                 symbol,
                 f"${current_price:.2f}",
                 f"${change_amount:+.2f}",  # Dollar amount change
@@ -198,71 +486,230 @@ class StockTrackingGUI:
                 recommendation,
                 f"${buy_threshold:.2f}",   # Dollar threshold
                 f"${sell_threshold:.2f}"   # Dollar threshold
-            ))
-        
-        self.status_var.set(f"Last updated: {datetime.now().strftime('%H:%M:%S')}")
+            )))
+        
+        # Only changed cells and added/removed rows touch the tree
+        self.stock_rows.update(rows)
+        
+        elapsed = time.perf_counter() - started
+        self.last_refresh_time = elapsed
+        if self.metrics is not None:
+            self.metrics.refresh_seconds.observe(elapsed)
+        if self.refresh_timing_hook:
+            self.refresh_timing_hook(elapsed, len(rows))
+        status = (f"Last updated: {datetime.now().strftime('%H:%M:%S')} "
+                  f"(refresh {elapsed * 1000:.1f} ms, {self.stock_rows.cells_written} cells)")
+        if self.coordinator.overruns:
+            status += f" - {self.coordinator.overruns} slow cycles, {self.coordinator.skipped} skipped"
+        self.status_var.set(status)
+    
+    def on_tree_scroll(self, *args):
+        """Scrollbar command: scroll the row window in virtual mode, the tree otherwise"""
+        if not self.stock_rows.virtual:
+            self.stock_tree.yview(*args)
+        elif args[0] == "moveto":
+            self.stock_rows.scroll_to(args[1])
+        elif args[0] == "scroll":
+            step = self.stock_rows.visible_count() if args[2] == "pages" else 1
+            self.stock_rows.scroll_by(int(args[1]) * step)
+    
+    def on_tree_yview(self, first, last):
+        # In virtual mode the row window drives the scrollbar, not the tree's own view
+        if not self.stock_rows.virtual:
+            self.tree_scrollbar.set(first, last)
+    
+    def on_tree_wheel(self, event):
+        if not self.stock_rows.virtual:
+            return None
+        if event.num == 4 or event.delta > 0:
+            self.stock_rows.scroll_by(-3)
+        else:
+            self.stock_rows.scroll_by(3)
+        return "break"
+    
+    def poll_alerts(self):
+        """Deliver queued alerts on the main loop, then check again shortly"""
+        while True:
+            try:
+                alert = self.alert_engine.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.show_alert(alert)
+        self.root.after(250, self.poll_alerts)
     
     def show_alert(self, alert):
-        """Show alert popup and log to console"""
-        messagebox.showwarning("Trading Alert", alert['message'])
+        """List the alert, flash it in a toast and log to console"""
+        stamp = datetime.fromtimestamp(alert['time']).strftime('%H:%M:%S')
+        self.alert_list.insert(0, f"{stamp}  {alert['message']}")
+        self.alert_list.delete(200, tk.END)
+        self.show_toast(alert['message'])
         print(f"ALERT: {alert['message']}")
     
+    def show_toast(self, message, duration=5000):
+        """Small borderless window in the top-right corner that closes itself"""
+        if self.alert_toast is None or not self.alert_toast.winfo_exists():
+            self.alert_toast = tk.Toplevel(self.root)
+            self.alert_toast.overrideredirect(True)
+            self.alert_toast.attributes("-topmost", True)
+            self.alert_toast_label = ttk.Label(self.alert_toast, padding="10", relief=tk.RIDGE)
+            self.alert_toast_label.pack()
+        
+        self.alert_toast_label.configure(text=message)
+        self.alert_toast.update_idletasks()
+        x = self.root.winfo_rootx() + self.root.winfo_width() - self.alert_toast.winfo_width() - 20
+        self.alert_toast.geometry(f"+{x}+{self.root.winfo_rooty() + 20}")
+        
+        if self.alert_toast_timer:
+            self.root.after_cancel(self.alert_toast_timer)
+        self.alert_toast_timer = self.root.after(duration, self.alert_toast.destroy)
+    
     def on_stock_select(self, event):
         """Update chart when a stock is selected"""
         selected = self.stock_tree.selection()
         if selected:
-            symbol = self.stock_tree.item(selected[0])['values'][0]
+            symbol = self.stock_rows.key_for(selected[0])
             self.update_chart(symbol)
     
-    def update_chart(self, symbol=None):
-        self.ax.clear()
+    def create_chart(self):
+        """Build the matplotlib figure in place of the placeholder, on first use"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        
+        self.fig = Figure(figsize=(10, 4))
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.chart_frame)
+        self.chart_placeholder.destroy()
+        self.canvas.get_tk_widget().grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        # One persistent line is updated in place; it is animated so new ticks can be blitted
+        # over a cached background instead of redrawing axes, ticks and labels every cycle
+        self.price_line, = self.ax.plot([], [], marker='o', markersize=2, linewidth=2, animated=True)
+        self.chart_message = self.ax.text(0.5, 0.5, '', horizontalalignment='center',
+                                          verticalalignment='center', transform=self.ax.transAxes,
+                                          fontsize=14)
+        self.ax.set_xlabel('Time')
+        self.ax.set_ylabel('Price ($)')
+        self.ax.grid(True, alpha=0.3)
+        self.ax.xaxis_date()
+        self.ax.tick_params(axis='x', labelrotation=45)
+        self.fig.tight_layout()
+        self.canvas.mpl_connect('draw_event', self.on_chart_draw)
+        self.canvas.mpl_connect('resize_event', self.on_chart_resize)
+    
+    def update_chart(self, symbol=None):
+        started = time.perf_counter()
         if not symbol:
-            self.ax.text(0.5, 0.5, 'Select a stock to view chart', 
-                        horizontalalignment='center', verticalalignment='center',
-                        transform=self.ax.transAxes, fontsize=14)
-            self.canvas.draw()
+            self.show_chart_message('Select a stock to view chart')
             return
         
-        stock_data = self.tracker.get_stock_data(symbol)
+        snapshot = self.coordinator.snapshot
+        row = snapshot.index.get(symbol)
+        stock_data = None if row is None else snapshot.row_data(row)
         if not stock_data or len(stock_data['history']) <= 1:
-            self.ax.text(0.5, 0.5, 'Insufficient data for chart', 
-                        horizontalalignment='center', verticalalignment='center',
-                        transform=self.ax.transAxes, fontsize=14)
-            self.canvas.draw()
+            self.show_chart_message('Insufficient data for chart')
             return
         
-        # Plot the chart
-        times = [point['time'].to_pydatetime() for point in stock_data['history']]
-        prices = [point['price'] for point in stock_data['history']]
+        if self.canvas is None:
+            self.create_chart()
+        import matplotlib.dates as mdates
+        
+        # Plot straight from the history buffers, reduced to about one point per pixel
+        history = stock_data['history']
+        times = mdates.date2num(history.times().view('datetime64[ns]'))
+        width = max(int(self.ax.bbox.width), 3)
+        times, prices = downsample(times, history.prices(), width)
+        self.price_line.set_data(times, prices)
+        
+        if symbol == self.chart_symbol and self.chart_fits(times, prices):
+            self.blit_chart()
+            if self.metrics is not None:
+                self.metrics.chart_seconds.observe(time.perf_counter() - started, ("blit",))
+            return
         
-        self.ax.plot(times, prices, label=symbol, marker='o', markersize=2, linewidth=2)
-        self.ax.set_xlabel('Time')
-        self.ax.set_ylabel('Price ($)')
+        # New symbol or the data left the view: rescale with headroom and redraw everything once
+        self.chart_symbol = symbol
+        self.chart_message.set_visible(False)
+        self.price_line.set_label(symbol)
         self.ax.set_title(f'{symbol} Price Trend')
-        self.ax.legend()
-        self.ax.grid(True, alpha=0.3)
-        
-        # Rotate x-axis labels for better readability
-        plt.setp(self.ax.xaxis.get_majorticklabels(), rotation=45)
-        self.fig.tight_layout()
+        self.ax.legend(loc='upper left')
+        self.rescale_chart(times, prices)
         self.canvas.draw()
+        if self.metrics is not None:
+            self.metrics.chart_seconds.observe(time.perf_counter() - started, ("draw",))
+    
+    def show_chart_message(self, message):
+        self.chart_symbol = None
+        if self.canvas is None:
+            self.chart_placeholder.configure(text=message)
+            return
+        self.price_line.set_data([], [])
+        self.chart_message.set_text(message)
+        self.chart_message.set_visible(True)
+        self.ax.set_title('')
+        legend = self.ax.get_legend()
+        if legend:
+            legend.remove()
+        self.canvas.draw()
+    
+    def rescale_chart(self, times, prices):
+        """Fit the view to the data, leaving room to the right and above/below for new ticks"""
+        span = (times[-1] - times[0]) or 1 / 1440
+        low, high = np.min(prices), np.max(prices)
+        pad = (high - low) * 0.1 or max(abs(high) * 0.001, 0.01)
+        self.ax.set_xlim(times[0], times[-1] + span * 0.1)
+        self.ax.set_ylim(low - pad, high + pad)
+    
+    def chart_fits(self, times, prices):
+        left, right = self.ax.get_xlim()
+        bottom, top = self.ax.get_ylim()
+        return (left <= times[0] and times[-1] <= right and
+                bottom <= np.min(prices) and np.max(prices) <= top)
+    
+    def blit_chart(self):
+        if self.chart_background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.chart_background)
+        self.ax.draw_artist(self.price_line)
+        self.canvas.blit(self.fig.bbox)
+    
+    def on_chart_draw(self, event):
+        """Cache the static background after every full draw, then paint the animated line on top"""
+        self.chart_background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.price_line)
+    
+    def on_chart_resize(self, event):
+        """Layout is only recomputed when the widget changes size"""
+        self.fig.tight_layout()
+        self.chart_background = None
+        if self.chart_symbol:
+            # Re-sample for the new width on the next full draw
+            symbol, self.chart_symbol = self.chart_symbol, None
+            self.root.after_idle(self.update_chart, symbol)
+    
+    def toggle_stats(self):
+        self.stats_visible = not self.stats_visible
+        if self.stats_visible:
+            self.stats_frame.grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
+            self.refresh_stats()
+        else:
+            self.stats_frame.grid_remove()
+    
+    def refresh_stats(self):
+        """Redraw the stats panel every second while it is shown"""
+        if not self.stats_visible:
+            return
+        lines = self.metrics.summary()
+        lines.append(f"Coordinator: {self.coordinator.cycles} cycles, {self.coordinator.overruns} slow, "
+                     f"{self.coordinator.skipped} skipped")
+        self.stats_var.set("\n".join(lines))
+        self.root.after(1000, self.refresh_stats)
     
     def update_all_stocks(self):
-        def update_thread():
-            self.status_var.set("Updating stock data...")
-            
-            def progress_callback(current, total):
-                self.status_var.set(f"Updating... {current}/{total} stocks")
-            
-            # Update all stocks
-            self.tracker.update_all_stocks(progress_callback)
-            
-            # Update GUI in main thread
-            self.root.after(0, self.update_gui)
-        
         if self.tracker.tracked_stocks:
-            threading.Thread(target=update_thread, daemon=True).start()
+            # Coalesced with any cycle already queued; never runs alongside one
+            self.status_var.set("Updating stock data...")
+            self.coordinator.request_update()
         else:
             self.status_var.set("No stocks to update")
     
@@ -271,32 +718,46 @@ class StockTrackingGUI:
         # Update chart if a stock is selected
         selected = self.stock_tree.selection()
         if selected:
-            symbol = self.stock_tree.item(selected[0])['values'][0]
+            symbol = self.stock_rows.key_for(selected[0])
             self.update_chart(symbol)
     
     def start_periodic_updates(self):
-        def periodic_update():
-            self.update_all_stocks()
-            self.root.after(self.tracker.update_interval, periodic_update)
-        
-        self.root.after(self.tracker.update_interval, periodic_update)
+        self.coordinator.start()
     
     def clear_all(self):
         if self.tracker.tracked_stocks and messagebox.askyesno("Confirm", "Clear all tracked stocks?"):
             self.tracker.clear_all_stocks()
-            for item in self.stock_tree.get_children():
-                self.stock_tree.delete(item)
+            for symbol in list(self.alert_engine.symbols):
+                self.alert_engine.remove_symbol(symbol)
+            self.coordinator.publish()
+            self.stock_rows.reset()
             self.update_chart()
             self.status_var.set("All stocks cleared")
 
 def main():
+    parser = argparse.ArgumentParser(description="Stock Tracking Agent")
+    parser.add_argument("--metrics", action="store_true", help="collect metrics and show the Stats panel")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="also serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    args = parser.parse_args()
+    
+    metrics = metrics_server = None
+    if args.metrics or args.metrics_port is not None:
+        from metrics import MetricsServer, TrackerMetrics
+        metrics = TrackerMetrics()
+        if args.metrics_port is not None:
+            metrics_server = MetricsServer(metrics, port=args.metrics_port).start()
+    
     try:
         root = tk.Tk()
-        app = StockTrackingGUI(root)
+        app = StockTrackingGUI(root, metrics=metrics)
         root.mainloop()
     except Exception as e:
         print(f"Application error: {e}")
         messagebox.showerror("Error", f"Failed to start application: {e}")
+    finally:
+        if metrics_server:
+            metrics_server.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,13 +1,79 @@
-import yfinance as yf
-import pandas as pd
-from datetime import datetime
+from datetime import timedelta
+import itertools
 import threading
 import time
 
+from fetch_engine import FetchEngine
+from price_history import DEFAULT_HISTORY_DEPTH, PriceHistory, to_ns
+from providers import YFinanceProvider
+from snapshot import TrackerSnapshot
+
+# Ordering for state changes and snapshots: a snapshot is stale once any change
+# has been counted after it was taken
+_changes = itertools.count(1)
+_change_lock = threading.Lock()
+
+
+def _count_change():
+    """Count a state change and record it as StockState.last_change, which never goes backwards"""
+    with _change_lock:
+        change = next(_changes)
+        StockState.last_change = max(StockState.last_change, change)
+    return change
+
+
+class StockState:
+    """Tracking state for one symbol"""
+    
+    __slots__ = ('buy_threshold', 'sell_threshold', 'current_price', 'base_price', 'history', 'last_update',
+                 'changed_at')
+    
+    last_change = 0  # Change counter value at the latest write to any StockState
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, 'changed_at', _count_change())  # Latest write to this state
+    
+    def __init__(self, buy_threshold, sell_threshold, current_price=None, base_price=None,
+                 history_depth=DEFAULT_HISTORY_DEPTH, last_update=None):
+        self.buy_threshold = buy_threshold  # Negative dollar amount (e.g., -2.50)
+        self.sell_threshold = sell_threshold  # Positive dollar amount (e.g., 5.00)
+        self.current_price = current_price
+        self.base_price = base_price
+        self.history = PriceHistory(history_depth)
+        self.last_update = last_update
+
+
 class StockTracker:
-    def __init__(self):
+    def __init__(self, provider=None, fetch_mode="single", batch_size=None, fetch_engine=None,
+                 incremental=False, max_gap=timedelta(minutes=30), history_depth=DEFAULT_HISTORY_DEPTH,
+                 validation_cache=None, store=None, metrics=None):
         self.tracked_stocks = {}
+        self.history_depth = history_depth  # Price samples kept per symbol
+        self.provider = provider or YFinanceProvider()  # Source of symbol checks and price bars
+        self.validation_cache = validation_cache  # Optional ValidationCache of known symbols
+        self.store = store  # Optional TickStore persisting ticks, thresholds and base prices
+        self.metrics = metrics  # Optional metrics.TrackerMetrics; None disables instrumentation
         self.update_interval = 10000  # 10 seconds
+        self.fetch_mode = fetch_mode  # "single" (one request per symbol) or "batch" (bulk download)
+        self.batch_size = batch_size  # Symbols per bulk request in batch mode (None = whole watchlist)
+        # Worker pool and shared rate limiter used for all update requests
+        self.fetch_engine = fetch_engine or FetchEngine()
+        if metrics is not None and self.fetch_engine.metrics is None:
+            self.fetch_engine.metrics = metrics
+        # Incremental mode only requests bars after each symbol's last_update
+        self.incremental = incremental
+        self.max_gap = max_gap  # Older last_update values fall back to a full refresh
+        self.needs_full_refresh = set()  # Symbols whose last incremental fetch failed
+        self.now = self.provider.now
+        # Rows and bytes of price data received, for the running and the last completed cycle
+        self.transfer_stats = self._empty_transfer_stats()
+        self.last_cycle_stats = self._empty_transfer_stats()
+        self._stats_lock = threading.Lock()
+        self._snapshot = None
+        # Held while symbols are added or removed, while their state is written and while
+        # tracked_stocks is iterated
+        self.lock = threading.RLock()
     
     def add_stock(self, symbol, buy_threshold, sell_threshold):
         """Add a stock to tracking list"""
@@ -20,158 +86,482 @@ class StockTracker:
             raise ValueError(f"Invalid stock symbol: {symbol}")
         
         # Initialize stock data
-        self.tracked_stocks[symbol] = {
-            'buy_threshold': buy_threshold,  # Now in dollars
-            'sell_threshold': sell_threshold,  # Now in dollars
-            'current_price': None,
-            'base_price': None,
-            'history': [],
-            'last_update': None
-        }
+        with self.lock:
+            if symbol in self.tracked_stocks:
+                raise ValueError(f"{symbol} is already being tracked")
+            self._track(symbol, buy_threshold, sell_threshold)
+            _count_change()
+        self.flush_store()
         
         return symbol
     
+    def add_stocks(self, entries):
+        """Add several stocks, validating all new symbols in one bulk check.
+        
+        entries is an iterable of (symbol, buy_threshold, sell_threshold).
+        Returns (added symbols, {symbol: error message}).
+        """
+        pending, errors = self._new_entries(entries)
+        try:
+            valid = self.validate_symbols(pending)
+        except Exception as e:
+            errors.update({symbol: f"Could not validate {symbol}: {e}" for symbol in pending})
+            return [], errors
+        added = []
+        with self.lock:
+            for symbol, (buy_threshold, sell_threshold) in pending.items():
+                if not valid.get(symbol):
+                    errors[symbol] = f"Invalid stock symbol: {symbol}"
+                    continue
+                if symbol in self.tracked_stocks:
+                    errors[symbol] = f"{symbol} is already being tracked"
+                    continue
+                self._track(symbol, buy_threshold, sell_threshold)
+                added.append(symbol)
+            
+            _count_change()
+        self.flush_store()
+        return added, errors
+    
+    def import_stocks(self, entries, progress_callback=None, cancel=None, chunk_size=50):
+        """Add a whole watchlist, validating and fetching it in parallel bulk requests.
+        
+        entries is an iterable of (symbol, buy_threshold, sell_threshold). New
+        symbols are validated, and the valid ones get their first fetch, in
+        chunks of chunk_size symbols run through the fetch engine, so a few
+        hundred symbols take a handful of requests whatever the fetch mode.
+        progress_callback(stage, done, total) reports stage "validate", then
+        "fetch". Symbols whose first fetch returns no prices are removed again.
+        Once the `cancel` event is set, symbols not yet fetched are dropped.
+        Returns (added symbols, {symbol: error message}).
+        """
+        def stage(name):
+            if progress_callback is None:
+                return None
+            return lambda done, total: progress_callback(name, done, total)
+        
+        pending, errors = self._new_entries(entries)
+        symbols = list(pending)
+        chunks = [tuple(symbols[i:i + chunk_size]) for i in range(0, len(symbols), chunk_size)]
+        checked = self.fetch_engine.run(chunks, lambda chunk, timeout: self.validate_symbols(chunk, timeout),
+                                        stage("validate"), weight=len,
+                                        label=lambda chunk: f"validation of {len(chunk)} symbols", cancel=cancel)
+        
+        tracked = []
+        with self.lock:
+            for chunk in chunks:
+                valid = checked.get(chunk)
+                for symbol in chunk:
+                    if chunk not in checked:
+                        errors[symbol] = "Cancelled"
+                    elif valid is False:
+                        errors[symbol] = f"Could not validate {symbol}"  # Failed after every retry
+                    elif not valid or not valid.get(symbol):
+                        errors[symbol] = f"Invalid stock symbol: {symbol}"
+                    elif symbol in self.tracked_stocks:
+                        errors[symbol] = f"{symbol} is already being tracked"
+                    else:
+                        self._track(symbol, *pending[symbol])
+                        tracked.append(symbol)
+            _count_change()
+        
+        results = {}
+        if tracked and not (cancel is not None and cancel.is_set()):
+            results = self.update_stocks_batched(tracked, stage("fetch"), batch_size=chunk_size, cancel=cancel)
+        added = []
+        for symbol in tracked:
+            if results.get(symbol):
+                added.append(symbol)
+                continue
+            errors[symbol] = "Cancelled" if symbol not in results else f"No price data for {symbol}"
+            self.remove_stock(symbol)
+        self.flush_store()
+        return added, errors
+    
+    def _new_entries(self, entries):
+        """({symbol: (buy_threshold, sell_threshold)}, {symbol: error}) for symbols not yet tracked"""
+        pending = {}
+        errors = {}
+        for symbol, buy_threshold, sell_threshold in entries:
+            symbol = symbol.strip().upper()
+            if symbol in self.tracked_stocks or symbol in pending:
+                errors[symbol] = f"{symbol} is already being tracked"
+            else:
+                pending[symbol] = (buy_threshold, sell_threshold)
+        return pending, errors
+    
+    def _track(self, symbol, buy_threshold, sell_threshold):
+        self.tracked_stocks[symbol] = StockState(buy_threshold, sell_threshold,
+                                                 history_depth=self.history_depth)
+        if self.store is not None:
+            self.store.set_stock(symbol, buy_threshold=buy_threshold, sell_threshold=sell_threshold,
+                                 base_price=None)
+    
+    def restore(self):
+        """Load the watchlist and recent history from the store without fetching anything.
+        
+        Returns the restored symbols. Stocks already being tracked are left as they are.
+        """
+        if self.store is None:
+            return []
+        
+        import pandas as pd
+        
+        restored = []
+        for symbol, settings in self.store.stocks().items():
+            if symbol in self.tracked_stocks:
+                continue
+            
+            state = StockState(settings['buy_threshold'], settings['sell_threshold'],
+                               base_price=settings.get('base_price'), history_depth=self.history_depth)
+            ticks = self.store.tail(symbol, self.history_depth)
+            state.history.extend(ticks['time'], ticks['price'])
+            if len(ticks):
+                state.current_price = state.history.last_price()
+                state.last_update = pd.Timestamp(state.history.last_time(), tz="UTC")
+            
+            with self.lock:
+                self.tracked_stocks.setdefault(symbol, state)
+            restored.append(symbol)
+        
+        _count_change()
+        return restored
+    
     def validate_stock_symbol(self, symbol):
         """Check if stock symbol is valid by trying to fetch data"""
-        try:
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            return info is not None and len(info) > 0
-        except:
-            return False
+        return self.validate_symbols([symbol]).get(symbol, False)
+    
+    def validate_symbols(self, symbols, timeout=10):
+        """Check many symbols at once, asking the provider only about ones not in the cache.
+        
+        Provider errors propagate, so that a failed lookup is retried rather
+        than reported as an invalid symbol, and is never cached.
+        """
+        symbols = list(symbols)
+        results = {}
+        unknown = []
+        for symbol in symbols:
+            cached = self.validation_cache.get(symbol) if self.validation_cache is not None else None
+            if cached is None:
+                unknown.append(symbol)
+            else:
+                results[symbol] = cached
+        
+        if not unknown:
+            return results
+        
+        checked = self.provider.validate_symbols(unknown, timeout=timeout)
+        results.update(checked)
+        if self.validation_cache is not None:
+            self.validation_cache.put_many(checked)
+            try:
+                self.validation_cache.save()
+            except OSError as e:
+                print(f"Error saving validation cache: {e}")
+        return results
     
     def remove_stock(self, symbol):
         """Remove a stock from tracking"""
-        if symbol in self.tracked_stocks:
+        with self.lock:
+            if symbol not in self.tracked_stocks:
+                return False
             del self.tracked_stocks[symbol]
-            return True
-        return False
+            _count_change()
+        
+        if self.store is not None:
+            self.store.remove_stock(symbol)
+            self.flush_store()
+        return True
     
     def update_stock_data(self, symbol):
         """Fetch and update stock data"""
         try:
-            stock = yf.Ticker(symbol)
-            # Get data for the current day with 1-minute intervals
-            hist = stock.history(period="1d", interval="1m")
-            
-            if hist.empty:
+            return self.fetch_stock_data(symbol)
+        
+        except Exception as e:
+            print(f"Error updating {symbol}: {e}")
+            return False
+        
+        finally:
+            self.flush_store()
+    
+    def fetch_stock_data(self, symbol, timeout=10):
+        """Fetch and update stock data, letting request errors propagate"""
+        start = self.incremental_start(symbol)
+        metrics = self.metrics
+        started = time.perf_counter() if metrics is not None else None
+        try:
+            hist = self.provider.history(symbol, start=start, timeout=timeout)
+        except Exception:
+            self.needs_full_refresh.add(symbol)
+            if metrics is not None:
+                metrics.fetch_errors.inc(labels=metrics.symbol_labels(symbol))
+            raise
+        
+        if metrics is not None:
+            metrics.fetch_seconds.observe(time.perf_counter() - started, metrics.symbol_labels(symbol))
+        self.record_transfer([hist], incremental=start is not None)
+        if start is not None:
+            return self.merge_history(symbol, hist)
+        return self.apply_history(symbol, hist)
+    
+    def incremental_start(self, symbol):
+        """Return the time to fetch new bars from, or None if a full refresh is needed"""
+        if not self.incremental or symbol in self.needs_full_refresh:
+            return None
+        
+        data = self.tracked_stocks.get(symbol)
+        if data is None or data.last_update is None:
+            return None
+        
+        # After a long gap (e.g. overnight) the full day is cheaper than the backlog
+        if self.now() - data.last_update > self.max_gap:
+            return None
+        
+        # Start at the last bar itself, since it may still have been forming
+        return data.last_update
+    
+    def apply_history(self, symbol, hist):
+        """Update a tracked stock from the latest bar of a price history frame"""
+        if hist is None or hist.empty:
+            return False
+        return self.apply_tick(symbol, hist.index[-1], hist['Close'].iloc[-1])
+    
+    def apply_tick(self, symbol, current_time, current_price):
+        """Update a tracked stock with one price; current_time is a Timestamp or ns since the epoch"""
+        import pandas as pd
+        if not isinstance(current_time, pd.Timestamp):
+            current_time = pd.Timestamp(to_ns(current_time), tz="UTC")
+        
+        # Writes hold the lock so that a frozen snapshot never sees a half-updated stock
+        with self.lock:
+            # The symbol may have been removed while the request was in flight
+            data = self.tracked_stocks.get(symbol)
+            if data is None:
                 return False
             
-            current_price = hist['Close'].iloc[-1]
-            current_time = hist.index[-1]
-            
             # Initialize base price if this is the first update
-            if (self.tracked_stocks[symbol]['base_price'] is None or 
-                self.tracked_stocks[symbol]['last_update'] is None):
-                self.tracked_stocks[symbol]['base_price'] = current_price
+            if data.base_price is None or data.last_update is None:
+                data.base_price = current_price
+                if self.store is not None:
+                    self.store.set_stock(symbol, base_price=float(current_price))
             
-            # Store historical data
-            self.tracked_stocks[symbol]['current_price'] = current_price
-            self.tracked_stocks[symbol]['last_update'] = current_time
+            # Add to history (the ring buffer keeps the newest history_depth points). Appending
+            # doesn't mark the state changed, so it goes before the scalar writes that do
+            data.history.append(current_time, current_price)
+            if self.store is not None:
+                self.store.append(symbol, data.history.last_time(), current_price)
             
-            # Add to history (keep limited size)
-            self.tracked_stocks[symbol]['history'].append({
-                'time': current_time,
-                'price': current_price
-            })
+            data.current_price = current_price
+            data.last_update = current_time
+        
+        self.needs_full_refresh.discard(symbol)
+        return True
+    
+    def merge_history(self, symbol, hist):
+        """Merge bars fetched since last_update into a tracked stock's history"""
+        if hist is None or hist.empty:
+            return symbol in self.tracked_stocks  # No new bars since the last update
+        
+        closes = hist['Close'].dropna()
+        with self.lock:
+            data = self.tracked_stocks.get(symbol)
+            if data is None:
+                return False
             
-            # Keep only last 50 data points
-            if len(self.tracked_stocks[symbol]['history']) > 50:
-                self.tracked_stocks[symbol]['history'] = self.tracked_stocks[symbol]['history'][-50:]
+            closes = closes[closes.index >= data.last_update]
+            history = data.history
+            for current_time, current_price in closes.items():
+                time_ns = to_ns(current_time)
+                if history.last_time() == time_ns:
+                    # The latest minute bar was still forming last time; update it in place
+                    history.set_last_price(current_price)
+                else:
+                    history.append(time_ns, current_price)
+                if self.store is not None:
+                    # The store is append-only; a revised bar is a later tick with the same time
+                    self.store.append(symbol, time_ns, current_price)
             
-            return True
+            if not closes.empty:
+                data.current_price = closes.iloc[-1]
+                data.last_update = closes.index[-1]
+        
+        return True
+    
+    @staticmethod
+    def _empty_transfer_stats():
+        return {'rows': 0, 'bytes': 0, 'full_requests': 0, 'incremental_requests': 0}
+    
+    def record_transfer(self, frames, incremental=False):
+        """Count the rows and bytes of one request's price frames in the cycle statistics"""
+        frames = [frame for frame in frames if frame is not None]
+        rows = sum(len(frame) for frame in frames)
+        size = sum(int(frame.memory_usage(index=True, deep=True).sum()) for frame in frames)
+        with self._stats_lock:
+            self.transfer_stats['rows'] += rows
+            self.transfer_stats['bytes'] += size
+            self.transfer_stats['incremental_requests' if incremental else 'full_requests'] += 1
+        if self.metrics is not None:
+            self.metrics.rows_fetched.inc(rows)
+            self.metrics.bytes_fetched.inc(size)
+            self.metrics.requests.inc(labels=("incremental" if incremental else "full",))
+    
+    def fetch_batch(self, symbols, timeout=10, start=None):
+        """Fetch 1-minute bars for several symbols in one request.
+        
+        Without a start time the current day is fetched, otherwise only bars from start onwards.
+        """
+        metrics = self.metrics
+        started = time.perf_counter() if metrics is not None else None
+        try:
+            frames = self.provider.download(symbols, start=start, timeout=timeout)
+        except Exception:
+            if metrics is not None:
+                for symbol in symbols:
+                    metrics.fetch_errors.inc(labels=metrics.symbol_labels(symbol))
+            raise
+        
+        if metrics is not None:
+            metrics.batch_fetch_seconds.observe(time.perf_counter() - started)
+        self.record_transfer(frames.values(), incremental=start is not None)
+        return frames
+    
+    def update_stocks_batched(self, symbols, progress_callback=None, batch_size=None, cancel=None):
+        """Update stocks using bulk downloads of batch_size symbols per request"""
+        batch_size = batch_size or self.batch_size or len(symbols) or 1
+        chunks = [tuple(symbols[i:i + batch_size]) for i in range(0, len(symbols), batch_size)]
+        
+        def fetch_chunk(chunk, timeout):
+            # A chunk is fetched incrementally only if every symbol in it can be
+            starts = [self.incremental_start(symbol) for symbol in chunk]
+            start = None if None in starts else min(starts)
+            try:
+                frames = self.fetch_batch(chunk, timeout, start)
+            except Exception:
+                self.needs_full_refresh.update(chunk)
+                raise
             
-        except Exception as e:
-            print(f"Error updating {symbol}: {e}")
-            return False
+            apply = self.apply_history if start is None else self.merge_history
+            return {symbol: apply(symbol, frames.get(symbol)) for symbol in chunk}
+        
+        chunk_results = self.fetch_engine.run(chunks, fetch_chunk, progress_callback, weight=len,
+                                              label=lambda chunk: f"{chunk[0]}..{chunk[-1]} ({len(chunk)} symbols)",
+                                              cancel=cancel)
+        
+        results = {}
+        for chunk in chunks:
+            if chunk not in chunk_results:
+                continue  # Cancelled before it was requested
+            outcome = chunk_results[chunk]
+            for symbol in chunk:
+                results[symbol] = bool(outcome and outcome[symbol])
+        return results
+    
+    def snapshot(self):
+        """Columnar snapshot of all tracked stocks, rebuilt only after a state change"""
+        snapshot = self._snapshot
+        if (snapshot is None or snapshot.taken_at <= StockState.last_change or
+                len(snapshot) != len(self.tracked_stocks)):
+            with self.lock:
+                snapshot = TrackerSnapshot(self.tracked_stocks, taken_at=next(_changes))
+            self._snapshot = snapshot
+        return snapshot
+    
+    def frozen_snapshot(self, previous=None):
+        """Immutable snapshot that is safe to read from any thread without locking.
+        
+        Copy-on-write: stocks unchanged since `previous` share its frozen copies.
+        """
+        with self.lock:
+            return TrackerSnapshot.frozen(self.tracked_stocks, taken_at=next(_changes), previous=previous)
     
     def analyze_stock(self, symbol):
         """Analyze stock and return trading recommendation using dollar thresholds"""
         if symbol not in self.tracked_stocks:
             return "N/A"
         
-        data = self.tracked_stocks[symbol]
-        if data['current_price'] is None or data['base_price'] is None:
-            return "Hold"
-        
-        current_price = data['current_price']
-        base_price = data['base_price']
-        price_change = current_price - base_price  # Dollar amount change
-        
-        buy_threshold = data['buy_threshold']  # Negative dollar amount (e.g., -2.50)
-        sell_threshold = data['sell_threshold']  # Positive dollar amount (e.g., 5.00)
-        
-        if price_change <= buy_threshold:
-            return "BUY"
-        elif price_change >= sell_threshold:
-            return "SELL"
-        else:
-            return "HOLD"
+        # BUY when the dollar change from base_price is at or below buy_threshold
+        # (e.g. -2.50), SELL when at or above sell_threshold (e.g. 5.00)
+        snapshot = self.snapshot()
+        row = snapshot.index.get(symbol)
+        return "N/A" if row is None else snapshot.recommendation(row)
     
     def get_stock_data(self, symbol):
         """Get formatted stock data for display"""
         if symbol not in self.tracked_stocks:
             return None
         
-        data = self.tracked_stocks[symbol]
-        if data['current_price'] is not None and data['base_price'] is not None:
-            current_price = data['current_price']
-            base_price = data['base_price']
-            change_amount = current_price - base_price  # Dollar change
-            change_pct = ((current_price - base_price) / base_price) * 100  # Still useful for display
-            recommendation = self.analyze_stock(symbol)
-            
-            return {
-                'symbol': symbol,
-                'current_price': current_price,
-                'base_price': base_price,
-                'change_amount': change_amount,  # Dollar amount change
-                'change_pct': change_pct,  # Percentage change (for reference)
-                'recommendation': recommendation,
-                'buy_threshold': data['buy_threshold'],
-                'sell_threshold': data['sell_threshold'],
-                'history': data['history']
-            }
-        
-        return None
+        snapshot = self.snapshot()
+        row = snapshot.index.get(symbol)
+        return None if row is None else snapshot.row_data(row)
     
     def get_all_stocks_data(self):
         """Get data for all tracked stocks"""
-        stocks_data = []
-        for symbol in self.tracked_stocks.keys():
-            stock_data = self.get_stock_data(symbol)
-            if stock_data:
-                stocks_data.append(stock_data)
-        return stocks_data
+        return self.snapshot().all_rows()
     
     def check_for_alerts(self, symbol):
         """Check if a stock has triggered any alerts"""
-        data = self.get_stock_data(symbol)
-        if data and data['recommendation'] in ["BUY", "SELL"]:
-            return {
-                'symbol': symbol,
-                'action': data['recommendation'],
-                'price': data['current_price'],
-                'change_amount': data['change_amount'],
-                'change_pct': data['change_pct'],
-                'message': f"{symbol}: {data['recommendation']} at ${data['current_price']:.2f} (Change: ${data['change_amount']:+.2f})"
-            }
-        return None
+        if symbol not in self.tracked_stocks:
+            return None
+        
+        snapshot = self.snapshot()
+        row = snapshot.index.get(symbol)
+        return None if row is None else snapshot.alert(row)
+    
+    def check_all_alerts(self):
+        """Check every tracked stock for alerts in one pass"""
+        return self.snapshot().all_alerts()
     
     def update_all_stocks(self, progress_callback=None):
         """Update all tracked stocks"""
-        results = {}
-        for i, symbol in enumerate(list(self.tracked_stocks.keys())):
-            success = self.update_stock_data(symbol)
-            results[symbol] = success
-            
-            if progress_callback:
-                progress_callback(i + 1, len(self.tracked_stocks))
-            
-            time.sleep(0.5)  # Small delay to avoid rate limiting
+        with self.lock:
+            symbols = list(self.tracked_stocks.keys())
+        return self.update_stocks(symbols, progress_callback)
+    
+    def update_stocks(self, symbols, progress_callback=None, cancel=None):
+        """Update the given tracked stocks as one cycle.
+        
+        Setting the `cancel` event stops requests that have not started yet;
+        their symbols are left out of the returned {symbol: success}.
+        """
+        symbols = list(symbols)
+        started = self.start_cycle()
         
+        if self.fetch_mode == "batch":
+            results = self.update_stocks_batched(symbols, progress_callback, cancel=cancel)
+        else:
+            # Requests run concurrently; the engine's token bucket does the rate limiting
+            results = self.fetch_engine.run(symbols, self.fetch_stock_data, progress_callback, cancel=cancel)
+        
+        self.finish_cycle(started, results)
         return results
     
+    def start_cycle(self):
+        """Reset the per-cycle transfer counters; returns the start time to pass to finish_cycle"""
+        self.transfer_stats = self._empty_transfer_stats()
+        return time.perf_counter()
+    
+    def finish_cycle(self, started, results):
+        """Record a cycle's transfer stats and metrics from its {symbol: success} and flush the store"""
+        self.last_cycle_stats = dict(self.transfer_stats)
+        self.flush_store()
+        if self.metrics is not None:
+            self.metrics.record_cycle(time.perf_counter() - started, results, len(self.tracked_stocks))
+    
+    def flush_store(self):
+        """Write queued ticks and settings to the store, if there is one"""
+        if self.store is None:
+            return
+        try:
+            self.store.flush()
+        except OSError as e:
+            print(f"Error writing tick store: {e}")
+    
     def clear_all_stocks(self):
         """Clear all tracked stocks"""
-        self.tracked_stocks.clear()
\ No newline at end of file
+        with self.lock:
+            self.tracked_stocks.clear()
+            _count_change()
+        if self.store is not None:
+            self.store.clear_stocks()
+            self.flush_store()
\ No newline at end of file
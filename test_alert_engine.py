@@ -0,0 +1,83 @@
+import unittest
+
+from alert_engine import (ABOVE, BELOW, AlertEngine, CrossingRule, DollarRule, PercentRule,
+                          TrailingRule)
+from stock_tracker import StockState
+
+
+class TestAlertEngine(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.engine = AlertEngine(hysteresis=0.5, cooldown=60, clock=lambda: self.now)
+
+    def actions(self, symbol, price, base_price=None):
+        return [alert['action'] for alert in self.engine.on_tick(symbol, price, base_price)]
+
+    def test_threshold_rules_match_dollar_semantics(self):
+        self.engine.track("AAA", -2.0, 5.0)
+        self.assertEqual(self.actions("AAA", 100.0, base_price=100.0), [])
+        self.assertEqual(self.actions("AAA", 98.0), ["BUY"])  # At the threshold counts
+        alert = self.engine.queue.get_nowait()
+        self.assertEqual(alert['message'], "AAA: BUY at $98.00 (Change: $-2.00)")
+        self.assertEqual(self.actions("AAA", 106.0), ["SELL"])
+
+    def test_hysteresis_and_cooldown(self):
+        self.engine.add_rule("AAA", CrossingRule(50.0, ABOVE))
+        self.assertEqual(self.actions("AAA", 51.0), ["CROSS"])
+        self.assertEqual(self.actions("AAA", 52.0), [])   # Still above: no repeat
+        self.assertEqual(self.actions("AAA", 49.8), [])   # Not back past the hysteresis band
+        self.assertEqual(self.actions("AAA", 50.1), [])
+        self.assertEqual(self.actions("AAA", 49.4), [])   # Re-armed
+        self.assertEqual(self.actions("AAA", 50.0), [])   # ...but still cooling down
+        self.assertEqual(self.actions("AAA", 49.0), [])
+        self.now += 61
+        self.assertEqual(self.actions("AAA", 50.5), ["CROSS"])
+
+    def test_percent_and_trailing_rules(self):
+        self.engine.add_rule("AAA", PercentRule(10.0))
+        self.engine.add_rule("AAA", TrailingRule(amount=3.0))
+        self.assertEqual(self.actions("AAA", 100.0, base_price=100.0), [])
+        self.assertEqual(self.actions("AAA", 108.0), [])
+        self.assertEqual(self.actions("AAA", 106.0), [])  # $2 off the peak
+        self.assertEqual(self.actions("AAA", 110.5), ["SELL"])
+        self.assertEqual(self.actions("AAA", 106.9), ["SELL"])  # $3.60 off the new peak
+        alert = self.engine.on_tick("AAA", 106.0)
+        self.assertEqual(alert, [])
+
+    def test_rebasing_moves_relative_triggers(self):
+        rule = self.engine.add_rule("AAA", DollarRule(-1.0))
+        self.assertEqual(rule.direction, BELOW)
+        self.engine.on_tick("AAA", 100.0, base_price=100.0)
+        self.assertEqual(self.actions("AAA", 99.5, base_price=99.0), [])
+        self.assertEqual(self.actions("AAA", 98.0), ["BUY"])
+
+    def test_only_ticked_symbols_are_evaluated(self):
+        for i in range(1000):
+            self.engine.track(f"S{i}", -2.0, 5.0)
+            self.engine.on_tick(f"S{i}", 100.0, base_price=100.0)
+        self.assertEqual(self.actions("S7", 97.0), ["BUY"])
+        self.assertEqual(self.engine.fired, 1)
+
+        self.engine.prune({"S7": None})
+        self.assertEqual(list(self.engine.symbols), ["S7"])
+
+    def test_removed_and_re_added_symbol_uses_its_new_thresholds(self):
+        state = StockState(-2.0, 5.0, current_price=100.0, base_price=100.0)
+        self.engine.update_from({"AAA": state}, ["AAA"])
+        self.assertEqual(self.actions("AAA", 98.0), ["BUY"])
+
+        # Removed and added again with other thresholds before the engine heard of the removal
+        state = StockState(-1.0, 3.0, current_price=100.0, base_price=100.0)
+        self.engine.update_from({"AAA": state}, ["AAA"])
+        self.assertEqual([rule.amount for rule in self.engine.symbols["AAA"].rules], [-1.0, 3.0])
+        self.assertEqual(self.actions("AAA", 99.0), ["BUY"])
+        self.assertEqual(self.actions("AAA", 103.0), ["SELL"])
+
+        # Removal through the engine forgets the rules and their cooldowns
+        self.engine.remove_symbol("AAA")
+        self.engine.update_from({"AAA": state}, ["AAA"])
+        self.assertEqual(self.actions("AAA", 99.0), ["BUY"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from backtest import backtest, make_grid, run_strategy, signals, summarize
+from benchmarks.fake_market import make_bars
+from providers import MarketDataProvider, save_recording
+from snapshot import RECOMMENDATIONS
+from stock_tracker import StockState, StockTracker
+
+
+class TestBacktest(unittest.TestCase):
+    def test_signals_match_analyze_stock(self):
+        tracker = StockTracker(mock.Mock(spec=MarketDataProvider))
+        prices = [100.0, 98.0, 97.5, 101.0, 105.0, 104.99, 95.0]
+        outcome = run_strategy(prices, -2.0, 5.0)
+        # Fills: buy at 98 (exactly -2), sell at 105 (exactly +5), buy again at 95
+        self.assertEqual(outcome['trades'], 2)
+        self.assertEqual(outcome['realized'], 7.0)
+        self.assertEqual(outcome['open'], 1)
+        self.assertEqual(outcome['unrealized'], 0.0)
+        self.assertEqual(outcome['wins'], 1)
+
+        codes = signals(prices, prices[0], -2.0, 5.0)
+        for price, code in zip(prices, codes):
+            tracker.tracked_stocks["AAA"] = StockState(-2.0, 5.0, current_price=price, base_price=prices[0])
+            self.assertEqual(tracker.analyze_stock("AAA"), RECOMMENDATIONS[code])
+
+    def test_sell_before_any_buy_is_ignored(self):
+        outcome = run_strategy([100.0, 106.0, 97.0, 99.0], -2.0, 5.0)
+        self.assertEqual(outcome['trades'], 1)
+        self.assertEqual(outcome['pnl'], 2.0)
+        self.assertEqual(outcome['wins'], 1)
+
+    def test_grid_over_recording_in_processes(self):
+        frames = {symbol: make_bars(symbol, rows=390, seed=i) for i, symbol in enumerate(["AAA", "BBB"])}
+        grid = make_grid([-0.5, -0.25], [0.25, 0.5, 1.0])
+        with tempfile.TemporaryDirectory() as directory:
+            save_recording(frames, directory)
+            paths = {symbol: os.path.join(directory, f"{symbol}.csv") for symbol in frames}
+            pooled = backtest(paths, grid, workers=2)
+        serial = backtest({symbol: frame['Close'].to_numpy() for symbol, frame in frames.items()}, grid, workers=1)
+
+        self.assertEqual(len(pooled), 12)
+        np.testing.assert_allclose(pooled['pnl'], serial['pnl'])
+        summary = summarize(serial)
+        self.assertEqual(len(summary), 6)
+        self.assertTrue((summary['pnl'].diff().dropna() <= 0).all())
+        self.assertTrue(summary['hit_rate'].dropna().between(0, 1).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
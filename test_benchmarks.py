@@ -0,0 +1,48 @@
+import unittest
+
+from benchmarks.run_benchmarks import compare
+
+
+def report(*results):
+    return {'results': [{'case': case, 'symbols': symbols, 'depth': 390, 'best': best}
+                        for case, symbols, best in results]}
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_regressions_beyond_threshold_and_noise_floor(self):
+        baseline = report(
+            ("slower", 10, 0.010),
+            ("faster", 10, 0.010),
+            ("steady", 10, 0.010),
+            ("tiny", 10, 0.00001),   # 4x slower, but by 30 µs
+            ("dropped", 10, 0.010),
+        )
+        current = report(
+            ("slower", 10, 0.013),
+            ("faster", 10, 0.007),
+            ("steady", 10, 0.012),   # 20% slower: within the 25% threshold
+            ("tiny", 10, 0.00004),
+            ("added", 10, 0.010),
+        )
+        rows = {key[0]: (ratio, status) for key, old, new, ratio, status in compare(baseline, current)}
+
+        self.assertEqual(rows["slower"][1], "regression")
+        self.assertAlmostEqual(rows["slower"][0], 1.3)
+        self.assertEqual(rows["faster"][1], "improvement")
+        self.assertEqual(rows["steady"][1], "ok")
+        self.assertEqual(rows["tiny"][1], "ok")
+        self.assertEqual(rows["dropped"], (None, "missing"))
+        self.assertEqual(rows["added"], (None, "new"))
+
+        # A lower threshold catches the 20% slowdown
+        strict = {key[0]: status for key, _, _, _, status in compare(baseline, current, threshold=0.1)}
+        self.assertEqual(strict["steady"], "regression")
+
+    def test_results_match_by_case_size_and_depth(self):
+        rows = compare(report(("case", 100, 0.01)), report(("case", 10, 0.01)))
+        self.assertEqual([(key, status) for key, _, _, _, status in rows],
+                         [(("case", 10, 390), "new"), (("case", 100, 390), "missing")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+import numpy as np
+
+from downsample import downsample, lttb, min_max
+
+
+class TestDownsample(unittest.TestCase):
+    def setUp(self):
+        self.x = np.arange(10000, dtype=float)
+        self.y = np.sin(self.x / 500.0)
+        self.y[4321] = 5.0  # A spike that must survive downsampling
+
+    def test_lttb_keeps_endpoints_and_spikes(self):
+        x, y = lttb(self.x, self.y, 200)
+        self.assertEqual(len(x), 200)
+        self.assertEqual((x[0], x[-1]), (0.0, 9999.0))
+        self.assertIn(4321.0, x)
+        self.assertTrue(np.all(np.diff(x) > 0))
+
+    def test_min_max_keeps_bucket_extremes_in_order(self):
+        x, y = min_max(self.x, self.y, 100)
+        self.assertLessEqual(len(x), 200)
+        self.assertEqual(y.max(), 5.0)
+        self.assertAlmostEqual(y.min(), self.y.min())
+        self.assertTrue(np.all(np.diff(x) > 0))
+
+    def test_short_series_are_copied_unchanged(self):
+        x, y = downsample(self.x[:50], self.y[:50], 200)
+        np.testing.assert_array_equal(y, self.y[:50])
+        self.assertFalse(np.shares_memory(y, self.y))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+
+from fetch_engine import FetchEngine, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_refill_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+
+        # Two more tokens at 2/s take one second of (fake) waiting
+        bucket.acquire()
+        bucket.acquire()
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_acquire_timeout(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        self.assertFalse(bucket.acquire(timeout=0.5))
+
+
+class TestFetchEngine(unittest.TestCase):
+    def test_retries_with_backoff_then_succeeds(self):
+        delays = []
+        engine = FetchEngine(rate_limit=None, retries=2, backoff=0.5, sleep=delays.append)
+        attempts = []
+
+        def flaky(key, timeout):
+            attempts.append(key)
+            if len(attempts) < 3:
+                raise IOError("temporary failure")
+            return True
+
+        self.assertEqual(engine.run(["AAA"], flaky), {"AAA": True})
+        self.assertEqual(delays, [0.5, 1.0])
+
+    def test_failures_are_reported_as_false(self):
+        engine = FetchEngine(rate_limit=None, retries=1, backoff=0, sleep=lambda s: None)
+
+        def fetch(key, timeout):
+            if key == "BAD":
+                raise IOError("boom")
+            return True
+
+        progress = []
+        results = engine.run(["AAA", "BAD", "CCC"], fetch, lambda done, total: progress.append((done, total)))
+        self.assertEqual(results, {"AAA": True, "BAD": False, "CCC": True})
+        self.assertEqual(progress[-1], (3, 3))
+
+    def test_cancel_ends_the_backoff_wait(self):
+        engine = FetchEngine(rate_limit=None, retries=2, backoff=60, sleep=self.fail)
+        cancel = threading.Event()
+        attempts = []
+
+        def fetch(key, timeout):
+            attempts.append(key)
+            threading.Timer(0.05, cancel.set).start()
+            raise IOError("temporary failure")
+
+        started = time.monotonic()
+        self.assertEqual(engine.run(["AAA"], fetch, cancel=cancel), {})
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(attempts, ["AAA"])
+
+    def test_passes_timeout_to_fetch(self):
+        engine = FetchEngine(rate_limit=None, timeout=3)
+        self.assertEqual(engine.run(["AAA"], lambda key, timeout: timeout), {"AAA": 3})
+
+
+if __name__ == '__main__':
+    unittest.main()
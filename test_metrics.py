@@ -0,0 +1,80 @@
+import unittest
+import urllib.request
+from unittest import mock
+
+import pandas as pd
+
+from fetch_engine import FetchEngine
+from metrics import MetricsRegistry, MetricsServer, TrackerMetrics
+from providers import MarketDataProvider
+from stock_tracker import StockState, StockTracker
+
+
+def make_bars(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="America/New_York")
+    return pd.DataFrame({'Close': closes, 'Volume': [100] * len(closes)}, index=index)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("kind",))
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        requests.inc(labels=("full",))
+        requests.inc(2, labels=("full",))
+        latency.observe(0.05)
+        latency.observe(0.5)
+        latency.observe(5.0)
+
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE requests_total counter", lines)
+        self.assertIn('requests_total{kind="full"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 3', lines)
+        self.assertIn("latency_seconds_count 3", lines)
+        self.assertAlmostEqual(latency.quantile(0.5), 0.55)  # Interpolated within (0.1, 1.0]
+        self.assertAlmostEqual(latency.mean(), 5.55 / 3)
+
+    def test_tracker_records_fetches_errors_retries_and_cycles(self):
+        provider = mock.Mock(spec=MarketDataProvider)
+        calls = {"BAD": 0}
+
+        def history(symbol, **kwargs):
+            if symbol == "BAD":
+                calls["BAD"] += 1
+                raise ConnectionError("timed out")
+            return make_bars([100.0, 101.0])
+
+        provider.history.side_effect = history
+        metrics = TrackerMetrics()
+        engine = FetchEngine(rate_limit=None, retries=1, sleep=lambda seconds: None)
+        tracker = StockTracker(provider, fetch_engine=engine, metrics=metrics)
+        for symbol in ("AAA", "BAD"):
+            tracker.tracked_stocks[symbol] = StockState(-2.0, 5.0)
+        tracker.update_all_stocks()
+
+        self.assertEqual(metrics.fetch_seconds.totals()[2], 1)
+        self.assertEqual(metrics.fetch_errors.values, {("BAD",): 2})
+        self.assertEqual(metrics.fetch_retries.total(), 1)
+        self.assertEqual(metrics.fetch_failures.total(), 1)
+        self.assertEqual(metrics.rows_fetched.total(), 2)
+        self.assertEqual(metrics.cycle_symbols.values, {("updated",): 1, ("failed",): 1})
+        self.assertEqual(metrics.tracked_symbols.get(), 2)
+        self.assertEqual(len(metrics.summary()), 6)
+
+    def test_metrics_endpoint(self):
+        metrics = TrackerMetrics(per_symbol=False)
+        metrics.fetch_seconds.observe(0.2)
+        server = MetricsServer(metrics, port=0).start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+                self.assertIn("text/plain", response.headers["Content-Type"])
+                body = response.read().decode()
+        finally:
+            server.stop()
+        self.assertIn("stock_tracker_fetch_seconds_count 1", body)
+
+
+if __name__ == '__main__':
+    unittest.main()
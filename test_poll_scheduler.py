@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from poll_scheduler import NEW_YORK, MarketHours, PollScheduler
+from providers import MarketDataProvider
+from stock_tracker import StockState, StockTracker
+
+
+def ny(*args):
+    return datetime(*args, tzinfo=NEW_YORK).timestamp()
+
+
+class TestMarketHours(unittest.TestCase):
+    def test_regular_session(self):
+        hours = MarketHours()
+        self.assertTrue(hours.is_open(ny(2024, 1, 2, 10, 0)))     # Tuesday
+        self.assertFalse(hours.is_open(ny(2024, 1, 2, 16, 0)))    # At the close
+        self.assertFalse(hours.is_open(ny(2024, 1, 6, 12, 0)))    # Saturday
+        # Friday evening -> Monday's open
+        self.assertEqual(hours.next_open(ny(2024, 1, 5, 17, 0)), ny(2024, 1, 8, 9, 30))
+
+    def test_holidays(self):
+        hours = MarketHours(holidays=[datetime(2024, 1, 15).date()])
+        self.assertFalse(hours.is_open(ny(2024, 1, 15, 11, 0)))
+        self.assertEqual(hours.next_open(ny(2024, 1, 12, 16, 30)), ny(2024, 1, 16, 9, 30))
+
+
+class TestPollScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = ny(2024, 1, 2, 10, 0)
+        self.tracker = StockTracker(mock.Mock(spec=MarketDataProvider))
+        self.scheduler = PollScheduler(self.tracker, min_interval=10, max_interval=300, budget=100,
+                                       clock=lambda: self.now)
+
+    def track(self, symbol, prices, buy=-2.0, sell=5.0):
+        state = StockState(buy, sell, base_price=100.0)
+        times = pd.date_range("2024-01-02 14:30", periods=len(prices), freq="1min", tz="UTC")
+        state.history.extend(times.as_unit("ns").asi8, prices)
+        state.current_price = prices[-1]
+        self.tracker.tracked_stocks[symbol] = state
+
+    def test_intervals_follow_threshold_proximity(self):
+        wiggle = np.tile([0.0, 0.05], 10)
+        self.track("NEAR", 100 - 2.04 + wiggle)  # $0.01 from the buy threshold
+        self.track("FAR", 100 + wiggle)         # $2 from the nearest threshold
+        self.track("PAST", 100 + 7 + wiggle)    # Well past the sell threshold
+        self.track("FLAT", [100.0] * 20)
+
+        due = self.scheduler.due()
+        self.assertEqual(sorted(due), ["FAR", "FLAT", "NEAR", "PAST"])
+        self.assertEqual(self.scheduler.due(), [])  # In flight until recorded
+        self.scheduler.record({symbol: True for symbol in due})
+
+        intervals = self.scheduler.intervals
+        self.assertEqual(intervals["NEAR"], 10)
+        self.assertGreater(intervals["PAST"], 100)  # Timed by the way back
+        self.assertEqual(intervals["FLAT"], 300)
+        self.assertGreater(intervals["FAR"], 100)
+
+        self.now += 11
+        self.assertEqual(self.scheduler.due(), ["NEAR"])
+
+    def test_budget_and_market_hours(self):
+        self.scheduler.budget = 2
+        for i in range(10):
+            self.track(f"S{i}", [100.0, 100.1, 100.0])
+        self.assertEqual(len(self.scheduler.due()), 2)
+        self.now += 1.5
+        self.assertEqual(len(self.scheduler.due()), 3)
+        self.assertGreater(self.scheduler.next_due(), 0)
+
+        self.now = ny(2024, 1, 2, 18, 0)
+        self.assertEqual(self.scheduler.due(), [])
+        self.assertEqual(self.scheduler.next_due(), ny(2024, 1, 3, 9, 30) - self.now)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from price_history import PriceHistory
+
+
+class TestPriceHistory(unittest.TestCase):
+    def test_keeps_newest_samples_across_wraps(self):
+        history = PriceHistory(capacity=5)
+        for i in range(100):
+            history.append(i, float(i))
+            expected = list(range(max(0, i - 4), i + 1))
+            self.assertEqual(list(history.times()), expected)
+            self.assertEqual(list(history.prices()), [float(t) for t in expected])
+
+    def test_extend_matches_repeated_append(self):
+        appended = PriceHistory(capacity=8)
+        extended = PriceHistory(capacity=8)
+        start = 0
+        for count in (3, 5, 7, 1, 12, 4):
+            times = np.arange(start, start + count)
+            for t in times:
+                appended.append(int(t), float(t))
+            extended.extend(times, times.astype(float))
+            start += count
+            self.assertEqual(list(extended.times()), list(appended.times()))
+            self.assertEqual(list(extended.prices()), list(appended.prices()))
+
+    def test_views_are_zero_copy_and_read_only(self):
+        history = PriceHistory(capacity=10)
+        history.append(1, 10.0)
+        history.append(2, 11.0)
+        prices = history.prices()
+        self.assertFalse(prices.flags.owndata)
+        self.assertFalse(prices.flags.writeable)
+        with self.assertRaises(ValueError):
+            prices[0] = 0.0
+
+    def test_timestamps_and_last_sample(self):
+        history = PriceHistory()
+        self.assertIsNone(history.last_time())
+        now = pd.Timestamp("2024-01-02 09:30", tz="America/New_York")
+        history.append(now, 100.0)
+        history.set_last_price(100.5)
+        self.assertEqual(history.last_time(), now.value)
+        self.assertEqual(history.last_price(), 100.5)
+        self.assertEqual(history.times().view('datetime64[ns]')[0], np.datetime64(now.tz_convert(None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from providers import ReplayProvider, save_recording, split_batch_frame
+
+
+def make_bars(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="America/New_York")
+    return pd.DataFrame({'Close': closes, 'Volume': [100] * len(closes)}, index=index)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSplitBatchFrame(unittest.TestCase):
+    def test_drops_missing_bars_and_symbols(self):
+        data = pd.concat({
+            "AAA": make_bars([10.0, 11.0]),
+            "BBB": make_bars([20.0, float('nan')]),
+        }, axis=1)
+        frames = split_batch_frame(data, ["AAA", "BBB", "ZZZ"])
+        self.assertEqual(sorted(frames), ["AAA", "BBB"])
+        self.assertEqual(len(frames["BBB"]), 1)
+
+
+class TestReplayProvider(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.bars = make_bars([10.0, 11.0, 12.0, 13.0])
+        save_recording({"AAA": self.bars}, self.directory)
+        self.clock = FakeClock()
+        # 60x real time: one recorded minute per second of clock time
+        self.provider = ReplayProvider(self.directory, speed=60, clock=self.clock)
+
+    def tearDown(self):
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+    def test_only_bars_up_to_replay_clock_are_visible(self):
+        self.assertEqual(list(self.provider.history("AAA")['Close']), [10.0])
+
+        self.clock.now = 2.0
+        self.assertEqual(self.provider.now(), self.bars.index[2])
+        self.assertEqual(list(self.provider.history("AAA")['Close']), [10.0, 11.0, 12.0])
+
+        since = self.provider.history("AAA", start=self.bars.index[1])
+        self.assertEqual(list(since['Close']), [11.0, 12.0])
+
+    def test_validate_and_download(self):
+        self.clock.now = 10.0
+        self.assertTrue(self.provider.validate_symbol("AAA"))
+        self.assertFalse(self.provider.validate_symbol("ZZZ"))
+        self.assertEqual(list(self.provider.download(["AAA", "ZZZ"])), ["AAA"])
+
+
+if __name__ == '__main__':
+    unittest.main()
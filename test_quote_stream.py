@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from alert_engine import AlertEngine
+from providers import MarketDataProvider
+from quote_stream import QuoteServer, QuoteStream, format_tick, parse_tick
+from stock_tracker import StockState, StockTracker
+from tracker_service import AlertSink, TrackerService
+
+START = pd.Timestamp("2024-01-02 09:30", tz="America/New_York").value
+MINUTE = 60 * 10 ** 9
+
+
+class ListSink(AlertSink):
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event):
+        self.events.append(event)
+
+
+class TestQuoteStream(unittest.TestCase):
+    def setUp(self):
+        self.tracker = StockTracker(mock.Mock(spec=MarketDataProvider))
+        for symbol in ("AAA", "BBB"):
+            self.tracker.tracked_stocks[symbol] = StockState(-2.0, 5.0)
+        self.ticks = [(START + i * MINUTE, symbol, price)
+                      for i, (symbol, price) in enumerate([("AAA", 100.0), ("BBB", 50.0), ("CCC", 10.0),
+                                                           ("AAA", 103.0), ("AAA", 106.0), ("BBB", 47.5)])]
+
+    def test_tick_lines_round_trip(self):
+        line = format_tick("AAA", START, 101.25, START + 5)
+        self.assertEqual(parse_tick(line), ("AAA", START, 101.25, START + 5))
+        self.assertEqual(parse_tick("AAA 1 2.5\n"), ("AAA", 1, 2.5, None))
+        with self.assertRaises(ValueError):
+            parse_tick("AAA 2.5")
+
+    def test_apply_updates_state_like_a_poll(self):
+        seen = []
+        stream = QuoteStream(self.tracker, on_tick=lambda *args: seen.append(args))
+        stream.apply("AAA", START, 100.0)
+        stream.apply("AAA", START + MINUTE, 97.5)
+        stream.apply("ZZZ", START, 1.0)
+
+        state = self.tracker.tracked_stocks["AAA"]
+        self.assertEqual(state.base_price, 100.0)
+        self.assertEqual(state.current_price, 97.5)
+        self.assertEqual(state.last_update, pd.Timestamp(START + MINUTE, tz="UTC"))
+        self.assertEqual(len(state.history), 2)
+        self.assertEqual(seen, [("AAA", "HOLD", []), ("AAA", "BUY", [])])
+        self.assertEqual(self.tracker.analyze_stock("AAA"), "BUY")
+        self.assertEqual((stream.ticks, stream.ignored), (2, 1))
+
+    def test_replayed_ticks_reach_the_tracker_and_alert_engine(self):
+        engine = AlertEngine(cooldown=0)
+        sink = ListSink()
+        stream = QuoteStream(self.tracker, port=0, alert_engine=engine, reconnect_delay=None)
+        server = QuoteServer(self.ticks, port=0)
+        service = TrackerService(self.tracker, [sink], stream=stream)
+
+        async def scenario():
+            await server.start()
+            stream.port = server.port
+            running = asyncio.ensure_future(service.run())
+            await asyncio.wait_for(server.subscribed.wait(), 5)
+            await server.replay()
+            while stream.ticks < 5:
+                await asyncio.sleep(0.01)
+            service.stop()
+            await asyncio.wait_for(running, 5)
+            await server.close()
+
+        asyncio.run(scenario())
+        self.assertEqual(server.sent, 5)  # CCC is not tracked, so never subscribed
+        self.assertEqual(self.tracker.tracked_stocks["AAA"].current_price, 106.0)
+        self.assertEqual(self.tracker.analyze_stock("BBB"), "BUY")
+        self.assertEqual([(event['symbol'], event['action']) for event in sink.events],
+                         [("AAA", "SELL"), ("BBB", "BUY")])
+        self.assertEqual(stream.latency_summary()['count'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def loaded_after_import(module, candidates):
+    """Which of `candidates` are in sys.modules after importing `module` in a fresh interpreter"""
+    code = f"import sys, {module}; print(' '.join(m for m in {list(candidates)!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+class TestStartup(unittest.TestCase):
+    def test_stock_tracker_import_is_light(self):
+        self.assertEqual(loaded_after_import("stock_tracker", ["pandas", "yfinance", "matplotlib"]), [])
+
+    def test_stock_gui_import_defers_chart_and_provider(self):
+        self.assertEqual(loaded_after_import("stock_gui", ["yfinance", "matplotlib"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+
+from stock_gui import TreeviewRows
+
+
+class FakeTree:
+    """Records the Treeview calls TreeviewRows makes"""
+
+    def __init__(self, height=3):
+        self.height = height
+        self.rows = {}
+        self.order = []
+        self.selected = ()
+        self.calls = []
+        self.next_id = 0
+
+    def insert(self, parent, index, values):
+        self.next_id += 1
+        item = f"I{self.next_id}"
+        self.rows[item] = list(values)
+        self.order.append(item)
+        self.calls.append("insert")
+        return item
+
+    def set(self, item, column, value):
+        self.rows[item][column] = value
+        self.calls.append("set")
+
+    def item(self, item, values):
+        self.rows[item] = list(values)
+        self.calls.append("item")
+
+    def delete(self, item):
+        del self.rows[item]
+        self.order.remove(item)
+        self.calls.append("delete")
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, items):
+        self.selected = tuple(items)
+
+    def cget(self, option):
+        return self.height
+
+    def visible(self):
+        return [self.rows[item] for item in self.order]
+
+
+def rows(*entries):
+    return [(symbol, (symbol, price)) for symbol, price in entries]
+
+
+class TestTreeviewRows(unittest.TestCase):
+    def test_only_changed_cells_and_rows_are_written(self):
+        tree = FakeTree()
+        view = TreeviewRows(tree)
+        view.update(rows(("AAA", "$1.00"), ("BBB", "$2.00")))
+        tree.calls.clear()
+
+        view.update(rows(("AAA", "$1.00"), ("BBB", "$2.50"), ("CCC", "$3.00")))
+        self.assertEqual(tree.calls, ["set", "insert"])
+        self.assertEqual(tree.visible(), [["AAA", "$1.00"], ["BBB", "$2.50"], ["CCC", "$3.00"]])
+
+        tree.calls.clear()
+        view.update(rows(("AAA", "$1.00"), ("CCC", "$3.00")))
+        self.assertEqual(tree.calls, ["delete"])
+        self.assertEqual(view.key_for(tree.order[1]), "CCC")
+
+    def test_virtual_mode_renders_only_visible_rows(self):
+        tree = FakeTree(height=3)
+        scrolls = []
+        view = TreeviewRows(tree, virtualize_above=4, scroll_callback=lambda *f: scrolls.append(f))
+        data = rows(*[(f"S{i}", f"${i}.00") for i in range(10)])
+
+        view.update(data)
+        self.assertTrue(view.virtual)
+        self.assertEqual(tree.visible(), [["S0", "$0.00"], ["S1", "$1.00"], ["S2", "$2.00"]])
+
+        tree.selected = (tree.order[2],)  # S2
+        view.scroll_by(2)
+        self.assertEqual([row[0] for row in tree.visible()], ["S2", "S3", "S4"])
+        self.assertEqual(view.key_for(tree.selected[0]), "S2")
+        self.assertEqual(scrolls[-1], (0.2, 0.5))
+
+        view.scroll_to(1.0)
+        self.assertEqual([row[0] for row in tree.visible()], ["S7", "S8", "S9"])
+        self.assertEqual(tree.selected, ())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,16 @@
 import unittest
-from stock_tracker import StockTracker
+from unittest import mock
+
+import pandas as pd
+
+from price_history import PriceHistory
+from providers import MarketDataProvider
+from stock_tracker import StockState, StockTracker
+
+
+def make_bars(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="America/New_York")
+    return pd.DataFrame({'Close': closes, 'Volume': [100] * len(closes)}, index=index)
 
 class TestStockTracker(unittest.TestCase):
     def setUp(self):
@@ -8,29 +19,154 @@ class TestStockTracker(unittest.TestCase):
         
         # Add a stock with thresholds: buy if price drops $2, sell if rises $5
         self.symbol = "TEST"
-        self.tracker.tracked_stocks[self.symbol] = {
-            'buy_threshold': -2.0,
-            'sell_threshold': 5.0,
-            'current_price': None,
-            'base_price': 100.0,  # starting price
-            'history': [],
-            'last_update': None
-        }
+        self.tracker.tracked_stocks[self.symbol] = StockState(
+            buy_threshold=-2.0,
+            sell_threshold=5.0,
+            base_price=100.0  # starting price
+        )
 
     def test_buy_recommendation(self):
-        self.tracker.tracked_stocks[self.symbol]['current_price'] = 97.5  # price drop $2.5
+        self.tracker.tracked_stocks[self.symbol].current_price = 97.5  # price drop $2.5
         result = self.tracker.analyze_stock(self.symbol)
         self.assertEqual(result, "BUY")
 
     def test_sell_recommendation(self):
-        self.tracker.tracked_stocks[self.symbol]['current_price'] = 106.0  # price rise $6
+        self.tracker.tracked_stocks[self.symbol].current_price = 106.0  # price rise $6
         result = self.tracker.analyze_stock(self.symbol)
         self.assertEqual(result, "SELL")
 
     def test_hold_recommendation(self):
-        self.tracker.tracked_stocks[self.symbol]['current_price'] = 101.0  # price change $1
+        self.tracker.tracked_stocks[self.symbol].current_price = 101.0  # price change $1
         result = self.tracker.analyze_stock(self.symbol)
         self.assertEqual(result, "HOLD")
 
 
+    def test_snapshot_follows_state_changes(self):
+        state = self.tracker.tracked_stocks[self.symbol]
+        state.current_price = 97.5
+        first = self.tracker.snapshot()
+        self.assertIs(self.tracker.snapshot(), first)
+
+        state.current_price = 106.0
+        self.assertEqual(self.tracker.analyze_stock(self.symbol), "SELL")
+        self.assertIsNot(self.tracker.snapshot(), first)
+
+    def test_snapshot_frozen_during_a_tick_is_not_reused_without_it(self):
+        frozen = [self.tracker.frozen_snapshot()]
+        append = PriceHistory.append
+
+        def publish_then_append(history, time, price):
+            # A publish from another thread lands while the tick is being applied
+            frozen.append(self.tracker.frozen_snapshot(previous=frozen[-1]))
+            append(history, time, price)
+
+        with mock.patch.object(PriceHistory, "append", publish_then_append):
+            self.tracker.apply_tick(self.symbol, pd.Timestamp("2024-01-02 15:00", tz="UTC"), 101.25)
+        snapshot = self.tracker.frozen_snapshot(previous=frozen[-1])
+        state = snapshot.states[snapshot.index[self.symbol]]
+        self.assertEqual(state.history.last_price(), 101.25)
+        self.assertEqual(state.current_price, 101.25)
+
+    def test_vectorized_views_match_per_stock_rules(self):
+        prices = {"AAA": (100.0, 97.0), "BBB": (50.0, 56.0), "CCC": (20.0, 21.0), "DDD": (None, None)}
+        for symbol, (base_price, current_price) in prices.items():
+            self.tracker.tracked_stocks[symbol] = StockState(-2.0, 5.0, current_price, base_price)
+
+        rows = {data['symbol']: data for data in self.tracker.get_all_stocks_data()}
+        self.assertEqual(sorted(rows), ["AAA", "BBB", "CCC"])
+        self.assertEqual(rows["AAA"]['recommendation'], "BUY")
+        self.assertAlmostEqual(rows["BBB"]['change_pct'], 12.0)
+        self.assertEqual(self.tracker.analyze_stock("DDD"), "Hold")
+        self.assertEqual(self.tracker.analyze_stock("ZZZ"), "N/A")
+
+        alerts = self.tracker.check_all_alerts()
+        self.assertEqual([alert['symbol'] for alert in alerts], ["AAA", "BBB"])
+        self.assertEqual(alerts[0], self.tracker.check_for_alerts("AAA"))
+        self.assertEqual(alerts[0]['message'], "AAA: BUY at $97.00 (Change: $-3.00)")
+        self.assertIsNone(self.tracker.check_for_alerts("CCC"))
+
+
+class TestBatchedFetch(unittest.TestCase):
+    def setUp(self):
+        self.provider = mock.Mock(spec=MarketDataProvider)
+        self.provider.download.side_effect = self.fake_download
+        self.tracker = StockTracker(self.provider, fetch_mode="batch", batch_size=2)
+        for symbol in ("AAA", "BBB", "CCC"):
+            self.tracker.tracked_stocks[symbol] = StockState(-2.0, 5.0)
+        self.bars = {
+            "AAA": make_bars([10.0, 11.0, 12.0]),
+            "BBB": make_bars([20.0, 21.0, float('nan')]),
+            "CCC": make_bars([30.0, 31.0, 32.0]),
+        }
+
+    def fake_download(self, symbols, **kwargs):
+        return {symbol: self.bars[symbol].dropna() for symbol in symbols}
+
+    def test_batched_update_matches_single_bookkeeping(self):
+        progress = []
+        results = self.tracker.update_all_stocks(lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(self.provider.download.call_count, 2)
+        self.assertEqual(results, {"AAA": True, "BBB": True, "CCC": True})
+        self.assertEqual(progress[-1], (3, 3))
+
+        data = self.tracker.tracked_stocks["BBB"]
+        self.assertEqual(data.current_price, 21.0)
+        self.assertEqual(data.base_price, 21.0)
+        self.assertEqual(data.last_update, self.bars["BBB"].index[1])
+        self.assertEqual(list(data.history.times()), [self.bars["BBB"].index[1].value])
+        self.assertEqual(list(data.history.prices()), [21.0])
+
+
+class TestIncrementalFetch(unittest.TestCase):
+    def setUp(self):
+        self.bars = make_bars([10.0, 11.0, 12.0, 13.0, 14.0])
+        self.provider = mock.Mock(spec=MarketDataProvider)
+        self.tracker = StockTracker(self.provider, incremental=True)
+        self.tracker.now = lambda: self.bars.index[-1]
+        self.tracker.tracked_stocks["AAA"] = StockState(-2.0, 5.0)
+        self.history = self.provider.history
+
+    def test_first_fetch_is_full_then_incremental(self):
+        self.history.return_value = self.bars.iloc[:3]
+        self.assertTrue(self.tracker.update_stock_data("AAA"))
+        self.assertIsNone(self.history.call_args.kwargs['start'])
+
+        # The bar at last_update is revised and two new bars arrive
+        revised = self.bars.iloc[2:].copy()
+        revised.iloc[0, 0] = 12.5
+        self.history.return_value = revised
+        self.assertTrue(self.tracker.update_stock_data("AAA"))
+        self.assertEqual(self.history.call_args.kwargs['start'], self.bars.index[2])
+
+        data = self.tracker.tracked_stocks["AAA"]
+        self.assertEqual(list(data.history.prices()), [12.5, 13.0, 14.0])
+        self.assertEqual(data.current_price, 14.0)
+        self.assertEqual(data.base_price, 12.0)
+        self.assertEqual(data.last_update, self.bars.index[-1])
+
+    def test_falls_back_to_full_refresh_after_error_or_gap(self):
+        self.history.return_value = self.bars.iloc[:3]
+        self.tracker.update_stock_data("AAA")
+
+        self.history.side_effect = IOError("network down")
+        self.assertFalse(self.tracker.update_stock_data("AAA"))
+        self.assertIsNone(self.tracker.incremental_start("AAA"))
+
+        self.history.side_effect = None
+        self.tracker.update_stock_data("AAA")
+        self.assertEqual(self.tracker.incremental_start("AAA"), self.bars.index[2])
+
+        self.tracker.now = lambda: self.bars.index[-1] + pd.Timedelta(hours=2)
+        self.assertIsNone(self.tracker.incremental_start("AAA"))
+
+    def test_cycle_stats_count_rows(self):
+        self.tracker.fetch_engine.limiter = None
+        self.history.return_value = self.bars
+        self.tracker.update_all_stocks()
+        self.assertEqual(self.tracker.last_cycle_stats['rows'], 5)
+        self.assertEqual(self.tracker.last_cycle_stats['full_requests'], 1)
+        self.assertGreater(self.tracker.last_cycle_stats['bytes'], 0)
+
+
 # run using python -m unittest test_stock_tracker.py
@@ -0,0 +1,115 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from providers import MarketDataProvider
+from stock_tracker import StockTracker
+from tick_store import TICK_DTYPE, TickStore
+
+
+def make_bars(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="America/New_York")
+    return pd.DataFrame({'Close': closes}, index=index)
+
+
+class TestTickStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.store = TickStore(self.directory.name)
+
+    def test_appends_are_flushed_and_range_queried(self):
+        for minute in range(10):
+            self.store.append("AAA", minute * 60, 100.0 + minute)
+        self.assertEqual(len(self.store.ticks("AAA")), 0)
+
+        self.store.flush()
+        self.store.append("AAA", 600, 110.0)
+        self.store.flush()
+
+        self.assertEqual(len(self.store.ticks("AAA")), 11)
+        ticks = self.store.read("AAA", start=120, end=300)
+        self.assertEqual(list(ticks['price']), [102.0, 103.0, 104.0])
+
+    def test_tail_collapses_revised_ticks_and_ignores_partial_records(self):
+        for time_ns, price in [(0, 1.0), (60, 2.0), (60, 2.5), (120, 3.0)]:
+            self.store.append("AAA", time_ns, price)
+        self.store.flush()
+        with open(self.store.tick_path("AAA"), "ab") as f:
+            f.write(b"\x00" * (TICK_DTYPE.itemsize // 2))
+
+        tail = self.store.tail("AAA", 2)
+        self.assertEqual(list(tail['time']), [60, 120])
+        self.assertEqual(list(tail['price']), [2.5, 3.0])
+
+    def test_concurrent_flushes_keep_ticks_in_order(self):
+        entered = threading.Event()
+        release = threading.Event()
+        tick_path = self.store.tick_path
+
+        def slow_tick_path(symbol):
+            if not entered.is_set():
+                entered.set()
+                release.wait(5)
+            return tick_path(symbol)
+        self.store.tick_path = slow_tick_path
+
+        self.store.append("AAA", 0, 1.0)
+        first = threading.Thread(target=self.store.flush)
+        first.start()
+        self.assertTrue(entered.wait(5))
+        # A second flush of newer ticks must wait for the first to finish writing
+        self.store.append("AAA", 60, 2.0)
+        second = threading.Thread(target=self.store.flush)
+        second.start()
+        second.join(0.1)
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        self.assertEqual(list(self.store.ticks("AAA")['time']), [0, 60])
+
+    def test_removed_stock_loses_its_ticks(self):
+        self.store.set_stock("AAA", buy_threshold=-2.0, sell_threshold=5.0)
+        self.store.append("AAA", 0, 1.0)
+        self.store.flush()
+        self.store.append("AAA", 60, 2.0)
+
+        self.store.remove_stock("AAA")
+        self.store.flush()
+        self.assertEqual(len(self.store.ticks("AAA")), 0)
+        self.assertFalse(os.path.exists(self.store.tick_path("AAA")))
+
+    def test_tracker_warm_restart_restores_without_fetching(self):
+        provider = mock.Mock(spec=MarketDataProvider)
+        provider.validate_symbols.side_effect = lambda symbols, **kwargs: {s: True for s in symbols}
+        tracker = StockTracker(provider, store=self.store)
+        tracker.add_stock("AAA", -2.0, 5.0)
+        bars = make_bars([10.0, 11.0, 12.0])
+        for end in range(1, 4):
+            provider.history.return_value = bars.iloc[:end]
+            tracker.update_stock_data("AAA")
+
+        provider.reset_mock()
+        restarted = StockTracker(provider, store=TickStore(self.directory.name))
+        self.assertEqual(restarted.restore(), ["AAA"])
+        provider.history.assert_not_called()
+
+        state = restarted.tracked_stocks["AAA"]
+        self.assertEqual((state.buy_threshold, state.sell_threshold), (-2.0, 5.0))
+        self.assertEqual(state.base_price, 10.0)
+        self.assertEqual(state.current_price, 12.0)
+        self.assertEqual(state.last_update, bars.index[-1])
+        self.assertEqual(list(state.history.prices()), [10.0, 11.0, 12.0])
+        self.assertEqual(restarted.analyze_stock("AAA"), "HOLD")
+
+        restarted.remove_stock("AAA")
+        self.assertEqual(TickStore(self.directory.name).stocks(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from fetch_engine import FetchEngine
+from providers import MarketDataProvider
+from stock_tracker import StockState, StockTracker
+from tracker_service import FileSink, SocketSink, TrackerService, parse_sink
+
+
+def make_bars(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="America/New_York")
+    return pd.DataFrame({'Close': closes, 'Volume': [100] * len(closes)}, index=index)
+
+
+class TestTrackerService(unittest.TestCase):
+    def setUp(self):
+        self.closes = {"AAA": [100.0], "BBB": [50.0]}
+        self.provider = mock.Mock(spec=MarketDataProvider)
+        self.provider.history.side_effect = lambda symbol, **kwargs: make_bars(self.closes[symbol])
+        self.tracker = StockTracker(self.provider, fetch_engine=FetchEngine(rate_limit=None))
+        for symbol in self.closes:
+            self.tracker.tracked_stocks[symbol] = StockState(-2.0, 5.0)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "alerts.jsonl")
+        self.service = TrackerService(self.tracker, [FileSink(self.path)], interval=0)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_alerts(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_alerts_are_published_once_per_crossing(self):
+        asyncio.run(self.service.run(cycles=1))
+        self.assertEqual(self.service.last_cycle['updated'], 2)
+        self.assertEqual(self.read_alerts(), [])
+
+        # AAA rises $6 (SELL); it is reported once, not on every cycle it stays there
+        self.closes["AAA"] = [106.0]
+        asyncio.run(self.service.run(cycles=3))
+        alerts = self.read_alerts()
+        self.assertEqual([(a['symbol'], a['action']) for a in alerts], [("AAA", "SELL")])
+        self.assertEqual(alerts[0]['price'], 106.0)
+
+        # Back to HOLD, then a $2.50 drop reaches the -$2 buy threshold
+        self.closes["AAA"] = [100.0]
+        asyncio.run(self.service.run(cycles=4))
+        self.closes["AAA"] = [97.5]
+        asyncio.run(self.service.run(cycles=5))
+        self.assertEqual([a['action'] for a in self.read_alerts()], ["SELL", "BUY"])
+
+    def test_fetch_errors_do_not_stop_the_cycle(self):
+        self.tracker.fetch_engine = FetchEngine(rate_limit=None, retries=0)
+        self.provider.history.side_effect = lambda symbol, **kwargs: (
+            make_bars(self.closes[symbol]) if symbol == "AAA" else 1 / 0)
+        with mock.patch("sys.stderr"):
+            asyncio.run(self.service.run(cycles=1))
+        self.assertEqual(self.service.last_cycle['updated'], 1)
+
+    def test_stream_ticks_are_flushed_while_streaming(self):
+        async def run():
+            await asyncio.sleep(0.3)
+
+        stream = mock.Mock(sync_interval=0.02, run=run)
+        service = TrackerService(self.tracker, stream=stream)
+        with mock.patch.object(self.tracker, "flush_store") as flush:
+            asyncio.run(service.run())
+        self.assertGreater(flush.call_count, 3)  # Not just the final flush at shutdown
+
+    def test_socket_sink_drops_clients_that_stop_reading(self):
+        async def scenario():
+            sink = SocketSink(port=0, max_buffer=64 * 1024)
+            await sink.start()
+            reader, writer = await asyncio.open_connection("127.0.0.1", sink.port)
+            while not sink.clients:
+                await asyncio.sleep(0.01)
+            event = {'symbol': "AAA", 'message': "x" * 10000}
+            started = time.perf_counter()
+            with mock.patch("sys.stderr"):
+                for _ in range(1000):  # ~10 MB, far more than the socket buffers hold
+                    await sink.publish(event)
+            elapsed = time.perf_counter() - started
+            clients = len(sink.clients)
+            writer.close()
+            await sink.close()
+            return elapsed, clients
+
+        elapsed, clients = asyncio.run(scenario())
+        self.assertEqual(clients, 0)
+        self.assertLess(elapsed, 1.0)
+
+    def test_parse_sink(self):
+        self.assertIsInstance(parse_sink("file:out.jsonl"), FileSink)
+        sink = parse_sink("socket:127.0.0.1:9000")
+        self.assertEqual((sink.host, sink.port), ("127.0.0.1", 9000))
+        with self.assertRaises(ValueError):
+            parse_sink("carrier-pigeon")
+
+    def test_does_not_import_gui_libraries(self):
+        code = ("import sys, tracker_service; "
+                "print(any(m.split('.')[0] in ('tkinter', 'matplotlib') for m in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout
+        self.assertEqual(output.strip(), "False")
+
+
+if __name__ == '__main__':
+    unittest.main()
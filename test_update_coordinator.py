@@ -0,0 +1,152 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from fetch_engine import FetchEngine
+from poll_scheduler import PollScheduler
+from providers import MarketDataProvider
+from stock_tracker import StockState, StockTracker
+from update_coordinator import UpdateCoordinator
+
+
+def make_bars(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="America/New_York")
+    return pd.DataFrame({'Close': closes, 'Volume': [100] * len(closes)}, index=index)
+
+
+class TestUpdateCoordinator(unittest.TestCase):
+    def setUp(self):
+        self.closes = {"AAA": [100.0], "BBB": [50.0]}
+        self.provider = mock.Mock(spec=MarketDataProvider)
+        self.provider.history.side_effect = lambda symbol, **kwargs: make_bars(self.closes[symbol])
+        self.tracker = StockTracker(self.provider, fetch_engine=FetchEngine(rate_limit=None))
+        for symbol in self.closes:
+            self.tracker.tracked_stocks[symbol] = StockState(-2.0, 5.0)
+
+    def test_published_snapshot_is_immutable_and_copy_on_write(self):
+        coordinator = UpdateCoordinator(self.tracker, interval=60)
+        first = coordinator.run_cycle()
+        self.assertEqual(first.row_data(first.index["AAA"])['current_price'], 100.0)
+
+        # Later updates never show through an already published snapshot
+        self.closes["AAA"] = [106.0]
+        self.tracker.update_stock_data("AAA")
+        self.assertEqual(first.states[first.index["AAA"]].current_price, 100.0)
+        with self.assertRaises(ValueError):
+            first.states[0].history.append(0, 1.0)
+        with self.assertRaises(ValueError):
+            first.current_price[0] = 1.0
+
+        second = coordinator.publish()
+        self.assertEqual(second.recommendation(second.index["AAA"]), "SELL")
+        # Only the changed stock was copied again
+        self.assertIsNot(second.states[second.index["AAA"]], first.states[first.index["AAA"]])
+        self.assertIs(second.states[second.index["BBB"]], first.states[first.index["BBB"]])
+
+    def test_cycles_never_overlap_and_overruns_are_counted(self):
+        active = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def slow_history(symbol, **kwargs):
+            with lock:
+                active.append(symbol)
+                if len(set(active)) != len(active):
+                    overlaps.append(symbol)
+            time.sleep(0.05)
+            with lock:
+                active.remove(symbol)
+            return make_bars(self.closes[symbol])
+
+        self.provider.history.side_effect = slow_history
+        coordinator = UpdateCoordinator(self.tracker, interval=0.02)
+        coordinator.start()
+        time.sleep(0.4)
+        coordinator.stop(timeout=1)
+
+        self.assertEqual(overlaps, [])
+        self.assertGreater(coordinator.cycles, 1)
+        self.assertGreater(coordinator.overruns, 0)
+        self.assertGreater(coordinator.skipped, 0)
+
+    def test_update_requests_coalesce(self):
+        coordinator = UpdateCoordinator(self.tracker, interval=60)
+        coordinator.request_update()
+        coordinator.request_update()
+        coordinator.request_update()
+        self.assertEqual(coordinator.skipped, 2)
+
+        done = threading.Event()
+        coordinator.on_cycle = lambda snapshot: done.set()
+        coordinator.start()
+        self.assertTrue(done.wait(1))
+        coordinator.stop(timeout=1)
+        self.assertEqual(coordinator.cycles, 1)
+
+    def test_late_request_serves_the_due_tick(self):
+        # The worker starts at 0 and waits for the tick due at 10; every later reading is 12
+        times = iter([0.0, 0.0])
+        done = threading.Event()
+        coordinator = UpdateCoordinator(self.tracker, interval=10, clock=lambda: next(times, 12.0),
+                                        on_cycle=lambda snapshot: done.set())
+        coordinator.start()
+        # The request wakes the worker after that tick fell due: one cycle covers both
+        coordinator.request_update()
+        self.assertTrue(done.wait(1))
+        coordinator.stop(timeout=1)
+
+        self.assertEqual(coordinator.cycles, 1)
+        self.assertEqual(coordinator.overruns, 0)
+        self.assertEqual(coordinator.skipped, 0)
+
+    def test_scheduler_picks_the_symbols_of_each_cycle(self):
+        scheduler = mock.Mock()
+        scheduler.due.return_value = ["BBB"]
+        coordinator = UpdateCoordinator(self.tracker, interval=60, scheduler=scheduler)
+        coordinator.run_cycle()
+        self.provider.history.assert_called_once()
+        scheduler.record.assert_called_once_with({"BBB": True})
+
+        # Nothing due: no cycle and no new snapshot
+        scheduler.due.return_value = []
+        self.assertIsNone(coordinator.run_cycle())
+
+        # An explicit request still updates everything
+        coordinator.request_update()
+        coordinator.run_cycle()
+        self.assertEqual(scheduler.record.call_args.args[0], {"AAA": True, "BBB": True})
+
+    def test_empty_watchlist_does_not_spin(self):
+        self.tracker.tracked_stocks.clear()
+        hours = mock.Mock()
+        hours.is_open.return_value = True
+        scheduler = PollScheduler(self.tracker, max_interval=30, market_hours=hours)
+        self.assertEqual(scheduler.next_due(), 30)
+
+        scheduler.due = mock.Mock(wraps=scheduler.due)
+        now = [0.0]
+        coordinator = UpdateCoordinator(self.tracker, interval=0.01, scheduler=scheduler, clock=lambda: now[0])
+        waits = []
+
+        def wait(timeout):
+            # Simulated time: every wait times out, until the tenth stops the worker
+            waits.append(timeout)
+            if len(waits) == 10:
+                coordinator._stopping = True
+                return True
+            now[0] += timeout
+            return False
+        coordinator._wake.wait = wait
+        coordinator._run()
+
+        # The first tick finds nothing due; from then on the worker backs off to idle_wait
+        self.assertEqual(waits[0], 0.01)
+        self.assertTrue(all(wait >= coordinator.idle_wait for wait in waits[1:]), waits)
+        self.assertEqual(scheduler.due.call_count, 9)
+        self.assertEqual((coordinator.cycles, coordinator.overruns, coordinator.skipped), (0, 0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
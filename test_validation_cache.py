@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from fetch_engine import FetchEngine
+from providers import MarketDataProvider
+from stock_tracker import StockTracker
+from validation_cache import ValidationCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestValidationCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "cache", "validation.json")
+        self.clock = FakeClock()
+
+    def make_cache(self):
+        return ValidationCache(self.path, positive_ttl=100, negative_ttl=10, clock=self.clock)
+
+    def test_entries_persist_and_expire_by_ttl(self):
+        cache = self.make_cache()
+        cache.put_many({"AAPL": True, "NOPE": False})
+        cache.save()
+
+        cache = self.make_cache()
+        self.assertTrue(cache.get("AAPL"))
+        self.assertFalse(cache.get("NOPE"))
+        self.assertIsNone(cache.get("MSFT"))
+
+        self.clock.now += 50
+        self.assertTrue(cache.get("AAPL"))
+        self.assertIsNone(cache.get("NOPE"))
+
+    def test_tracker_only_asks_provider_about_unknown_symbols(self):
+        provider = mock.Mock(spec=MarketDataProvider)
+        provider.validate_symbols.side_effect = lambda symbols, **kwargs: {s: s != "NOPE" for s in symbols}
+        tracker = StockTracker(provider, validation_cache=self.make_cache())
+
+        added, errors = tracker.add_stocks([("aapl", -2.0, 5.0), ("NOPE", -2.0, 5.0), ("MSFT", -1.0, 2.0)])
+        self.assertEqual(added, ["AAPL", "MSFT"])
+        self.assertEqual(errors, {"NOPE": "Invalid stock symbol: NOPE"})
+        provider.validate_symbols.assert_called_once_with(["AAPL", "NOPE", "MSFT"], timeout=10)
+
+        # A restart re-adds the watchlist from the cache without any provider calls
+        provider.validate_symbols.reset_mock()
+        tracker = StockTracker(provider, validation_cache=self.make_cache())
+        self.assertEqual(tracker.add_stock("AAPL", -2.0, 5.0), "AAPL")
+        self.assertEqual(tracker.validate_symbols(["MSFT", "NOPE"]), {"MSFT": True, "NOPE": False})
+        provider.validate_symbols.assert_not_called()
+
+    def test_failed_lookup_is_not_cached(self):
+        provider = mock.Mock(spec=MarketDataProvider)
+        provider.validate_symbols.side_effect = IOError("network down")
+        cache = self.make_cache()
+        tracker = StockTracker(provider, validation_cache=cache,
+                               fetch_engine=FetchEngine(rate_limit=None, sleep=lambda delay: None))
+
+        # A network error is not an invalid symbol
+        with self.assertRaises(IOError):
+            tracker.validate_stock_symbol("AAPL")
+        self.assertIsNone(cache.get("AAPL"))
+        added, errors = tracker.add_stocks([("AAPL", -2.0, 5.0)])
+        self.assertEqual(errors, {"AAPL": "Could not validate AAPL: network down"})
+
+        # An import retries the lookup through the fetch engine
+        provider.validate_symbols.side_effect = [IOError("network down"), {"AAPL": True}]
+        provider.download.return_value = {}
+        added, errors = tracker.import_stocks([("AAPL", -2.0, 5.0)])
+        self.assertEqual(provider.validate_symbols.call_count, 4)
+        self.assertEqual(errors, {"AAPL": "No price data for AAPL"})
+        self.assertTrue(cache.get("AAPL"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from fetch_engine import FetchEngine
+from providers import MarketDataProvider
+from stock_tracker import StockTracker
+from watchlist_io import read_watchlist, tracker_entries, write_watchlist
+
+
+def make_bars(closes, start="2024-01-02 09:30"):
+    index = pd.date_range(start, periods=len(closes), freq="1min", tz="America/New_York")
+    return pd.DataFrame({'Close': closes, 'Volume': [100] * len(closes)}, index=index)
+
+
+class TestWatchlistIO(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip_and_bad_rows(self):
+        entries = [("AAPL", -2.5, 5.0), ("MSFT", -1.0, 3.25)]
+        for name in ("list.csv", "list.json"):
+            write_watchlist(self.path(name), entries)
+            self.assertEqual(read_watchlist(self.path(name)), (entries, {}))
+
+        with open(self.path("mixed.csv"), "w") as f:
+            f.write("Symbol,Buy_Threshold,sell_threshold\naapl,-3,\n,1,2\nmsft,oops,4\n\ngoog,,\n")
+        entries, errors = read_watchlist(self.path("mixed.csv"), default_buy=-1.0, default_sell=2.0)
+        self.assertEqual(entries, [("AAPL", -3.0, 2.0), ("GOOG", -1.0, 2.0)])
+        self.assertEqual(sorted(errors), ["line 3", "line 4"])
+
+        with open(self.path("map.json"), "w") as f:
+            json.dump({"tsla": {"sell_threshold": 10}, "nvda": None}, f)
+        entries, errors = read_watchlist(self.path("map.json"))
+        self.assertEqual(entries, [("TSLA", -2.0, 10.0), ("NVDA", -2.0, 5.0)])
+        with self.assertRaises(ValueError):
+            read_watchlist(self.path("list.txt"))
+
+    def test_import_reports_partial_failures_and_exports(self):
+        provider = mock.Mock(spec=MarketDataProvider)
+        provider.validate_symbols.side_effect = lambda symbols, **kwargs: {s: s != "BAD" for s in symbols}
+        provider.download.side_effect = lambda symbols, **kwargs: {
+            s: make_bars([100.0, 101.0]) for s in symbols if s != "EMPTY"}
+        tracker = StockTracker(provider, fetch_engine=FetchEngine(rate_limit=None))
+        tracker.add_stock("AAA", -2.0, 5.0)
+        entries = [(f"S{i:03d}", -2.0, 5.0) for i in range(120)] + [
+            ("aaa", -1.0, 1.0), ("BAD", -1.0, 1.0), ("EMPTY", -1.0, 1.0)]
+        progress = []
+
+        added, errors = tracker.import_stocks(entries, lambda *args: progress.append(args), chunk_size=50)
+        self.assertEqual(len(added), 120)
+        self.assertEqual(set(errors), {"AAA", "BAD", "EMPTY"})
+        self.assertNotIn("EMPTY", tracker.tracked_stocks)
+        self.assertEqual(tracker.tracked_stocks["S007"].current_price, 101.0)
+        self.assertEqual(provider.download.call_count, 3)  # Bulk requests, not one per symbol
+        self.assertEqual(progress[-1], ("fetch", 121, 121))
+
+        write_watchlist(self.path("out.json"), tracker_entries(tracker))
+        self.assertEqual(len(read_watchlist(self.path("out.json"))[0]), 121)
+
+    def test_cancel_drops_symbols_not_yet_fetched(self):
+        provider = mock.Mock(spec=MarketDataProvider)
+        provider.validate_symbols.side_effect = lambda symbols, **kwargs: {s: True for s in symbols}
+        cancel = threading.Event()
+
+        def download(symbols, **kwargs):
+            cancel.set()
+            return {s: make_bars([100.0]) for s in symbols}
+        provider.download.side_effect = download
+        tracker = StockTracker(provider, fetch_engine=FetchEngine(max_workers=1, rate_limit=None))
+
+        added, errors = tracker.import_stocks([(f"S{i}", -2.0, 5.0) for i in range(30)], cancel=cancel,
+                                              chunk_size=10)
+        # Requests already in flight finish; the rest are never made
+        self.assertIn(len(added), (10, 20))
+        self.assertEqual(len(errors), 30 - len(added))
+        self.assertEqual(set(errors.values()), {"Cancelled"})
+        self.assertEqual(sorted(tracker.tracked_stocks), sorted(added))
+
+
+if __name__ == "__main__":
+    unittest.main()
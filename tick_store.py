@@ -0,0 +1,144 @@
+"""Append-only on-disk store for tracked tick history and tracker configuration"""
+import json
+import os
+import threading
+
+import numpy as np
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser("~"), ".stock_tracker", "store")
+
+# One fixed-size record per tick: ns since the epoch (UTC) and price
+TICK_DTYPE = np.dtype([('time', '<i8'), ('price', '<f8')])
+
+
+class TickStore:
+    """Per-symbol tick files of raw TICK_DTYPE records plus a JSON config.
+    
+    Layout: <directory>/ticks/<SYMBOL>.ticks and <directory>/config.json.
+    Ticks are buffered in memory and appended to the files by flush(); they
+    are never rewritten, so reads memory-map the files directly. The config
+    holds each stock's thresholds and base price and is replaced atomically.
+    """
+    
+    def __init__(self, directory=DEFAULT_STORE_DIR):
+        self.directory = directory
+        self.tick_dir = os.path.join(directory, "ticks")
+        self.config_path = os.path.join(directory, "config.json")
+        os.makedirs(self.tick_dir, exist_ok=True)
+        
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()  # Serializes writers of the tick files and config
+        self.pending = {}  # symbol -> [(time_ns, price), ...] not yet written
+        self.config = self._read_config()
+        self.config_dirty = False
+    
+    def _read_config(self):
+        try:
+            with open(self.config_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'stocks': {}}
+    
+    def tick_path(self, symbol):
+        return os.path.join(self.tick_dir, f"{symbol}.ticks")
+    
+    # Configuration
+    
+    def stocks(self):
+        """{symbol: settings} for the stored watchlist, in the order stocks were added"""
+        with self.lock:
+            return {symbol: dict(settings) for symbol, settings in self.config['stocks'].items()}
+    
+    def set_stock(self, symbol, **settings):
+        """Create or update a stock's stored settings (thresholds, base price)"""
+        with self.lock:
+            self.config['stocks'].setdefault(symbol, {}).update(settings)
+            self.config_dirty = True
+    
+    def remove_stock(self, symbol):
+        """Drop a stock from the stored watchlist along with its ticks"""
+        with self.write_lock:
+            with self.lock:
+                if self.config['stocks'].pop(symbol, None) is not None:
+                    self.config_dirty = True
+                self.pending.pop(symbol, None)
+            self._delete_ticks(symbol)
+    
+    def clear_stocks(self):
+        with self.write_lock:
+            with self.lock:
+                symbols = list(self.config['stocks']) + list(self.pending)
+                self.config['stocks'].clear()
+                self.config_dirty = True
+                self.pending.clear()
+            for symbol in set(symbols):
+                self._delete_ticks(symbol)
+    
+    def _delete_ticks(self, symbol):
+        # A re-added symbol must not pick up the history it had before
+        try:
+            os.remove(self.tick_path(symbol))
+        except FileNotFoundError:
+            pass
+    
+    # Ticks
+    
+    def append(self, symbol, time_ns, price):
+        """Queue a tick for the next flush()"""
+        with self.lock:
+            self.pending.setdefault(symbol, []).append((time_ns, price))
+    
+    def flush(self):
+        """Append queued ticks to their files and save the config if it changed.
+        
+        Flushes from different threads write one at a time, so each file's
+        ticks stay in the order they were queued.
+        """
+        with self.write_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+                config = json.dumps(self.config) if self.config_dirty else None
+                self.config_dirty = False
+            
+            for symbol, ticks in pending.items():
+                with open(self.tick_path(symbol), "ab") as f:
+                    f.write(np.array(ticks, dtype=TICK_DTYPE).tobytes())
+            
+            if config is not None:
+                tmp_path = f"{self.config_path}.tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(config)
+                os.replace(tmp_path, self.config_path)
+    
+    def ticks(self, symbol):
+        """Read-only memory map of every stored tick for a symbol (flushed ticks only)"""
+        path = self.tick_path(symbol)
+        try:
+            count = os.path.getsize(path) // TICK_DTYPE.itemsize
+        except OSError:
+            count = 0
+        
+        # A crash mid-write can leave a partial record at the end; it is ignored
+        if count == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(count,))
+    
+    def read(self, symbol, start=None, end=None):
+        """Ticks with start <= time < end (ns since the epoch; None leaves a side open)"""
+        ticks = self.ticks(symbol)
+        times = ticks['time']
+        lo = 0 if start is None else np.searchsorted(times, start, side="left")
+        hi = len(ticks) if end is None else np.searchsorted(times, end, side="left")
+        return ticks[lo:hi]
+    
+    def tail(self, symbol, count):
+        """The newest `count` ticks, one per time: a later tick for the same time replaces the earlier"""
+        ticks = self.ticks(symbol)
+        # Read a little extra so that collapsed revisions still leave `count` ticks
+        recent = ticks[max(0, len(ticks) - 2 * count):]
+        if len(recent) == 0:
+            return recent
+        
+        times = recent['time']
+        keep = np.append(times[1:] != times[:-1], True)
+        return recent[keep][-count:]
@@ -0,0 +1,380 @@
+"""Headless tracker service: asyncio update loop publishing alerts to pluggable sinks.
+
+Runs StockTracker without Tkinter or matplotlib, e.g. on a server:
+
+    python tracker_service.py AAPL MSFT:-3:4 --buy -2.5 --sell 5 --sink stdout --sink file:alerts.jsonl
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from alert_engine import AlertEngine
+from fetch_engine import FetchEngine
+from stock_tracker import StockTracker
+
+
+class AlertSink:
+    """Destination for alert events; subclasses override publish()"""
+    
+    async def start(self):
+        pass
+    
+    async def publish(self, event):
+        raise NotImplementedError
+    
+    async def close(self):
+        pass
+
+
+class StdoutSink(AlertSink):
+    """Print alerts the same way the GUI logs them"""
+    
+    def __init__(self, stream=None):
+        self.stream = stream
+    
+    async def publish(self, event):
+        print(f"ALERT: {event['message']}", file=self.stream or sys.stdout, flush=True)
+
+
+class FileSink(AlertSink):
+    """Append alerts to a file as JSON lines"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+    
+    async def start(self):
+        self.file = open(self.path, "a", encoding="utf-8")
+    
+    async def publish(self, event):
+        self.file.write(json.dumps(event, default=str) + "\n")
+        self.file.flush()
+    
+    async def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+class SocketSink(AlertSink):
+    """Serve alerts as JSON lines to every client connected to a local socket.
+    
+    Listens on host:port, or on a Unix socket when path is given. Clients that
+    disconnect are dropped; alerts published while nobody is connected are lost.
+    Writes never wait for a client: one that lets more than `max_buffer` bytes
+    pile up unread is disconnected, so it cannot stall the update loop.
+    """
+    
+    def __init__(self, host="127.0.0.1", port=8765, path=None, max_buffer=1 << 20):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_buffer = max_buffer
+        self.server = None
+        self.clients = set()
+    
+    async def start(self):
+        if self.path:
+            self.server = await asyncio.start_unix_server(self._connected, path=self.path)
+        else:
+            self.server = await asyncio.start_server(self._connected, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+    
+    async def _connected(self, reader, writer):
+        self.clients.add(writer)
+    
+    async def publish(self, event):
+        line = (json.dumps(event, default=str) + "\n").encode()
+        for writer in list(self.clients):
+            if writer.is_closing():
+                self.clients.discard(writer)
+                continue
+            if writer.transport.get_write_buffer_size() + len(line) > self.max_buffer:
+                print("Dropping an alert client that stopped reading", file=sys.stderr)
+                writer.close()
+                self.clients.discard(writer)
+                continue
+            writer.write(line)
+    
+    async def close(self):
+        for writer in self.clients:
+            writer.close()
+        self.clients.clear()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+def parse_sink(spec):
+    """Build a sink from 'stdout', 'file:PATH', 'socket:HOST:PORT' or 'unix:PATH'"""
+    kind, _, target = spec.partition(":")
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "file" and target:
+        return FileSink(target)
+    if kind == "socket":
+        host, _, port = target.rpartition(":")
+        return SocketSink(host or "127.0.0.1", int(port or 8765))
+    if kind == "unix" and target:
+        return SocketSink(path=target)
+    raise ValueError(f"Unknown sink: {spec}")
+
+
+class TrackerService:
+    """Polls a StockTracker on an asyncio loop and publishes its alerts.
+    
+    Each cycle fetches every tracked symbol concurrently (at most `concurrency`
+    requests in flight, still paced by the tracker's fetch engine), then feeds
+    the updated prices to `alert_engine`, as the GUI's UpdateCoordinator does:
+    a stock alerts when it reaches its buy or sell threshold, and again only
+    after moving back past the engine's hysteresis band.
+    
+    With a `stream` (quote_stream.QuoteStream) the service does not poll:
+    alerts come from the same engine as each tick arrives, and run() lasts
+    until stop() or the end of the stream.
+    """
+    
+    def __init__(self, tracker, sinks=(), interval=None, concurrency=64, stream=None, alert_engine=None):
+        self.tracker = tracker
+        self.sinks = list(sinks)
+        # Seconds between cycle starts; defaults to the tracker's update_interval
+        self.interval = interval if interval is not None else tracker.update_interval / 1000
+        self.concurrency = concurrency
+        self.stream = stream
+        # Polled cycles and pushed ticks evaluate the same rules
+        self.alert_engine = alert_engine or getattr(stream, 'alert_engine', None) or AlertEngine()
+        if stream is not None:
+            stream.alert_engine = self.alert_engine
+        self.cycles = 0
+        self.last_cycle = {}  # Timing and counts of the last completed cycle
+        self._executor = None
+        self._stopping = None
+    
+    async def fetch_all(self):
+        """Update every tracked symbol; returns {symbol: success}"""
+        tracker = self.tracker
+        symbols = list(tracker.tracked_stocks)
+        loop = asyncio.get_running_loop()
+        
+        if tracker.fetch_mode == "batch":
+            # Bulk requests already cover many symbols each; the engine runs the chunks
+            return await loop.run_in_executor(self._executor, tracker.update_stocks_batched, symbols)
+        
+        engine = tracker.fetch_engine
+        
+        async def fetch(symbol):
+            try:
+                return await loop.run_in_executor(self._executor, engine.fetch, symbol,
+                                                  tracker.fetch_stock_data)
+            except Exception as e:
+                print(f"Error updating {symbol}: {e}", file=sys.stderr)
+                return False
+        
+        results = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        return dict(zip(symbols, results))
+    
+    def evaluate(self, results):
+        """Alerts fired by the symbols a cycle updated, from {symbol: success}"""
+        return self.alert_engine.update_from(self.tracker.tracked_stocks,
+                                             [symbol for symbol, ok in results.items() if ok])
+    
+    async def publish(self, event):
+        for sink in self.sinks:
+            try:
+                await sink.publish(event)
+            except Exception as e:
+                print(f"Error publishing alert to {type(sink).__name__}: {e}", file=sys.stderr)
+    
+    async def publish_alerts(self, alerts):
+        for alert in alerts:
+            event = dict(alert, time=datetime.fromtimestamp(alert['time'], timezone.utc).isoformat())
+            await self.publish(event)
+    
+    def _stream_tick(self, symbol, recommendation, alerts):
+        return self.publish_alerts(alerts) if alerts else None
+    
+    async def run_stream(self):
+        """Apply pushed ticks until stop() or the end of the stream"""
+        self.stream.on_tick = self._stream_tick
+        streaming = asyncio.ensure_future(self.stream.run())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        flushing = asyncio.ensure_future(self._flush_periodically(self.stream.sync_interval))
+        await asyncio.wait({streaming, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        self.stream.stop()
+        await streaming
+        stopping.cancel()
+        flushing.cancel()
+    
+    async def _flush_periodically(self, interval):
+        # Pushed ticks only queue records in the store; write them out as the stream runs
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            await loop.run_in_executor(self._executor, self.tracker.flush_store)
+    
+    async def run_cycle(self):
+        """Fetch, evaluate and publish once"""
+        tracker = self.tracker
+        started = tracker.start_cycle()
+        results = await self.fetch_all()
+        fetched = time.perf_counter()
+        
+        tracker.finish_cycle(started, results)
+        events = self.evaluate(results)
+        await self.publish_alerts(events)
+        
+        self.cycles += 1
+        self.last_cycle = {
+            'symbols': len(results),
+            'updated': sum(1 for ok in results.values() if ok),
+            'alerts': len(events),
+            'fetch_seconds': fetched - started,
+            'evaluate_seconds': time.perf_counter() - fetched,
+        }
+        return events
+    
+    async def run_polling(self, cycles=None):
+        """Run cycles every `interval` seconds until stop() or `cycles` cycles have run"""
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set() and (cycles is None or self.cycles < cycles):
+            started = loop.time()
+            await self.run_cycle()
+            if cycles is not None and self.cycles >= cycles:
+                break
+            
+            # Cycles start on a fixed cadence; a slow cycle is followed immediately by the next
+            delay = max(0.0, self.interval - (loop.time() - started))
+            try:
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def run(self, cycles=None):
+        """Poll (or follow the quote stream) and publish alerts until stopped"""
+        self._stopping = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        for sink in self.sinks:
+            await sink.start()
+        
+        try:
+            if self.stream is not None:
+                await self.run_stream()
+            else:
+                await self.run_polling(cycles)
+        finally:
+            for sink in self.sinks:
+                await sink.close()
+            self._executor.shutdown(wait=False)
+            self.tracker.flush_store()
+    
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+
+def parse_symbol(spec, buy_threshold, sell_threshold):
+    """Parse 'SYMBOL' or 'SYMBOL:BUY:SELL' into (symbol, buy, sell)"""
+    parts = spec.split(":")
+    if len(parts) == 3:
+        return parts[0], float(parts[1]), float(parts[2])
+    if len(parts) == 1:
+        return parts[0], buy_threshold, sell_threshold
+    raise ValueError(f"Expected SYMBOL or SYMBOL:BUY:SELL, got {spec}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run the stock tracker without a GUI.")
+    parser.add_argument("symbols", nargs="*", help="SYMBOL or SYMBOL:BUY:SELL")
+    parser.add_argument("--watchlist", metavar="FILE", help="also track the stocks in a CSV or JSON watchlist")
+    parser.add_argument("--buy", type=float, default=-2.0, help="default buy threshold ($ change)")
+    parser.add_argument("--sell", type=float, default=5.0, help="default sell threshold ($ change)")
+    parser.add_argument("--interval", type=float, default=10.0, help="seconds between update cycles")
+    parser.add_argument("--sink", action="append", default=[],
+                        help="stdout, file:PATH, socket:HOST:PORT or unix:PATH (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=64, help="requests in flight")
+    parser.add_argument("--rate-limit", type=float, default=2.0, help="requests per second (0 = unlimited)")
+    parser.add_argument("--batch-size", type=int, default=None, help="use bulk downloads of this many symbols")
+    parser.add_argument("--incremental", action="store_true", help="only fetch bars since the last update")
+    parser.add_argument("--replay", metavar="DIR", help="replay recorded bars instead of Yahoo Finance")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier")
+    parser.add_argument("--stream", metavar="HOST:PORT",
+                        help="apply ticks pushed by a quote server instead of polling")
+    parser.add_argument("--store", metavar="DIR", help="persist ticks and restore the watchlist from DIR")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--cycles", type=int, default=None, help="stop after this many cycles")
+    return parser
+
+
+def build_service(args):
+    provider = None
+    if args.replay:
+        from providers import ReplayProvider
+        provider = ReplayProvider(args.replay, speed=args.speed)
+    
+    store = None
+    if args.store:
+        from tick_store import TickStore
+        store = TickStore(args.store)
+    
+    metrics = None
+    if args.metrics_port is not None:
+        from metrics import TrackerMetrics
+        metrics = TrackerMetrics()
+    
+    engine = FetchEngine(max_workers=args.concurrency, rate_limit=args.rate_limit or None)
+    tracker = StockTracker(provider, fetch_mode="batch" if args.batch_size else "single",
+                           batch_size=args.batch_size, fetch_engine=engine,
+                           incremental=args.incremental, store=store, metrics=metrics)
+    tracker.restore()
+    
+    entries = [parse_symbol(spec, args.buy, args.sell) for spec in args.symbols]
+    if args.watchlist:
+        from watchlist_io import read_watchlist
+        listed, errors = read_watchlist(args.watchlist, default_buy=args.buy, default_sell=args.sell)
+        for label, message in errors.items():
+            print(f"{args.watchlist} {label}: {message}", file=sys.stderr)
+        entries.extend(listed)
+    if entries:
+        added, errors = tracker.add_stocks(entries)
+        for message in errors.values():
+            print(message, file=sys.stderr)
+    
+    stream = None
+    if args.stream:
+        from quote_stream import QuoteStream
+        host, _, port = args.stream.rpartition(":")
+        stream = QuoteStream(tracker, host or "127.0.0.1", int(port))
+    
+    sinks = [parse_sink(spec) for spec in args.sink or ["stdout"]]
+    return TrackerService(tracker, sinks, interval=args.interval, concurrency=args.concurrency, stream=stream)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    service = build_service(args)
+    if not service.tracker.tracked_stocks:
+        print("No stocks to track", file=sys.stderr)
+        return 1
+    
+    metrics_server = None
+    if service.tracker.metrics is not None:
+        from metrics import MetricsServer
+        metrics_server = MetricsServer(service.tracker.metrics, port=args.metrics_port).start()
+    
+    try:
+        asyncio.run(service.run(args.cycles))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if metrics_server:
+            metrics_server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""Single-flight scheduling of tracker update cycles"""
+import threading
+import time
+
+
+class UpdateCoordinator:
+    """Runs StockTracker update cycles one at a time on a single worker thread.
+    
+    Cycles fall due every `interval` seconds. A cycle that runs past the next
+    due time counts as an overrun: the ticks it missed are coalesced into one
+    cycle that starts right away, and all but that one are counted as skipped.
+    Update requests made while a cycle is already pending are coalesced too.
+    
+    With a PollScheduler, a cycle only updates the symbols the scheduler says
+    are due, and the worker wakes when the next one falls due (checking at
+    least every `interval` seconds). request_update() still updates everything.
+    
+    With an AlertEngine, the prices of the symbols updated in a cycle are fed
+    to it, so alerts are evaluated only for what changed.
+    
+    After every cycle an immutable snapshot of the tracker is published in
+    `snapshot`. Readers take the attribute and never need a lock; call
+    publish() after adding or removing stocks so it reflects them.
+    """
+    
+    def __init__(self, tracker, interval=None, on_cycle=None, progress_callback=None,
+                 clock=time.monotonic, scheduler=None, alert_engine=None):
+        self.tracker = tracker
+        self.scheduler = scheduler  # Optional PollScheduler choosing the symbols of each cycle
+        self.alert_engine = alert_engine  # Optional AlertEngine fed with each cycle's new prices
+        # Seconds between cycles; defaults to the tracker's update_interval
+        self.interval = interval if interval is not None else tracker.update_interval / 1000
+        self.on_cycle = on_cycle  # Called from the worker with the new snapshot after each cycle
+        self.progress_callback = progress_callback
+        self.clock = clock
+        self.snapshot = tracker.frozen_snapshot()
+        self.cycles = 0
+        self.overruns = 0  # Cycles that ran past the next due time
+        self.skipped = 0  # Due ticks and update requests folded into another cycle
+        self.last_cycle_seconds = None
+        self.idle_wait = 0.25  # Least wait after a wake-up with nothing due, so the worker never spins
+        self.running = False  # True while a cycle is in progress
+        self._full_update = False  # An explicit request covers every symbol
+        self._wake = threading.Event()
+        self._counts_lock = threading.Lock()  # Guards cycles, overruns and skipped
+        self._stopping = False
+        self._publish_lock = threading.Lock()
+        self._thread = None
+    
+    def start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="update-coordinator", daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout=None):
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def request_update(self):
+        """Run a cycle as soon as the worker is free"""
+        with self._counts_lock:
+            if self._wake.is_set():
+                self.skipped += 1
+        self._full_update = True
+        self._wake.set()
+    
+    def publish(self):
+        """Publish a fresh snapshot; stocks unchanged since the last one are shared, not copied"""
+        with self._publish_lock:
+            self.snapshot = self.tracker.frozen_snapshot(previous=self.snapshot)
+            if self.alert_engine is not None and len(self.alert_engine.symbols) > len(self.snapshot):
+                self.alert_engine.prune(self.tracker.tracked_stocks)
+            return self.snapshot
+    
+    def run_cycle(self):
+        """Update every tracked stock (or the scheduler's due ones) and publish the result.
+        
+        Returns the new snapshot, or None if the scheduler had nothing due.
+        """
+        full_update, self._full_update = self._full_update, False
+        if self.scheduler is None or full_update:
+            with self.tracker.lock:
+                symbols = list(self.tracker.tracked_stocks)
+        else:
+            symbols = self.scheduler.due()
+            if not symbols:
+                return None
+        
+        self.running = True
+        started = self.clock()
+        results = {}
+        try:
+            results = self.tracker.update_stocks(symbols, self.progress_callback)
+        except Exception as e:
+            print(f"Error in update cycle: {e}")
+        finally:
+            self.running = False
+        if self.scheduler is not None:
+            self.scheduler.record(results or {symbol: False for symbol in symbols})
+        if self.alert_engine is not None:
+            self.alert_engine.update_from(self.tracker.tracked_stocks,
+                                          [symbol for symbol, ok in results.items() if ok])
+        
+        self.last_cycle_seconds = self.clock() - started
+        with self._counts_lock:
+            self.cycles += 1
+        snapshot = self.publish()
+        if self.on_cycle:
+            self.on_cycle(snapshot)
+        return snapshot
+    
+    def _catch_up(self, next_due, now):
+        """(next due time after `now`, due ticks at or before `now`) on the interval grid"""
+        missed = int((now - next_due) // self.interval) + 1
+        if next_due + missed * self.interval <= now:
+            missed += 1  # Rounding put the last tick before `now`
+        return next_due + missed * self.interval, missed
+    
+    def _run(self):
+        next_due = self.clock() + self.interval
+        idle = False
+        while True:
+            wait = next_due - self.clock()
+            if self.scheduler is not None:
+                wait = min(wait, self.scheduler.next_due())
+            if idle:
+                wait = max(wait, self.idle_wait)
+            self._wake.wait(max(0.0, wait))
+            if self._stopping:
+                return
+            
+            self._wake.clear()
+            now = self.clock()
+            if now >= next_due:
+                # This cycle serves the tick that fell due, however it was woken
+                next_due, missed = self._catch_up(next_due, now)
+                if not idle:  # An idle worker passes over ticks on purpose
+                    with self._counts_lock:
+                        self.skipped += missed - 1
+            
+            idle = self.run_cycle() is None
+            
+            now = self.clock()
+            if now >= next_due:
+                # Ticks that fell due during the cycle collapse into one catch-up cycle
+                next_due, missed = self._catch_up(next_due, now)
+                with self._counts_lock:
+                    self.overruns += 1
+                    self.skipped += missed - 1
+                self._wake.set()
@@ -0,0 +1,75 @@
+"""Persistent cache of stock symbol validation results"""
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".stock_tracker", "validation_cache.json")
+
+
+class ValidationCache:
+    """Remembers which symbols were found valid or invalid, on disk.
+    
+    Valid symbols are trusted for positive_ttl seconds and invalid ones for
+    negative_ttl seconds (shorter by default, so a new listing or a transient
+    miss is retried soon). Expired entries read as unknown.
+    """
+    
+    def __init__(self, path=DEFAULT_CACHE_PATH, positive_ttl=7 * 24 * 3600, negative_ttl=3600,
+                 clock=time.time):
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()  # Serializes writers of the shared temporary file
+        self.entries = {}  # symbol -> [valid, checked_at]
+        self.load()
+    
+    def load(self):
+        """Read entries from disk; a missing or unreadable file starts an empty cache"""
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+        
+        with self.lock:
+            self.entries = {symbol: [bool(valid), float(checked_at)]
+                            for symbol, (valid, checked_at) in entries.items()}
+    
+    def save(self):
+        """Write entries to disk atomically"""
+        with self.lock:
+            entries = dict(self.entries)
+        
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self.save_lock:
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+    
+    def get(self, symbol):
+        """Return True/False for a fresh entry, or None if unknown or expired"""
+        with self.lock:
+            entry = self.entries.get(symbol)
+        if entry is None:
+            return None
+        
+        valid, checked_at = entry
+        ttl = self.positive_ttl if valid else self.negative_ttl
+        if self.clock() - checked_at > ttl:
+            return None
+        return valid
+    
+    def put(self, symbol, valid):
+        self.put_many({symbol: valid})
+    
+    def put_many(self, results):
+        now = self.clock()
+        with self.lock:
+            for symbol, valid in results.items():
+                self.entries[symbol] = [bool(valid), now]
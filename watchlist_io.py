@@ -0,0 +1,116 @@
+"""Watchlist import and export as CSV or JSON.
+
+CSV files have a header row; only the symbol column is required:
+
+    symbol,buy_threshold,sell_threshold
+    AAPL,-2.0,5.0
+    MSFT,,
+
+JSON files hold {"stocks": [{"symbol": ..., "buy_threshold": ..., "sell_threshold": ...}]};
+a bare list of such objects or of symbol strings, or a {symbol: {...}} mapping,
+is read too. Missing thresholds take the defaults passed to read_watchlist.
+"""
+import csv
+import json
+import os
+
+DEFAULT_BUY_THRESHOLD = -2.0
+DEFAULT_SELL_THRESHOLD = 5.0
+FIELDS = ("symbol", "buy_threshold", "sell_threshold")
+
+
+def watchlist_format(path, format=None):
+    """"csv" or "json", from `format` or the file extension"""
+    format = (format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if format not in ("csv", "json"):
+        raise ValueError(f"Unsupported watchlist format: {format or path} (use .csv or .json)")
+    return format
+
+
+def _threshold(value, default):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    return float(value)
+
+
+def _entry(item, default_buy, default_sell):
+    if isinstance(item, str):
+        item = {"symbol": item}
+    symbol = str(item.get("symbol") or "").strip().upper()
+    if not symbol:
+        raise ValueError("missing symbol")
+    return (symbol, _threshold(item.get("buy_threshold"), default_buy),
+            _threshold(item.get("sell_threshold"), default_sell))
+
+
+def _json_items(data):
+    """(label, item) pairs from any of the accepted JSON layouts"""
+    if isinstance(data, dict) and "stocks" in data:
+        data = data["stocks"]
+    if isinstance(data, dict):
+        return [(symbol, dict(settings if isinstance(settings, dict) else {}, symbol=symbol))
+                for symbol, settings in data.items()]
+    if isinstance(data, list):
+        return [(f"item {i}", item) for i, item in enumerate(data, start=1)]
+    raise ValueError("Expected a list of stocks or a {symbol: settings} mapping")
+
+
+def _csv_items(f):
+    reader = csv.DictReader(f)
+    fields = [name.strip().lower() for name in reader.fieldnames or ()]
+    if "symbol" not in fields:
+        raise ValueError("CSV watchlist needs a header row with a 'symbol' column")
+    reader.fieldnames = fields
+    return [(f"line {reader.line_num}", row) for row in reader
+            if any(isinstance(value, str) and value.strip() for value in row.values())]
+
+
+def read_watchlist(path, format=None, default_buy=DEFAULT_BUY_THRESHOLD, default_sell=DEFAULT_SELL_THRESHOLD):
+    """Read a watchlist file.
+    
+    Returns ([(symbol, buy_threshold, sell_threshold)], {line or item: error})
+    so one bad row doesn't reject the whole file. Raises ValueError if the
+    file as a whole can't be read.
+    """
+    format = watchlist_format(path, format)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if format == "json":
+            try:
+                items = _json_items(json.load(f))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON watchlist: {e}") from e
+        else:
+            items = _csv_items(f)
+    
+    entries = []
+    errors = {}
+    for label, item in items:
+        try:
+            if not isinstance(item, (str, dict)):
+                raise ValueError("expected a symbol or an object")
+            entries.append(_entry(item, default_buy, default_sell))
+        except (TypeError, ValueError) as e:
+            errors[label] = str(e)
+    return entries, errors
+
+
+def write_watchlist(path, entries, format=None):
+    """Write (symbol, buy_threshold, sell_threshold) entries to a CSV or JSON file"""
+    format = watchlist_format(path, format)
+    rows = [dict(zip(FIELDS, entry)) for entry in entries]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if format == "json":
+            json.dump({"stocks": rows}, f, indent=2)
+            f.write("\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    return len(rows)
+
+
+def tracker_entries(tracker):
+    """The tracker's watchlist as (symbol, buy_threshold, sell_threshold) entries"""
+    with tracker.lock:
+        return [(symbol, state.buy_threshold, state.sell_threshold)
+                for symbol, state in tracker.tracked_stocks.items()]